@@ -150,7 +150,7 @@ def mypy(session: Session) -> None:
 def tests(session: Session) -> None:
     """Run the test suite."""
     session.install(".")
-    session.install("coverage[toml]", "pytest", "pygments", "respx", "fastapi")
+    session.install("coverage[toml]", "pytest", "pygments", "respx", "fastapi", "ruff")
     try:
         session.run("coverage", "run", "--parallel", "-m", "pytest", *session.posargs)
     finally:
@@ -171,6 +171,26 @@ def coverage(session: Session) -> None:
     session.run("coverage", *args)
 
 
+@session(python=python_versions[0])
+def benchmarks(session: Session) -> None:
+    """Benchmark the generator and compare the results to the last saved run."""
+    args = session.posargs or ["--benchmark-autosave"]
+    if not session.posargs and any(Path(".benchmarks").glob("*/*.json")):
+        # Compare to the last saved run, the first run only saves the baseline.
+        args += ["--benchmark-compare", "--benchmark-compare-fail=median:15%"]
+    session.install(".")
+    session.install("pytest", "pytest-benchmark", "pygments", "ruff")
+    session.run(
+        "pytest",
+        "tests/benchmarks",
+        "-o",
+        "python_files=bench_*.py",
+        "-o",
+        "python_functions=bench_*",
+        *args,
+    )
+
+
 @session(python=python_versions[0])
 def typeguard(session: Session) -> None:
     """Runtime type checking using Typeguard."""
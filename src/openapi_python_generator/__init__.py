@@ -1,12 +1,21 @@
 """Python client from an OPENAPI 3.0 specification in seconds."""
-try:
-    from importlib.metadata import PackageNotFoundError  # type: ignore
-    from importlib.metadata import version
-except ImportError:  # pragma: no cover
-    from importlib_metadata import PackageNotFoundError  # type: ignore
-    from importlib_metadata import version  # type: ignore
+from typing import Any
 
-try:
-    __version__ = version(__name__)
-except PackageNotFoundError:  # pragma: no cover
-    __version__ = "unknown"
+
+def __getattr__(name: str) -> Any:
+    # The version is only looked up when it is used, importlib.metadata is slow to import.
+    if name == "__version__":
+        try:
+            from importlib.metadata import PackageNotFoundError  # type: ignore
+            from importlib.metadata import version
+        except ImportError:  # pragma: no cover
+            from importlib_metadata import PackageNotFoundError  # type: ignore
+            from importlib_metadata import version  # type: ignore
+
+        try:
+            value = version(__name__)
+        except PackageNotFoundError:  # pragma: no cover
+            value = "unknown"
+        globals()["__version__"] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
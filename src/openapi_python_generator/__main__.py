@@ -2,9 +2,8 @@ from typing import Optional
 
 import click
 
-from openapi_python_generator import __version__
-from openapi_python_generator.common import Formatter, HTTPLibrary, PydanticVersion
-from openapi_python_generator.generate_data import generate_data
+from openapi_python_generator.common import REMOTE_SPEC_TIMEOUT
+from openapi_python_generator.common import Formatter, HTTPLibrary, PydanticVersion, ValidationMode
 
 @click.command()
 @click.argument("source")
@@ -54,12 +53,114 @@ from openapi_python_generator.generate_data import generate_data
 )
 @click.option(
     "--formatter",
-    type=click.Choice(["black", "none"]),
+    type=click.Choice(["black", "ruff", "none", "verify"]),
     default="black",
     show_default=True,
     help="Option to choose which auto formatter is applied.",
 )
-@click.version_option(version=__version__)
+@click.option(
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of worker processes used to render and format the generated code.",
+)
+@click.option(
+    "--no-format-cache",
+    is_flag=True,
+    show_default=True,
+    default=False,
+    help="Always run the formatter instead of reusing formatted files of previous runs from the cache.",
+)
+@click.option(
+    "--no-template-cache",
+    is_flag=True,
+    show_default=True,
+    default=False,
+    help="Compile the templates on every run instead of reusing the compiled templates from the cache.",
+)
+@click.option(
+    "--validate",
+    "validation",
+    type=click.Choice(["none", "file", "snippet"]),
+    default="file",
+    show_default=True,
+    help="How the syntax of the generated code is checked: once per written module, for every rendered model and "
+    "operation, or not at all.",
+)
+@click.option(
+    "-v",
+    "--verbose",
+    is_flag=True,
+    show_default=True,
+    default=False,
+    help="Report timings and statistics of the generation.",
+)
+@click.option(
+    "--spec-cache",
+    is_flag=True,
+    show_default=True,
+    default=False,
+    help="Cache the validated specification and reuse it while the specification is unchanged.",
+)
+@click.option(
+    "--offline",
+    is_flag=True,
+    show_default=True,
+    default=False,
+    help="Serve a remote SOURCE from the HTTP cache of previous runs, without any request.",
+)
+@click.option(
+    "--timeout",
+    type=click.FloatRange(min=0, min_open=True),
+    default=REMOTE_SPEC_TIMEOUT,
+    show_default=True,
+    help="Timeout in seconds for fetching a remote SOURCE and the remote documents it references.",
+)
+@click.option(
+    "--profile",
+    is_flag=True,
+    show_default=True,
+    default=False,
+    help="Report the time and peak memory of every phase of the generation and the slowest models and operations.",
+)
+@click.option(
+    "--profile-json",
+    type=click.Path(dir_okay=False, writable=True),
+    default=None,
+    help="Write the report of --profile as JSON to this file. Implies --profile.",
+)
+@click.option(
+    "--profile-out",
+    type=click.Path(dir_okay=False, writable=True),
+    default=None,
+    help="Write a cProfile trace of the generation to this file, e.g. generator.prof.",
+)
+@click.option(
+    "--incremental",
+    is_flag=True,
+    show_default=True,
+    default=False,
+    help="Store the dependency graph of the client in OUTPUT and only regenerate the models and services whose "
+    "schemas or operations changed since the previous incremental run.",
+)
+@click.option(
+    "--watch",
+    is_flag=True,
+    show_default=True,
+    default=False,
+    help="Keep running and regenerate the client whenever SOURCE or a custom template changes. Only files whose "
+    "content changed are formatted and written again.",
+)
+@click.option(
+    "--check",
+    is_flag=True,
+    show_default=True,
+    default=False,
+    help="Check whether the client in OUTPUT is up to date with SOURCE and the options, without writing anything. "
+    "Exits with status 1 and lists the files that would change if it is not.",
+)
+@click.version_option(package_name="openapi-python-generator")
 def main(
     source: str,
     output: str,
@@ -70,6 +171,20 @@ def main(
     custom_template_path: Optional[str] = None,
     pydantic_version: PydanticVersion = PydanticVersion.V2,
     formatter: Formatter = Formatter.BLACK,
+    jobs: int = 1,
+    no_format_cache: bool = False,
+    no_template_cache: bool = False,
+    validation: ValidationMode = ValidationMode.FILE,
+    verbose: bool = False,
+    spec_cache: bool = False,
+    offline: bool = False,
+    timeout: float = REMOTE_SPEC_TIMEOUT,
+    profile: bool = False,
+    profile_json: Optional[str] = None,
+    profile_out: Optional[str] = None,
+    incremental: bool = False,
+    watch: bool = False,
+    check: bool = False,
 ) -> None:
     """
     Generate Python code from an OpenAPI 3.0 specification.
@@ -77,8 +192,67 @@ def main(
     Provide a SOURCE (file or URL) containing the OpenAPI 3 specification and
     an OUTPUT path, where the resulting client is created.
     """
+    # The generator is imported here, so --help and --version do not import it with its dependencies.
+    from openapi_python_generator.generate_data import generate_data
+    from openapi_python_generator.watch import Watcher
+
+    if watch:
+        # The watcher keeps the parsed specification of a local file itself and always writes the whole client.
+        unsupported = {
+            "--check": check,
+            "--incremental": incremental,
+            "--offline": offline,
+            "--spec-cache": spec_cache,
+            "--verbose": verbose,
+            "--profile": profile,
+            "--profile-json": profile_json is not None,
+            "--profile-out": profile_out is not None,
+        }
+        for option, value in unsupported.items():
+            if value:
+                raise click.UsageError(f"{option} cannot be combined with --watch.")
+        if source.startswith("http://") or source.startswith("https://"):
+            raise click.UsageError("--watch requires SOURCE to be a local file.")
+        Watcher(
+            source,
+            output,
+            library,
+            env_token_name,
+            use_orjson,
+            use_awaredatetime,
+            custom_template_path,
+            pydantic_version,
+            formatter,
+            jobs=jobs,
+            format_cache=not no_format_cache,
+            template_cache=not no_template_cache,
+            validation=validation,
+        ).watch()
+        return
+
     generate_data(
-        source, output, library, env_token_name, use_orjson, use_awaredatetime, custom_template_path, pydantic_version, formatter
+        source,
+        output,
+        library,
+        env_token_name,
+        use_orjson,
+        use_awaredatetime,
+        custom_template_path,
+        pydantic_version,
+        formatter,
+        jobs=jobs,
+        format_cache=not no_format_cache,
+        template_cache=not no_template_cache,
+        validation=validation,
+        verbose=verbose,
+        spec_cache=spec_cache,
+        offline=offline,
+        profile=profile,
+        profile_json=profile_json,
+        profile_out=profile_out,
+        incremental=incremental,
+        check=check,
+        timeout=timeout,
     )
 
 
@@ -0,0 +1,322 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from pathlib import PurePosixPath
+from typing import Any
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
+from typing import Union
+from urllib.parse import unquote
+from urllib.parse import urljoin
+from urllib.parse import urlparse
+
+import click
+
+from .cache import HttpCache
+from .common import REMOTE_SPEC_TIMEOUT
+from .generate_data import _cached_content
+from .generate_data import _decode_spec
+from .generate_data import _request_headers
+from .language_converters.python.ref_resolver import COMPONENT_SECTIONS
+from .language_converters.python.ref_resolver import component_pointer
+from .profiling import get_profiler
+
+
+# Number of documents read or fetched at the same time.
+BUNDLE_CONCURRENCY = 16
+
+# Keys whose values are schemas. Properties are schemas as well, they are found by their parent key.
+_SCHEMA_KEYS = {"schema", "items", "additionalProperties", "not"}
+_SCHEMA_LIST_KEYS = {"allOf", "anyOf", "oneOf"}
+
+Location = str
+Target = Tuple[Location, str]
+
+
+def _is_url(location: str) -> bool:
+    return location.startswith("http://") or location.startswith("https://")
+
+
+def _resolve_location(base: Location, reference: str) -> Location:
+    """
+    Resolve the document part of a reference relative to the document it appears in.
+    :param base: Location of the referencing document, an absolute path or a URL
+    :param reference: The reference without its fragment, e.g. ../schemas/Pet.yaml
+    """
+    if _is_url(reference):
+        return reference
+    if _is_url(base):
+        return urljoin(base, reference)
+    return os.path.normpath(os.path.join(os.path.dirname(base), unquote(reference)))
+
+
+def _split_ref(ref: str) -> Tuple[str, str]:
+    document, _, fragment = ref.partition("#")
+    return document, unquote(fragment)
+
+
+def _iter_refs(node: Any) -> Iterator[str]:
+    if isinstance(node, dict):
+        ref = node.get("$ref")
+        if isinstance(ref, str):
+            yield ref
+        for value in node.values():
+            yield from _iter_refs(value)
+    elif isinstance(node, list):
+        for item in node:
+            yield from _iter_refs(item)
+
+
+def _external_locations(document: Any, location: Location) -> Set[Location]:
+    """
+    Collect the locations of the documents referenced by a document.
+    """
+    locations = set()
+    for ref in _iter_refs(document):
+        file, _ = _split_ref(ref)
+        if file:
+            locations.add(_resolve_location(location, file))
+    return locations
+
+
+def _read_document(location: Location) -> Any:
+    try:
+        content = Path(location).read_bytes()
+    except OSError as e:
+        raise click.ClickException(f"Could not read {location}, which is referenced by the specification: {e}") from e
+    return _decode_spec(content, location)
+
+
+async def _fetch_document(client: Any, location: Location, offline: bool) -> bytes:
+    """
+    Fetch a remote document through the HTTP cache, like the specification itself.
+    """
+    import httpx
+
+    http_cache = HttpCache()
+    cached = http_cache.get(location)
+    if offline:
+        if cached is None:
+            raise click.ClickException(f"{location} is not cached and cannot be fetched in offline mode.")
+        return cached.body
+    try:
+        response = await client.get(location, headers=_request_headers(cached))
+        return _cached_content(http_cache, location, cached, response)
+    except httpx.HTTPError as e:
+        raise click.ClickException(f"Could not fetch {location}, which is referenced by the specification: {e}") from e
+
+
+async def _load_documents(
+    root: Any, root_location: Location, offline: bool, timeout: float = REMOTE_SPEC_TIMEOUT
+) -> Dict[Location, Any]:
+    """
+    Load every document referenced by the root document, directly or through other documents. The documents are
+    read and fetched concurrently, at most BUNDLE_CONCURRENCY at a time, and every document is loaded once.
+    :param timeout: Timeout in seconds for fetching a remote document
+    :return: The decoded documents, keyed by their location
+    """
+    documents: Dict[Location, Any] = {root_location: root}
+    tasks: Dict[Location, "asyncio.Future[None]"] = {}
+    semaphore = asyncio.Semaphore(BUNDLE_CONCURRENCY)
+    loop = asyncio.get_running_loop()
+    client: Any = None
+
+    async def load(location: Location) -> None:
+        nonlocal client
+        async with semaphore:
+            if _is_url(location):
+                if client is None:
+                    import httpx
+
+                    client = httpx.AsyncClient(timeout=timeout, follow_redirects=True)
+                content = await _fetch_document(client, location, offline)
+                document = await loop.run_in_executor(None, _decode_spec, content, location)
+            else:
+                document = await loop.run_in_executor(None, _read_document, location)
+        documents[location] = document
+        schedule(_external_locations(document, location))
+
+    def schedule(locations: Set[Location]) -> None:
+        for location in sorted(locations):
+            if location not in documents and location not in tasks:
+                tasks[location] = asyncio.ensure_future(load(location))
+
+    schedule(_external_locations(root, root_location))
+    try:
+        # Loading a document schedules the documents it references, so wait until no task is left.
+        while not all(task.done() for task in tasks.values()):
+            await asyncio.gather(*tasks.values())
+    finally:
+        for task in tasks.values():
+            task.cancel()
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+        if client is not None:
+            await client.aclose()
+    return documents
+
+
+class _Bundler:
+    """
+    Rewrite the references into other documents of a specification into references to its own components.
+    Components of other documents and schemas, which may be recursive, are added to the components of the
+    specification. Their names are kept if they are free and prefixed with the name of their document otherwise.
+    Everything else, e.g. path items and parameters stored in their own files, is inlined.
+    """
+
+    def __init__(self, root: Dict[str, Any], root_location: Location, documents: Dict[Location, Any]) -> None:
+        self.root = root
+        self.root_location = root_location
+        self.documents = documents
+        self.new_components: Dict[str, Dict[str, Any]] = {}
+        self.names: Dict[Tuple[str, Location, str], str] = {}
+        self.used_names: Dict[str, Set[str]] = {}
+        self.inlining: List[Target] = []
+
+        components = root.get("components") or {}
+        for section in COMPONENT_SECTIONS:
+            self.used_names[section] = set(components.get(section) or {})
+        # Components of the specification that are stored in another document keep their name.
+        for section in COMPONENT_SECTIONS:
+            for name, component in (components.get(section) or {}).items():
+                if isinstance(component, dict) and isinstance(component.get("$ref"), str):
+                    file, pointer = _split_ref(component["$ref"])
+                    if file:
+                        self.names[(section, _resolve_location(root_location, file), pointer)] = name
+
+    def bundle(self) -> Dict[str, Any]:
+        bundled = self._node(self.root, self.root_location, ())
+        if self.new_components:
+            components = bundled.setdefault("components", {})
+            for section, items in self.new_components.items():
+                components[section] = {**(components.get(section) or {}), **items}
+        return bundled
+
+    def _node(self, node: Any, location: Location, path: Tuple[Union[str, int], ...]) -> Any:
+        if isinstance(node, dict):
+            if isinstance(node.get("$ref"), str):
+                return self._ref(node, location, path)
+            return {key: self._node(value, location, path + (key,)) for key, value in node.items()}
+        if isinstance(node, list):
+            return [self._node(item, location, path + (index,)) for index, item in enumerate(node)]
+        return node
+
+    def _ref(self, node: Dict[str, Any], location: Location, path: Tuple[Union[str, int], ...]) -> Any:
+        file, pointer = _split_ref(node["$ref"])
+        target_location = _resolve_location(location, file) if file else location
+        if target_location == self.root_location:
+            return {**node, "$ref": "#" + node["$ref"].partition("#")[2]}
+
+        section = self._section(pointer, path)
+        if section is not None:
+            key = (section, target_location, pointer)
+            # A component of the specification stored in another document is inlined where it is declared.
+            if path != ("components", section, self.names.get(key)):
+                return {**node, "$ref": component_pointer(section, self._component(key))}
+        return self._inline(target_location, pointer, path)
+
+    @staticmethod
+    def _section(pointer: str, path: Tuple[Union[str, int], ...]) -> Optional[str]:
+        """
+        Get the section of the components a referenced object is added to, or None to inline it.
+        """
+        segments = pointer.split("/")[1:]
+        if len(segments) == 3 and segments[0] == "components" and segments[1] in COMPONENT_SECTIONS:
+            return segments[1]
+        if len(path) == 3 and path[0] == "components" and path[1] in COMPONENT_SECTIONS:
+            return str(path[1])
+        if path and (
+            path[-1] in _SCHEMA_KEYS
+            or (len(path) >= 2 and path[-2] == "properties")
+            or (len(path) >= 2 and path[-2] in _SCHEMA_LIST_KEYS and isinstance(path[-1], int))
+        ):
+            return "schemas"
+        return None
+
+    def _component(self, key: Tuple[str, Location, str]) -> str:
+        """
+        Get the name of the component a referenced object is added as, adding it on first use.
+        """
+        if key in self.names:
+            return self.names[key]
+        section, location, pointer = key
+        document_name = PurePosixPath(urlparse(location).path if _is_url(location) else location).stem
+        base_name = _unescape(pointer.split("/")[-1]) if pointer else document_name
+        name = base_name
+        if name in self.used_names[section]:
+            if pointer:
+                name = f"{document_name}_{base_name}"
+            candidate = name
+            suffix = 2
+            while candidate in self.used_names[section]:
+                candidate = f"{name}_{suffix}"
+                suffix += 1
+            name = candidate
+        self.names[key] = name
+        self.used_names[section].add(name)
+        # The name is taken before the object is bundled, so recursive references find it, and components keep the
+        # order they are first referenced in.
+        items = self.new_components.setdefault(section, {})
+        items[name] = None
+        items[name] = self._node(self._resolve_pointer(location, pointer), location, ("components", section, name))
+        return name
+
+    def _inline(self, location: Location, pointer: str, path: Tuple[Union[str, int], ...]) -> Any:
+        target = (location, pointer)
+        if target in self.inlining:
+            raise click.ClickException(
+                f"The reference to {location}#{pointer} is circular. Circular references can only be bundled if "
+                f"they point to schemas or components."
+            )
+        self.inlining.append(target)
+        try:
+            return self._node(self._resolve_pointer(location, pointer), location, path)
+        finally:
+            self.inlining.pop()
+
+    def _resolve_pointer(self, location: Location, pointer: str) -> Any:
+        node = self.documents[location]
+        for segment in pointer.split("/")[1:]:
+            segment = _unescape(segment)
+            try:
+                node = node[int(segment)] if isinstance(node, list) else node[segment]
+            except (KeyError, IndexError, ValueError, TypeError) as e:
+                raise click.ClickException(f"Could not resolve the reference {location}#{pointer}.") from e
+        return node
+
+
+def _unescape(segment: str) -> str:
+    return segment.replace("~1", "/").replace("~0", "~")
+
+
+def bundle_spec(
+    spec: Dict[str, Any], source: Union[str, Path], offline: bool = False, timeout: float = REMOTE_SPEC_TIMEOUT
+) -> Dict[str, Any]:
+    """
+    Bundle a specification split into several documents into a single one, before it is validated. References to
+    relative files and URLs are resolved relative to the document they appear in, and the documents are loaded
+    concurrently.
+    :param spec: The decoded specification
+    :param source: URL or file path of the specification
+    :param offline: Serve remote documents from the HTTP cache only
+    :param timeout: Timeout in seconds for fetching a remote document
+    :return: The specification with references into itself only
+    """
+    source = str(source)
+    root_location = source if _is_url(source) else os.path.abspath(source)
+    with get_profiler().phase("bundle"):
+        load = _load_documents(spec, root_location, offline, timeout)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            documents = asyncio.run(load)
+        else:
+            # asyncio.run cannot be called while an event loop is running in this thread, e.g. in Jupyter, so the
+            # documents are loaded by a loop in a thread of its own.
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                documents = executor.submit(asyncio.run, load).result()
+        return _Bundler(spec, root_location, documents).bundle()
@@ -0,0 +1,266 @@
+import hashlib
+import json
+import mmap
+import os
+import pickle  # noqa: S403
+import platform
+import secrets
+from importlib.metadata import version
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import NamedTuple
+from typing import Optional
+from typing import Union
+
+from . import __version__
+from .common import FormatOptions
+from .common import Formatter
+from .ruff_formatter import ruff_version
+
+if TYPE_CHECKING:  # pragma: no cover
+    from openapi_pydantic.v3.v3_0 import OpenAPI
+
+
+CACHE_DIR_ENV = "OPENAPI_PYTHON_GENERATOR_CACHE_DIR"
+FORMAT_CACHE_MAX_SIZE = 128 * 1024 * 1024
+SPEC_CACHE_MAX_SIZE = 256 * 1024 * 1024
+
+
+def get_cache_dir() -> Path:
+    """
+    Get the directory all on-disk caches of the generator live in. It can be overridden with the
+    OPENAPI_PYTHON_GENERATOR_CACHE_DIR environment variable and otherwise follows XDG_CACHE_HOME.
+    :return: Path to the cache directory
+    """
+    cache_dir = os.environ.get(CACHE_DIR_ENV)
+    if cache_dir:
+        return Path(cache_dir)
+    xdg_cache_home = os.environ.get("XDG_CACHE_HOME")
+    base_dir = Path(xdg_cache_home) if xdg_cache_home else Path.home() / ".cache"
+    return base_dir / "openapi-python-generator"
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    """
+    Write data to path, so that concurrent readers never see a partially written file. Unlike with mkstemp, the
+    file gets the permissions open() would give it, as the manifest is stored next to the generated files.
+    """
+    tmp_path = path.parent / f".tmp-{secrets.token_hex(8)}"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0), 0o666)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def _evict_least_recently_used(directory: Path, max_size: int) -> None:
+    """
+    Remove the entries of a cache directory with the oldest modification time, until the directory is smaller
+    than max_size bytes.
+    """
+    if not directory.is_dir():
+        return
+    entries = []
+    total_size = 0
+    for entry in directory.iterdir():
+        try:
+            stat = entry.stat()
+        except OSError:  # pragma: no cover
+            continue
+        entries.append((stat.st_mtime, stat.st_size, entry))
+        total_size += stat.st_size
+
+    entries.sort(key=lambda e: e[0])
+    for _, size, entry in entries:
+        if total_size <= max_size:
+            break
+        entry.unlink(missing_ok=True)
+        total_size -= size
+
+
+class FormatCache:
+    """
+    On-disk cache of formatted code. Entries are keyed by the hash of the unformatted content, the FormatOptions,
+    whether the imports are sorted and the versions of the formatter. The modification time of an entry is its last
+    use, which is used to evict the least recently used entries once the cache grows beyond max_size bytes.
+    """
+
+    def __init__(
+        self,
+        formatter: Formatter,
+        path: Optional[Path] = None,
+        max_size: int = FORMAT_CACHE_MAX_SIZE,
+        sort_imports: bool = True,
+    ) -> None:
+        self.path = (path if path is not None else get_cache_dir()) / "format"
+        self.max_size = max_size
+        versions = [ruff_version()] if formatter == Formatter.RUFF else [version("black"), version("isort")]
+        self._salt = "\0".join(
+            [
+                Formatter(formatter).value,
+                *versions,
+                str(FormatOptions.skip_validation),
+                str(FormatOptions.line_length),
+                str(sort_imports),
+            ]
+        ).encode()
+
+    def key(self, content: str) -> str:
+        """
+        Compute the cache key of unformatted content.
+        :param content: The unformatted code
+        :return: Hex digest identifying the content and the formatting options
+        """
+        digest = hashlib.sha256(self._salt)
+        digest.update(b"\0")
+        digest.update(content.encode())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up formatted code and mark the entry as recently used.
+        :param key: Key computed by FormatCache.key
+        :return: The formatted code or None, if the entry does not exist
+        """
+        entry = self.path / key
+        try:
+            content = entry.read_bytes().decode()
+            os.utime(entry)
+        except (OSError, UnicodeDecodeError):
+            return None
+        return content
+
+    def set(self, key: str, formatted: str) -> None:
+        """
+        Store formatted code. Failing to write the cache never fails the generation.
+        :param key: Key computed by FormatCache.key
+        :param formatted: The formatted code
+        """
+        try:
+            self.path.mkdir(parents=True, exist_ok=True)
+            _write_atomic(self.path / key, formatted.encode())
+        except OSError:  # pragma: no cover
+            pass
+
+    def evict(self) -> None:
+        """
+        Remove the least recently used entries until the cache is smaller than max_size.
+        """
+        _evict_least_recently_used(self.path, self.max_size)
+
+
+class SpecCache:
+    """
+    On-disk cache of validated OpenAPI objects. Entries are keyed by the hash of the raw specification and the
+    versions of the generator, openapi-pydantic, pydantic and python, as the pickled objects depend on all of them.
+    """
+
+    def __init__(self, path: Optional[Path] = None, max_size: int = SPEC_CACHE_MAX_SIZE) -> None:
+        self.path = (path if path is not None else get_cache_dir()) / "spec"
+        self.max_size = max_size
+        self._salt = "\0".join(
+            [
+                __version__,
+                version("openapi-pydantic"),
+                version("pydantic"),
+                platform.python_version(),
+            ]
+        ).encode()
+
+    def key(self, content: Union[bytes, mmap.mmap]) -> str:
+        """
+        Compute the cache key of a raw specification.
+        :param content: The raw content of the specification
+        :return: Hex digest identifying the specification and the library versions
+        """
+        digest = hashlib.sha256(self._salt)
+        digest.update(b"\0")
+        digest.update(content)
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional["OpenAPI"]:
+        """
+        Look up a validated specification and mark the entry as recently used.
+        :param key: Key computed by SpecCache.key
+        :return: The OpenAPI object or None, if the entry does not exist
+        """
+        from openapi_pydantic.v3.v3_0 import OpenAPI
+
+        entry = self.path / key
+        try:
+            data = pickle.loads(entry.read_bytes())  # noqa: S301
+            os.utime(entry)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return None
+        return data if isinstance(data, OpenAPI) else None
+
+    def set(self, key: str, data: "OpenAPI") -> None:
+        """
+        Store a validated specification and evict the least recently used entries. Failing to write the cache
+        never fails the generation.
+        :param key: Key computed by SpecCache.key
+        :param data: The OpenAPI object
+        """
+        try:
+            self.path.mkdir(parents=True, exist_ok=True)
+            _write_atomic(self.path / key, pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL))
+        except OSError:  # pragma: no cover
+            return
+        _evict_least_recently_used(self.path, self.max_size)
+
+
+class CachedResponse(NamedTuple):
+    """
+    Body of a remote specification and the validators needed to revalidate it.
+    """
+
+    body: bytes
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+class HttpCache:
+    """
+    On-disk cache of remote specifications. Every URL is stored as a body file and a JSON file holding the ETag
+    and Last-Modified headers, which are sent back to the server to revalidate the cached body.
+    """
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = (path if path is not None else get_cache_dir()) / "http"
+
+    def _entry(self, url: str) -> Path:
+        return self.path / hashlib.sha256(url.encode()).hexdigest()
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        """
+        Look up the cached response of a URL.
+        :param url: URL of the specification
+        :return: The cached response or None, if the URL was never fetched
+        """
+        entry = self._entry(url)
+        try:
+            meta = json.loads(entry.with_suffix(".json").read_bytes())
+            body = entry.with_suffix(".body").read_bytes()
+        except (OSError, ValueError):
+            return None
+        if meta.get("url") != url:  # pragma: no cover
+            return None
+        return CachedResponse(body, meta.get("etag"), meta.get("last_modified"))
+
+    def set(self, url: str, response: CachedResponse) -> None:
+        """
+        Store the response of a URL. Failing to write the cache never fails the generation.
+        :param url: URL of the specification
+        :param response: The response to cache
+        """
+        entry = self._entry(url)
+        meta = {"url": url, "etag": response.etag, "last_modified": response.last_modified}
+        try:
+            self.path.mkdir(parents=True, exist_ok=True)
+            _write_atomic(entry.with_suffix(".body"), response.body)
+            _write_atomic(entry.with_suffix(".json"), json.dumps(meta).encode())
+        except OSError:  # pragma: no cover
+            pass
@@ -1,8 +1,11 @@
 from enum import Enum
+from typing import TYPE_CHECKING
+from typing import Any
 from typing import Dict
 from typing import Optional
 
-from openapi_python_generator.models import LibraryConfig
+if TYPE_CHECKING:  # pragma: no cover
+    from openapi_python_generator.models import LibraryConfig
 
 
 class HTTPLibrary(str, Enum):
@@ -15,6 +18,13 @@ class HTTPLibrary(str, Enum):
     aiohttp = "aiohttp"
 
 
+def resolve_library(library: Optional[HTTPLibrary]) -> HTTPLibrary:
+    """
+    Get the HTTP library a client is generated for, httpx if none is given.
+    """
+    return HTTPLibrary.httpx if library is None else HTTPLibrary(library)
+
+
 class PydanticVersion(str, Enum):
     V1 = "v1"
     V2 = "v2"
@@ -26,33 +36,68 @@ class Formatter(str, Enum):
     """
 
     BLACK = "black"
+    RUFF = "ruff"
+    NONE = "none"
+    # Writes the code unformatted, like NONE, but checks that black would leave it unchanged.
+    VERIFY = "verify"
+
+
+class ValidationMode(str, Enum):
+    """
+    Enum for the available ways of checking the syntax of the generated code.
+    """
+
     NONE = "none"
+    FILE = "file"
+    SNIPPET = "snippet"
+
+
+# Default timeout in seconds for fetching a remote specification and the remote documents it references.
+REMOTE_SPEC_TIMEOUT = 30.0
+
 
 class FormatOptions:
     skip_validation: bool = False
     line_length: int = 120
 
 
-library_config_dict: Dict[Optional[HTTPLibrary], LibraryConfig] = {
-    HTTPLibrary.httpx: LibraryConfig(
-        name="httpx",
-        library_name="httpx",
-        template_name="httpx.jinja2",
-        include_async=True,
-        include_sync=True,
-    ),
-    HTTPLibrary.requests: LibraryConfig(
-        name="requests",
-        library_name="requests",
-        template_name="requests.jinja2",
-        include_async=False,
-        include_sync=True,
-    ),
-    HTTPLibrary.aiohttp: LibraryConfig(
-        name="aiohttp",
-        library_name="aiohttp",
-        template_name="aiohttp.jinja2",
-        include_async=True,
-        include_sync=False,
-    ),
-}
+if TYPE_CHECKING:  # pragma: no cover
+    library_config_dict: Dict[Optional[HTTPLibrary], LibraryConfig]
+
+
+def _library_config_dict() -> Dict[Optional[HTTPLibrary], "LibraryConfig"]:
+    from openapi_python_generator.models import LibraryConfig
+
+    return {
+        HTTPLibrary.httpx: LibraryConfig(
+            name="httpx",
+            library_name="httpx",
+            template_name="httpx.jinja2",
+            include_async=True,
+            include_sync=True,
+        ),
+        HTTPLibrary.requests: LibraryConfig(
+            name="requests",
+            library_name="requests",
+            template_name="requests.jinja2",
+            include_async=False,
+            include_sync=True,
+        ),
+        HTTPLibrary.aiohttp: LibraryConfig(
+            name="aiohttp",
+            library_name="aiohttp",
+            template_name="aiohttp.jinja2",
+            include_async=True,
+            include_sync=False,
+        ),
+    }
+
+
+def __getattr__(name: str) -> Any:
+    # The library configurations are pydantic models. They are built on first use, so importing the enums, e.g. for
+    # the command line interface, does not import pydantic and openapi-pydantic.
+    if name == "library_config_dict":
+        value = _library_config_dict()
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,109 +1,523 @@
+import ast
+import cProfile
+import mmap
+import os
+import re
+import time
+from collections import deque
+from itertools import zip_longest
+from contextlib import contextmanager
+from concurrent.futures import Future
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from pathlib import PurePosixPath
+from typing import Any
+from typing import Deque
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
 from typing import List
 from typing import Optional
+from typing import Tuple
 from typing import Union
+from urllib.parse import urlparse
 
-import black
 import click
-import httpx
-import isort
 import orjson
-import yaml
-from black import NothingChanged
-from httpx import ConnectError
-from httpx import ConnectTimeout
 from openapi_pydantic.v3.v3_0 import OpenAPI
 from pydantic import ValidationError
 
-from .common import FormatOptions, Formatter, HTTPLibrary, PydanticVersion
+from .cache import CachedResponse
+from .cache import FormatCache
+from .cache import HttpCache
+from .cache import SpecCache
+from .common import REMOTE_SPEC_TIMEOUT
+from .common import FormatOptions, Formatter, HTTPLibrary, PydanticVersion, ValidationMode
 from .common import library_config_dict
+from .common import resolve_library
 from .language_converters.python.generator import generator
+from .language_converters.python.imports import Imports
 from .language_converters.python.jinja_config import SERVICE_TEMPLATE
-from .language_converters.python.jinja_config import create_jinja_env
+from .language_converters.python.jinja_config import get_jinja_env
+from .language_converters.python.render_context import ServiceContext
+from .language_converters.python.model_generator import get_type_converter_stats
+from .manifest import file_digest
+from .manifest import load_manifest
+from .manifest import manifest_inputs
+from .manifest import manifest_is_current
+from .manifest import options_key
+from .manifest import write_manifest
 from .models import ConversionResult
+from .profiling import Profiler
+from .profiling import get_profiler
+from .profiling import set_profiler
+from .ruff_formatter import RUFF_BATCH_SIZE
+from .ruff_formatter import format_using_ruff
 
 
-def write_code(path: Path, content: str, formatter: Formatter) -> None:
+# Specifications of at least this size are memory-mapped instead of read.
+MMAP_THRESHOLD = 1024 * 1024
+SpecContent = Union[bytes, mmap.mmap]
+_first_non_whitespace_re = re.compile(rb"\S")
+# Matches a $ref that does not start with #, i.e. points into another document, in the raw content of a JSON or
+# YAML document. False positives, e.g. in descriptions, only cost a walk over the decoded specification.
+_external_ref_re = re.compile(rb"""["']?\$ref["']?\s*:(?!\s*["']?#)""")
+
+
+def write_code(path: Path, content: str, formatter: Formatter, sort_imports: bool = True) -> None:
     """
     Write the content to the file at the given path.
     :param path: The path to the file.
     :param content: The content to write.
     :param formatter: The formatter applied to the code written.
+    :param sort_imports: Sort the imports of the code.
+    """
+    formatted_contend = format_code(content, formatter, sort_imports)
+    with open(path, "w") as f:
+        f.write(formatted_contend)
+
+
+def format_code(content: str, formatter: Formatter, sort_imports: bool = True) -> str:
+    """
+    Apply the given formatter to the content.
+    :param content: The code to format.
+    :param formatter: The formatter applied to the code.
+    :param sort_imports: Sort the imports of the code. Code rendered by the built-in templates has sorted imports.
+    :return: The formatted code.
     """
     if formatter == Formatter.BLACK:
-        formatted_contend = format_using_black(content)
+        return format_using_black(content, sort_imports)
+    elif formatter == Formatter.RUFF:
+        return format_using_ruff([content], sort_imports)[0]
     elif formatter == Formatter.NONE:
-        formatted_contend = content
+        return content
+    elif formatter == Formatter.VERIFY:
+        error = verify_using_black(content, sort_imports)
+        if error is not None:
+            raise click.ClickException(error)
+        return content
     else:
         raise NotImplementedError(f"Missing implementation for formatter {formatter!r}.")
-    with open(path, "w") as f:
-        f.write(formatted_contend)
 
 
-def format_using_black(content: str) -> str:
+def format_using_black(content: str, sort_imports: bool = True) -> str:
+    # black and isort are only imported when formatting, they take long to import.
+    import black
+    import isort
+
+    profiler = get_profiler()
+    try:
+        with profiler.phase("black"):
+            formatted_contend = black.format_file_contents(
+                content, fast=FormatOptions.skip_validation, mode=black.FileMode(line_length=FormatOptions.line_length)
+            )
+    except black.NothingChanged:
+        formatted_contend = content
+    if not sort_imports:
+        return formatted_contend
+    with profiler.phase("isort"):
+        return isort.code(formatted_contend, line_length=FormatOptions.line_length)
+
+
+def verify_using_black(content: str, sort_imports: bool = True) -> Optional[str]:
+    """
+    Check that formatting the code with black (and isort, if the imports are sorted) leaves it unchanged.
+    :param content: The code to check.
+    :param sort_imports: Check the order of the imports with isort as well.
+    :return: A description of the first difference, or None if the code is formatted.
+    """
+    formatted = format_using_black(content, sort_imports)
+    if formatted == content:
+        return None
+    lines = zip_longest(content.splitlines(), formatted.splitlines())
+    line = next((number for number, (old, new) in enumerate(lines, 1) if old != new), 1)
+    return f"black would reformat the code, starting in line {line}"
+
+
+def _init_format_worker(skip_validation: bool, line_length: int) -> None:
+    """
+    Copy the FormatOptions of the parent process into a worker process.
+    """
+    FormatOptions.skip_validation = skip_validation
+    FormatOptions.line_length = line_length
+
+
+def _process_code(
+    content: str, formatter: Formatter, validate: bool, sort_imports: bool = True
+) -> Tuple[str, Optional[str]]:
+    """
+    Validate and format the code of a single file. Code that is not valid python is returned unformatted.
+    :param content: The unformatted code.
+    :param formatter: The formatter applied to the code.
+    :param validate: Check the syntax of the code with ast.parse before formatting it.
+    :param sort_imports: Sort the imports of the code.
+    :return: The formatted code and the syntax error, if any.
+    """
+    if validate:
+        error = _check_syntax(content)
+        if error is not None:
+            return content, error
+    if formatter == Formatter.VERIFY:
+        return content, verify_using_black(content, sort_imports)
+    return format_code(content, formatter, sort_imports), None
+
+
+def _check_syntax(content: str) -> Optional[str]:
+    """
+    Check the syntax of code with ast.parse.
+    :return: The syntax error, if any.
+    """
     try:
-        formatted_contend = black.format_file_contents(
-            content, fast=FormatOptions.skip_validation, mode=black.FileMode(line_length=FormatOptions.line_length)
+        with get_profiler().phase("syntax check"):
+            ast.parse(content)
+    except SyntaxError as e:
+        return str(e)
+    return None
+
+
+def _lookup_format_cache(format_cache: Optional[FormatCache], content: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Look up the content in the format cache.
+    :return: The cache key and the formatted code, if it was cached.
+    """
+    if format_cache is None:
+        return None, None
+    key = format_cache.key(content)
+    return key, format_cache.get(key)
+
+
+def _finish_file(
+    path: Path,
+    key: Optional[str],
+    result: Tuple[str, Optional[str]],
+    format_cache: Optional[FormatCache],
+    failed: Optional[List[Path]] = None,
+) -> Tuple[Path, str]:
+    """
+    Report errors of a processed file and store valid results in the format cache.
+    """
+    code, error = result
+    if error is not None:
+        click.echo(f"Error in {path}: {error}")
+        if failed is not None:
+            failed.append(path)
+    elif format_cache is not None and key is not None:
+        format_cache.set(key, code)
+    return path, code
+
+
+def _process_files(
+    files: Iterable[Tuple[Path, str]],
+    formatter: Formatter,
+    validate: bool = False,
+    jobs: int = 1,
+    format_cache: Optional[FormatCache] = None,
+    failed: Optional[List[Path]] = None,
+    sort_imports: bool = True,
+) -> Iterator[Tuple[Path, str]]:
+    """
+    Validate and format the given files, optionally spreading the work over a pool of worker processes. The files
+    are yielded in the order they were passed in, so the output does not depend on the number of jobs. Files found
+    in the format cache were valid when they were formatted and are neither validated nor formatted again.
+    :param files: Pairs of the target path and the unformatted content.
+    :param formatter: The formatter applied to the code.
+    :param validate: Check the syntax of every file with ast.parse.
+    :param jobs: Number of worker processes. A value of 1 processes the files in the current process. ruff formats
+    batches of files in the current process, using all cores by itself.
+    :param format_cache: Cache consulted before running the formatter.
+    :param failed: List the paths of files with syntax errors or, with Formatter.VERIFY, unformatted code are added
+    to.
+    :param sort_imports: Sort the imports of the code. The format cache has to be created with the same setting.
+    :return: Pairs of the target path and the formatted content.
+    """
+    profiler = get_profiler()
+    if formatter == Formatter.RUFF:
+        # ruff formats a whole batch of files with a single call and uses all cores by itself.
+        batch: List[Tuple[Path, Optional[str], Optional[str], str]] = []
+        for path, content in files:
+            key, cached = _lookup_format_cache(format_cache, content)
+            batch.append((path, key, cached, content))
+            if len(batch) >= RUFF_BATCH_SIZE:
+                yield from _process_batch(batch, validate, format_cache, failed, sort_imports)
+                batch = []
+        yield from _process_batch(batch, validate, format_cache, failed, sort_imports)
+        return
+
+    if jobs <= 1 or (formatter == Formatter.NONE and not validate):
+        for path, content in files:
+            key, cached = _lookup_format_cache(format_cache, content)
+            if cached is not None:
+                yield path, cached
+            else:
+                result = _process_code(content, formatter, validate, sort_imports)
+                yield _finish_file(path, key, result, format_cache, failed)
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=_init_format_worker,
+        initargs=(FormatOptions.skip_validation, FormatOptions.line_length),
+    ) as executor:
+        # Only keep a bounded number of files in flight, so memory does not grow with the size of the spec.
+        # Cache hits are queued as completed futures, to keep them in order with the files being processed.
+        pending: Deque[Tuple[Path, Optional[str], "Future[Tuple[str, Optional[str]]]"]] = deque()
+        for path, content in files:
+            key, cached = _lookup_format_cache(format_cache, content)
+            if cached is not None:
+                future: "Future[Tuple[str, Optional[str]]]" = Future()
+                future.set_result((cached, None))
+                pending.append((path, None, future))
+            else:
+                pending.append((path, key, executor.submit(_process_code, content, formatter, validate, sort_imports)))
+            if len(pending) >= jobs * 4:
+                done_path, done_key, done_future = pending.popleft()
+                # The workers are not profiled, the time waiting for them is reported instead of black and isort.
+                with profiler.phase("formatting"):
+                    result = done_future.result()
+                yield _finish_file(done_path, done_key, result, format_cache, failed)
+        while pending:
+            done_path, done_key, done_future = pending.popleft()
+            with profiler.phase("formatting"):
+                result = done_future.result()
+            yield _finish_file(done_path, done_key, result, format_cache, failed)
+
+
+def _process_batch(
+    batch: List[Tuple[Path, Optional[str], Optional[str], str]],
+    validate: bool,
+    format_cache: Optional[FormatCache],
+    failed: Optional[List[Path]] = None,
+    sort_imports: bool = True,
+) -> Iterator[Tuple[Path, str]]:
+    """
+    Validate a batch of files and format the valid ones that are not cached with a single call of ruff.
+    :param batch: The target path, the format cache key, the cached code and the unformatted code of every file.
+    :param validate: Check the syntax of every file with ast.parse.
+    :param format_cache: Cache storing the formatted code.
+    :param failed: List the paths of files with syntax errors are added to.
+    :param sort_imports: Sort the imports of the code.
+    :return: Pairs of the target path and the formatted content, in the order of the batch.
+    """
+    results: List[Tuple[str, Optional[str]]] = []
+    valid: List[int] = []
+    for index, (_, _, cached, content) in enumerate(batch):
+        if cached is not None:
+            results.append((cached, None))
+            continue
+        error = _check_syntax(content) if validate else None
+        results.append((content, error))
+        if error is None:
+            valid.append(index)
+
+    with get_profiler().phase("ruff"):
+        formatted = format_using_ruff([batch[index][3] for index in valid], sort_imports)
+    for index, code in zip(valid, formatted):
+        results[index] = (code, None)
+
+    for (path, key, cached, _), result in zip(batch, results):
+        if cached is not None:
+            yield path, cached
+        else:
+            yield _finish_file(path, key, result, format_cache, failed)
+
+
+def check_failed(formatter: Formatter, failed: List[Path]) -> None:
+    """
+    Fail the generation if files have syntax errors or, with Formatter.VERIFY, are not formatted like black formats
+    them. The files are still written, so the errors reported for them can be looked at.
+    :param formatter: The formatter applied to the code.
+    :param failed: The paths of the files that failed the checks.
+    """
+    if not failed:
+        return
+    if formatter == Formatter.VERIFY:
+        raise click.ClickException(
+            f"{len(failed)} generated files have syntax errors or are not formatted like black formats them."
         )
-    except NothingChanged:
-        return content
-    return isort.code(formatted_contend, line_length=FormatOptions.line_length)
+    raise click.ClickException(f"{len(failed)} generated files have syntax errors.")
 
 
-def get_open_api(source: Union[str, Path]) -> OpenAPI:
+def _is_json(content: SpecContent, name: str) -> bool:
     """
-    Tries to fetch the openapi specification file from the web or load from a local file.
-    Supports both JSON and YAML formats. Returns the according OpenAPI object.
+    Decide whether a specification is JSON or YAML by its file extension, or by its first non-whitespace byte if
+    the extension is not conclusive.
+    :param content: Raw content of the specification
+    :param name: File name or URL of the specification
+    :return: True for JSON, False for YAML
+    """
+    suffix = PurePosixPath(urlparse(name).path if "://" in name else name).suffix.lower()
+    if suffix == ".json":
+        return True
+    if suffix in (".yaml", ".yml"):
+        return False
+    first_char = _first_non_whitespace_re.search(content)
+    return first_char is not None and first_char.group() in (b"{", b"[")
+
+
+def _decode_spec(content: SpecContent, name: str) -> Dict[str, Any]:
+    """
+    Decode the raw content of a specification, which is passed to orjson without copying it.
+    :param content: Raw content of the specification
+    :param name: File name or URL of the specification
+    :return: The decoded specification
+    """
+    if _is_json(content, name):
+        try:
+            with memoryview(content) as view:
+                return orjson.loads(view)
+        except orjson.JSONDecodeError:
+            # YAML is a superset of JSON, so give the YAML parser a chance to read it.
+            pass
+
+    import yaml
+
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    data = content if isinstance(content, bytes) else content[:]
+    try:
+        # The loader is a safe loader, CSafeLoader only parses faster than SafeLoader.
+        return yaml.load(data, Loader=loader)  # type: ignore  # noqa: S506
+    except yaml.YAMLError as e:
+        click.echo(f"File {name} is neither a valid JSON nor YAML file: {str(e)}")
+        raise
+
+
+def _fetch_spec(url: str, offline: bool = False, timeout: float = REMOTE_SPEC_TIMEOUT) -> bytes:
+    """
+    Fetch a remote specification through the HTTP cache. A cached copy is revalidated with a conditional request
+    and reused if the server answers with 304 Not Modified.
+    :param url: URL of the specification
+    :param offline: Serve the specification from the cache only, without any request
+    :param timeout: Timeout of the request in seconds
+    :return: The raw content of the specification
+    """
+    import httpx
+
+    http_cache = HttpCache()
+    cached = http_cache.get(url)
+    if offline:
+        if cached is None:
+            raise httpx.ConnectError(f"{url} is not cached and cannot be fetched in offline mode.")
+        return cached.body
+
+    response = httpx.get(url, headers=_request_headers(cached), timeout=timeout, follow_redirects=True)
+    return _cached_content(http_cache, url, cached, response)
+
+
+def _request_headers(cached: Optional[CachedResponse]) -> Dict[str, str]:
+    """
+    Build the headers of a request for a remote document, which are conditional if a cached copy exists.
+    """
+    headers = {"Accept-Encoding": "gzip, deflate"}
+    if cached is not None and cached.etag is not None:
+        headers["If-None-Match"] = cached.etag
+    if cached is not None and cached.last_modified is not None:
+        headers["If-Modified-Since"] = cached.last_modified
+    return headers
+
+
+def _cached_content(http_cache: HttpCache, url: str, cached: Optional[CachedResponse], response: Any) -> bytes:
+    """
+    Get the content of a remote document from the response to a request built with _request_headers, storing it
+    in the HTTP cache.
+    :param http_cache: The HTTP cache
+    :param url: URL of the document
+    :param cached: The cached copy of the document the request was built with
+    :param response: The httpx response
+    :return: The raw content of the document
+    """
+    if response.status_code == 304 and cached is not None:
+        return cached.body
+    response.raise_for_status()
+
+    http_cache.set(
+        url,
+        CachedResponse(response.content, response.headers.get("ETag"), response.headers.get("Last-Modified")),
+    )
+    return response.content
+
+
+@contextmanager
+def _read_spec(
+    source: Union[str, Path], offline: bool = False, timeout: float = REMOTE_SPEC_TIMEOUT
+) -> Iterator[SpecContent]:
+    """
+    Fetch the raw openapi specification from the web or read it from a local file. Local files are read as bytes,
+    large ones are memory-mapped for the duration of the context.
+    :param source: URL or file path to the OpenAPI specification
+    :param offline: Serve remote specifications from the HTTP cache only
+    :param timeout: Timeout in seconds for fetching a remote specification
+    :return: Context yielding the raw content of the specification
+    """
+    profiler = get_profiler()
+    # Handle remote files
+    if not isinstance(source, Path) and (
+            source.startswith("http://") or source.startswith("https://")
+    ):
+        from httpx import ConnectError
+        from httpx import ConnectTimeout
+
+        try:
+            with profiler.phase("fetch"):
+                content = _fetch_spec(source, offline, timeout)
+        except (ConnectError, ConnectTimeout) as e:
+            message = str(e) if offline else f"Could not connect to {source}."
+            click.echo(message)
+            raise ConnectError(message) from None
+        yield content
+        return
+
+    try:
+        f = open(source, "rb")
+    except FileNotFoundError:
+        click.echo(
+            f"File {source} not found. Please make sure to pass the path to the OpenAPI specification."
+        )
+        raise
+
+    # Handle local files
+    with f:
+        if os.fstat(f.fileno()).st_size < MMAP_THRESHOLD:
+            with profiler.phase("fetch"):
+                content = f.read()
+            yield content
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+
+
+def load_spec(
+    source: Union[str, Path], offline: bool = False, timeout: float = REMOTE_SPEC_TIMEOUT
+) -> Dict[str, Any]:
+    """
+    Fetch the openapi specification from the web or load it from a local file and decode it. Supports both JSON
+    and YAML formats.
 
     Args:
         source: URL or file path to the OpenAPI specification
+        offline: Serve remote specifications from the HTTP cache only
+        timeout: Timeout in seconds for fetching a remote specification
 
     Returns:
-        OpenAPI: Parsed OpenAPI specification object
+        Dict[str, Any]: The decoded specification
 
     Raises:
         FileNotFoundError: If the specified file cannot be found
         ConnectError: If the URL cannot be accessed
-        ValidationError: If the specification is invalid
-        JSONDecodeError/YAMLError: If the file cannot be parsed
+        YAMLError: If the file cannot be parsed
     """
-    try:
-        # Handle remote files
-        if not isinstance(source, Path) and (
-                source.startswith("http://") or source.startswith("https://")
-        ):
-            content = httpx.get(source).text
-            # Try JSON first, then YAML for remote files
-            try:
-                return OpenAPI(**orjson.loads(content))
-            except orjson.JSONDecodeError:
-                return OpenAPI(**yaml.safe_load(content))
-
-        # Handle local files
-        with open(source, "r") as f:
-            file_content = f.read()
-
-            # Try JSON first
-            try:
-                return OpenAPI(**orjson.loads(file_content))
-            except orjson.JSONDecodeError:
-                # If JSON fails, try YAML
-                try:
-                    return OpenAPI(**yaml.safe_load(file_content))
-                except yaml.YAMLError as e:
-                    click.echo(
-                        f"File {source} is neither a valid JSON nor YAML file: {str(e)}"
-                    )
-                    raise
+    with _read_spec(source, offline, timeout) as content:
+        return _decode_spec(content, str(source))
 
-    except FileNotFoundError:
-        click.echo(
-            f"File {source} not found. Please make sure to pass the path to the OpenAPI specification."
-        )
-        raise
-    except (ConnectError, ConnectTimeout):
-        click.echo(f"Could not connect to {source}.")
-        raise ConnectError(f"Could not connect to {source}.") from None
+
+def parse_spec(spec: Dict[str, Any], source: Union[str, Path]) -> OpenAPI:
+    """
+    Validate a decoded specification and return the according OpenAPI object.
+    :param spec: The decoded specification
+    :param source: URL or file path of the specification, used in error messages
+    :return: Parsed OpenAPI specification object
+    """
+    try:
+        return OpenAPI(**spec)
     except ValidationError:
         click.echo(
             f"File {source} is not a valid OpenAPI 3.0 specification."
@@ -111,14 +525,175 @@ def get_open_api(source: Union[str, Path]) -> OpenAPI:
         raise
 
 
-def write_data(data: ConversionResult, output: Union[str, Path], formatter: Formatter) -> None:
+def get_open_api(
+    source: Union[str, Path],
+    verbose: bool = False,
+    spec_cache: bool = False,
+    offline: bool = False,
+    timeout: float = REMOTE_SPEC_TIMEOUT,
+) -> OpenAPI:
+    """
+    Tries to fetch the openapi specification file from the web or load from a local file.
+    Supports both JSON and YAML formats. Returns the according OpenAPI object.
+
+    Args:
+        source: URL or file path to the OpenAPI specification
+        verbose: Report the time spent loading and validating the specification
+        spec_cache: Reuse the OpenAPI object validated by a previous run for an unchanged specification
+        offline: Serve remote specifications from the HTTP cache only
+        timeout: Timeout in seconds for fetching a remote specification and the remote documents it references
+
+    Returns:
+        OpenAPI: Parsed OpenAPI specification object
+
+    Raises:
+        FileNotFoundError: If the specified file cannot be found
+        ConnectError: If the URL cannot be accessed
+        ValidationError: If the specification is invalid
+        JSONDecodeError/YAMLError: If the file cannot be parsed
+    """
+    start = time.perf_counter()
+    profiler = get_profiler()
+    cache = SpecCache() if spec_cache else None
+    key = None
+    with _read_spec(source, offline, timeout) as content:
+        # The spec cache is keyed by the content of the specification, which does not cover the documents it
+        # references, so bundled specifications are not cached.
+        bundle = _external_ref_re.search(content) is not None
+        if cache is not None and not bundle:
+            key = cache.key(content)
+            cached = cache.get(key)
+            if cached is not None:
+                if verbose:
+                    click.echo(f"Loaded {source} from the spec cache in {time.perf_counter() - start:.3f}s")
+                return cached
+        with profiler.phase("parse"):
+            spec = _decode_spec(content, str(source))
+    if bundle:
+        # The bundler is only imported for specifications split into several documents.
+        from .bundler import bundle_spec
+
+        spec = bundle_spec(spec, source, offline, timeout)
+    loaded = time.perf_counter()
+    with profiler.phase("validation"):
+        data = parse_spec(spec, source)
+    validated = time.perf_counter()
+    if cache is not None and key is not None:
+        cache.set(key, data)
+    if verbose:
+        click.echo(f"Loaded {source} in {loaded - start:.3f}s, validated it in {validated - loaded:.3f}s")
+    return data
+
+
+def _iter_files(
+    data: ConversionResult, output: Path, model_names: Optional[List[str]] = None
+) -> Iterator[Tuple[Path, str]]:
+    """
+    Yield the path and the unformatted content of every file of the client, in the order they are written.
+    :param data: The data to write.
+    :param output: The path to the output folder.
+    :param model_names: File names of all models of the client, if data only holds some of them.
+    """
+    models_path = output / "models"
+    services_path = output / "services"
+
+    # The models.
+    for model in data.models:
+        yield models_path / f"{model.file_name}.py", model.content
+
+    # models.__init__.py file containing imports to all models.
+    if model_names is None:
+        model_names = [model.file_name for model in data.models]
+    models_init = Imports(f"from .{name} import *" for name in model_names).render()
+    yield models_path / "__init__.py", models_init + "\n" if models_init else ""
+
+    # The services.
+    jinja_env = get_jinja_env()
+    profiler = get_profiler()
+    for service in data.services:
+        if len(service.operations) == 0:
+            continue
+        with profiler.phase("rendering"):
+            content = jinja_env.get_template(SERVICE_TEMPLATE).render(ServiceContext.from_service(service).as_dict())
+        yield services_path / f"{service.file_name}.py", content
+
+    # services.__init__.py file.
+    yield services_path / "__init__.py", ""
+
+    # The api_config.py file.
+    yield output / "api_config.py", data.api_config.content
+
+    # The __init__.py file.
+    yield output / "__init__.py", "from .api_config import *\nfrom .models import *\nfrom .services import *\n"
+
+
+def stream_data(
+    data: ConversionResult,
+    formatter: Formatter = Formatter.BLACK,
+    jobs: int = 1,
+    format_cache: bool = False,
+    validation: ValidationMode = ValidationMode.FILE,
+) -> Iterator[Tuple[Path, str]]:
+    """
+    Yield the formatted files of the client without writing them. The files are formatted while the iterator is
+    consumed, so only a bounded number of formatted files is held in memory. The rendered code of every file is
+    held in data, which the generator has built before.
+    :param data: The data to stream.
+    :param formatter: The formatter applied to the code.
+    :param jobs: Number of worker processes used to format the code.
+    :param format_cache: Reuse formatted code of previous runs from the on-disk cache. Disabled by default, so
+    nothing is read from or written to the filesystem.
+    :param validation: With ValidationMode.FILE, the syntax of every file is checked before it is formatted.
+    :return: Pairs of the path relative to the output folder and the formatted content. click.ClickException is
+    raised after the last file if any file has a syntax error or, with Formatter.VERIFY, is not formatted like black
+    formats it.
+    """
+    cache = None
+    if format_cache and formatter != Formatter.NONE:
+        cache = FormatCache(formatter, sort_imports=data.sort_imports)
+    validate = validation == ValidationMode.FILE
+    failed: List[Path] = []
+    files = _iter_files(data, Path())
+    yield from _process_files(files, formatter, validate, jobs, cache, failed, data.sort_imports)
+
+    if cache is not None:
+        cache.evict()
+    check_failed(formatter, failed)
+
+
+def _read_text(path: Path) -> Optional[str]:
+    """
+    Read a file of the client, if it exists.
+    """
+    try:
+        return path.read_text()
+    except OSError:
+        return None
+
+
+def write_data(
+    data: ConversionResult,
+    output: Union[str, Path],
+    formatter: Formatter,
+    jobs: int = 1,
+    format_cache: bool = True,
+    validation: ValidationMode = ValidationMode.FILE,
+    inputs: Optional[Dict[str, str]] = None,
+) -> int:
     """
     This function will firstly create the folder structure of output, if it doesn't exist. Then it will create the
     models from data.models into the models sub module of the output folder. After this, the services will be created
     into the services sub module of the output folder.
+    Files whose content on disk is unchanged are not written again, so their mtime is kept, and files listed in the
+    manifest of the previous run that are not part of the client anymore are removed.
     :param data: The data to write.
     :param output: The path to the output folder.
     :param formatter: The formatter applied to the code written.
+    :param jobs: Number of worker processes used to format the code.
+    :param format_cache: Reuse formatted code of previous runs from the on-disk cache.
+    :param validation: With ValidationMode.FILE, the syntax of every file is checked before it is formatted.
+    :param inputs: The manifest_inputs of the run, stored in the manifest.
+    :return: Number of files written or removed
     """
 
     # Create the folder structure of the output folder.
@@ -132,46 +707,62 @@ def write_data(data: ConversionResult, output: Union[str, Path], formatter: Form
     services_path = Path(output) / "services"
     services_path.mkdir(parents=True, exist_ok=True)
 
-    files: List[str] = []
+    manifest = load_manifest(Path(output))
+    old_files: Dict[str, str] = manifest["files"] if manifest is not None else {}
+    files: Dict[str, str] = {}
+    written = 0
 
-    # Write the models.
-    for model in data.models:
-        files.append(model.file_name)
-        write_code(models_path / f"{model.file_name}.py", model.content, formatter)
-
-    # Create models.__init__.py file containing imports to all models.
-    write_code(
-        models_path / "__init__.py",
-        "\n".join([f"from .{file} import *" for file in files]),
-        formatter,
-    )
-
-    files = []
-
-    # Write the services.
-    jinja_env = create_jinja_env()
-    for service in data.services:
-        if len(service.operations) == 0:
+    # Files are written by the current process in a fixed order, only the formatting is spread over the workers.
+    profiler = get_profiler()
+    for path, content in stream_data(data, formatter, jobs, format_cache, validation):
+        file = path.as_posix()
+        files[file] = file_digest(content)
+        target = Path(output) / path
+        # The file on disk is compared rather than the manifest, so files edited by hand are restored.
+        if _read_text(target) == content:
             continue
-        files.append(service.file_name)
-        write_code(
-            services_path / f"{service.file_name}.py",
-            jinja_env.get_template(SERVICE_TEMPLATE).render(**service.dict()),
-            formatter,
-        )
+        with profiler.phase("writes"), open(target, "w") as f:
+            f.write(content)
+        written += 1
 
-    # Create services.__init__.py file containing imports to all services.
-    write_code(services_path / "__init__.py", "", formatter)
+    for file in old_files.keys() - files.keys():
+        stale = Path(output) / file
+        if stale.exists():
+            stale.unlink()
+            written += 1
+    write_manifest(Path(output), inputs, files)
+    return written
 
-    # Write the api_config.py file.
-    write_code(Path(output) / "api_config.py", data.api_config.content, formatter)
 
-    # Write the __init__.py file.
-    write_code(
-        Path(output) / "__init__.py",
-        "from .models import *\nfrom .services import *\nfrom .api_config import *",
-        formatter,
-    )
+def check_data(
+    data: ConversionResult,
+    output: Union[str, Path],
+    formatter: Formatter,
+    jobs: int = 1,
+    format_cache: bool = True,
+    validation: ValidationMode = ValidationMode.FILE,
+) -> List[str]:
+    """
+    Compare the client in the output folder with the generated files, without writing anything.
+    :param data: The generated data.
+    :param output: The path to the output folder.
+    :param formatter: The formatter applied to the code.
+    :param jobs: Number of worker processes used to format the code.
+    :param format_cache: Reuse formatted code of previous runs from the on-disk cache.
+    :param validation: With ValidationMode.FILE, the syntax of every file is checked before it is formatted.
+    :return: The paths, relative to the output folder, of the files write_data would write or remove
+    """
+    manifest = load_manifest(Path(output))
+    old_files: Dict[str, str] = manifest["files"] if manifest is not None else {}
+    expected = set()
+    changed = []
+    for path, content in stream_data(data, formatter, jobs, format_cache, validation):
+        file = path.as_posix()
+        expected.add(file)
+        if _read_text(Path(output) / path) != content:
+            changed.append(file)
+    changed += sorted(file for file in old_files.keys() - expected if (Path(output) / file).exists())
+    return changed
 
 
 def generate_data(
@@ -184,13 +775,149 @@ def generate_data(
     custom_template_path: Optional[str] = None,
     pydantic_version: PydanticVersion = PydanticVersion.V2,
     formatter: Formatter = Formatter.BLACK,
+    jobs: int = 1,
+    format_cache: bool = True,
+    template_cache: bool = True,
+    validation: ValidationMode = ValidationMode.FILE,
+    verbose: bool = False,
+    spec_cache: bool = False,
+    offline: bool = False,
+    profile: bool = False,
+    profile_json: Optional[Union[str, Path]] = None,
+    profile_out: Optional[Union[str, Path]] = None,
+    incremental: bool = False,
+    check: bool = False,
+    timeout: float = REMOTE_SPEC_TIMEOUT,
 ) -> None:
     """
-    Generate Python code from an OpenAPI 3.0 specification.
+    Generate Python code from an OpenAPI 3.0 specification. With check, nothing is written, and click.ClickException
+    is raised if the client in output is not up to date. The timeout in seconds applies to fetching a remote
+    specification and the remote documents it references.
     """
-    data = get_open_api(source)
+    profiler = Profiler(enabled=profile or profile_json is not None)
+    set_profiler(profiler)
+    c_profile = cProfile.Profile() if profile_out is not None else None
+    profiler.start()
+    if c_profile is not None:
+        c_profile.enable()
+    try:
+        _generate_data(
+            source,
+            output,
+            resolve_library(library),
+            env_token_name,
+            use_orjson,
+            use_awaredatetime,
+            custom_template_path,
+            pydantic_version,
+            formatter,
+            jobs,
+            format_cache,
+            template_cache,
+            validation,
+            verbose,
+            spec_cache,
+            offline,
+            incremental,
+            check,
+            timeout,
+        )
+    finally:
+        if c_profile is not None:
+            c_profile.disable()
+        profiler.stop()
+        set_profiler(Profiler())
+
+    if c_profile is not None:
+        c_profile.dump_stats(str(profile_out))
+    if profiler.enabled:
+        click.echo(profiler.format_report())
+    if profile_json is not None:
+        profiler.write_json(profile_json)
+
+
+def _generate_data(
+    source: Union[str, Path],
+    output: Union[str, Path],
+    library: HTTPLibrary,
+    env_token_name: Optional[str],
+    use_orjson: bool,
+    use_awaredatetime: bool,
+    custom_template_path: Optional[str],
+    pydantic_version: PydanticVersion,
+    formatter: Formatter,
+    jobs: int,
+    format_cache: bool,
+    template_cache: bool,
+    validation: ValidationMode,
+    verbose: bool,
+    spec_cache: bool,
+    offline: bool,
+    incremental: bool,
+    check: bool,
+    timeout: float,
+) -> None:
+    data = get_open_api(source, verbose, spec_cache, offline, timeout)
+    options = options_key(
+        library,
+        env_token_name,
+        use_orjson,
+        use_awaredatetime,
+        custom_template_path,
+        pydantic_version,
+        formatter,
+        validation,
+    )
+
+    if check:
+        click.echo(f"Checking {output} against {source}")
+        manifest = load_manifest(Path(output))
+        # An unchanged client generated from the same inputs does not have to be generated again to check it.
+        if manifest is not None and manifest_is_current(Path(output), manifest, manifest_inputs(data, options)):
+            changed = []
+        else:
+            result = generator(
+                data,
+                library_config_dict[library],
+                env_token_name,
+                use_orjson,
+                use_awaredatetime,
+                custom_template_path,
+                pydantic_version,
+                template_cache,
+                validation,
+                jobs=jobs,
+            )
+            changed = check_data(result, output, formatter, jobs, format_cache, validation)
+        for file in changed:
+            click.echo(f"Out of date: {file}")
+        if changed:
+            raise click.ClickException(f"{len(changed)} files of {output} are not up to date.")
+        click.echo(f"{output} is up to date")
+        return
+
     click.echo(f"Generating data from {source}")
 
+    if incremental:
+        from .incremental import generate_incremental
+
+        generate_incremental(
+            data,
+            output,
+            library,
+            env_token_name,
+            use_orjson,
+            use_awaredatetime,
+            custom_template_path,
+            pydantic_version,
+            formatter,
+            jobs,
+            format_cache,
+            template_cache,
+            validation,
+        )
+        return
+
     result = generator(
         data,
         library_config_dict[library],
@@ -199,6 +926,12 @@ def generate_data(
         use_awaredatetime,
         custom_template_path,
         pydantic_version,
+        template_cache,
+        validation,
+        jobs=jobs,
     )
+    if verbose:
+        hits, misses = get_type_converter_stats()
+        click.echo(f"Converted {misses} types, reused {hits} conversions")
 
-    write_data(result, output, formatter)
+    write_data(result, output, formatter, jobs, format_cache, validation, manifest_inputs(data, options))
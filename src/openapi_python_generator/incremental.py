@@ -0,0 +1,372 @@
+import json
+import re
+from pathlib import Path
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
+from typing import Union
+
+import click
+from openapi_pydantic.v3.v3_0 import OpenAPI
+
+from .cache import FormatCache
+from .cache import _write_atomic
+from .common import Formatter
+from .common import HTTPLibrary
+from .common import PydanticVersion
+from .common import ValidationMode
+from .common import library_config_dict
+from .common import resolve_library
+from .generate_data import _iter_files
+from .generate_data import _process_files
+from .generate_data import check_failed
+from .language_converters.python.generator import generator
+from .language_converters.python.ref_resolver import COMPONENT_SECTIONS
+from .language_converters.python.ref_resolver import RefResolver
+from .language_converters.python.ref_resolver import component_pointer
+from .language_converters.python.ref_resolver import get_ref_resolver
+from .language_converters.python.ref_resolver import set_ref_resolver
+from .language_converters.python.service_generator import HTTP_OPERATIONS
+from .language_converters.python.service_generator import get_operation_tag
+from .manifest import digest
+from .manifest import file_digest
+from .manifest import load_manifest
+from .manifest import manifest_inputs
+from .manifest import options_key
+from .manifest import write_manifest
+from .profiling import get_profiler
+
+
+# The state of an incrementally generated client, stored in its output directory.
+STATE_FILE = ".openapi-python-generator.json"
+STATE_VERSION = 1
+
+_ref_re = re.compile(r'"\$ref":"(#/components/[^"]*)"')
+
+
+def _parse_pointer(ref: str) -> Optional[Tuple[str, str]]:
+    """
+    Split a local pointer to a component into its section and name.
+    :param ref: The pointer, e.g. #/components/schemas/Name
+    :return: The section and the unescaped name, or None if ref is no pointer to a component
+    """
+    parts = ref.split("/", 3)
+    if len(parts) != 4 or parts[0] != "#" or parts[1] != "components":
+        return None
+    return parts[2], parts[3].replace("~1", "/").replace("~0", "~")
+
+
+class SchemaNode:
+    """
+    Inputs of the model of a schema: the schema itself, its python name and the schemas it references.
+    """
+
+    __slots__ = ("hash", "refs")
+
+    def __init__(self, hash: str, refs: Set[str]) -> None:
+        self.hash = hash
+        self.refs = refs
+
+
+class OperationNode:
+    """
+    Inputs of an operation: the operation itself, the components it references and the tag it is grouped by.
+    """
+
+    __slots__ = ("hash", "schemas", "tag")
+
+    def __init__(self, hash: str, schemas: Set[str], tag: Optional[str]) -> None:
+        self.hash = hash
+        self.schemas = schemas
+        self.tag = tag
+
+
+class DependencyGraph:
+    """
+    Graph of the inputs of the generated files. Schemas point to the schemas referencing them and to the operations
+    using them, operations point to the service of their tag. Every node carries the hash of its own inputs, so two
+    graphs can be compared to find the models and services that have to be generated again.
+
+    The model of a schema only depends on the schema itself and on the python names of the schemas it references.
+    An operation also depends on the contents of the parameters, request bodies and responses it references.
+    """
+
+    def __init__(self, data: OpenAPI, resolver: RefResolver) -> None:
+        self.schemas: Dict[str, SchemaNode] = {}
+        self.operations: Dict[str, OperationNode] = {}
+        self._components: Dict[str, Tuple[str, Set[str]]] = {}
+
+        components = data.components
+        if components is not None:
+            for section in COMPONENT_SECTIONS:
+                for name, component in (getattr(components, section) or {}).items():
+                    pointer = component_pointer(section, name)
+                    dumped = component.model_dump_json(by_alias=True, exclude_none=True)
+                    refs = set(_ref_re.findall(dumped))
+                    if section == "schemas":
+                        self.schemas[name] = SchemaNode(
+                            digest(dumped, resolver.name(pointer)), self._schema_names(refs)
+                        )
+                    else:
+                        self._components[pointer] = (dumped, refs)
+
+        for path_name, path in (data.paths or {}).items():
+            for http_operation in HTTP_OPERATIONS:
+                operation = getattr(path, http_operation)
+                if operation is None:
+                    continue
+                dumped = operation.model_dump_json(by_alias=True, exclude_none=True)
+                inputs = [path_name, http_operation, dumped]
+                schemas: Set[str] = set()
+                for pointer in sorted(self._closure(set(_ref_re.findall(dumped)))):
+                    parsed = _parse_pointer(pointer)
+                    if parsed is not None and parsed[0] == "schemas":
+                        schemas.add(parsed[1])
+                        inputs.append(resolver.name(pointer))
+                    elif pointer in self._components:
+                        inputs.append(self._components[pointer][0])
+                self.operations[f"{http_operation.upper()} {path_name}"] = OperationNode(
+                    digest(*inputs), schemas, get_operation_tag(operation)
+                )
+
+        self.referenced_by: Dict[str, Set[str]] = {}
+        for name, node in self.schemas.items():
+            for ref in node.refs:
+                self.referenced_by.setdefault(ref, set()).add(name)
+
+    @staticmethod
+    def _schema_names(refs: Iterable[str]) -> Set[str]:
+        names = set()
+        for ref in refs:
+            parsed = _parse_pointer(ref)
+            if parsed is not None and parsed[0] == "schemas":
+                names.add(parsed[1])
+        return names
+
+    def _closure(self, refs: Set[str]) -> Set[str]:
+        """
+        Follow the references of parameters, request bodies and responses to the components they reference.
+        """
+        result: Set[str] = set()
+        pending = list(refs)
+        while pending:
+            ref = pending.pop()
+            if ref in result:
+                continue
+            result.add(ref)
+            if ref in self._components:
+                pending.extend(self._components[ref][1])
+        return result
+
+    @property
+    def tags(self) -> List[Optional[str]]:
+        """
+        The tags of all operations, in the order of their first operation.
+        """
+        return list(dict.fromkeys(node.tag for node in self.operations.values()))
+
+    def tag_operations(self) -> Dict[Optional[str], List[str]]:
+        grouped: Dict[Optional[str], List[str]] = {}
+        for key, node in self.operations.items():
+            grouped.setdefault(node.tag, []).append(key)
+        return grouped
+
+    def affected(self, state: Dict[str, Any]) -> Tuple[Set[str], Set[Optional[str]]]:
+        """
+        Compare the graph to the graph of a previous run.
+        :param state: The state stored by the previous run
+        :return: The schemas and the tags whose files have to be generated again
+        """
+        old_schemas = state["schemas"]
+        changed = {name for name, node in self.schemas.items() if old_schemas.get(name, {}).get("hash") != node.hash}
+        changed |= old_schemas.keys() - self.schemas.keys()
+
+        schemas = {name for name in changed if name in self.schemas}
+        for name in changed:
+            schemas |= self.referenced_by.get(name, set())
+
+        old_operations = state["operations"]
+        tags: Set[Optional[str]] = set()
+        for key, node in self.operations.items():
+            old = old_operations.get(key)
+            if old is None or old["hash"] != node.hash or node.schemas & changed:
+                tags.add(node.tag)
+                if old is not None:
+                    tags.add(old["tag"])
+        for key in old_operations.keys() - self.operations.keys():
+            tags.add(old_operations[key]["tag"])
+
+        # Services list their operations in the order of the paths.
+        old_tags = state["tags"]
+        for tag, keys in self.tag_operations().items():
+            if old_tags.get(str(tag)) != keys:
+                tags.add(tag)
+        return schemas, tags
+
+
+def load_state(output: Path) -> Optional[Dict[str, Any]]:
+    """
+    Load the state of the client in output.
+    :param output: The output folder of the client
+    :return: The state or None, if the client was not generated incrementally before
+    """
+    try:
+        state = json.loads((output / STATE_FILE).read_bytes())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(state, dict) or state.get("version") != STATE_VERSION:
+        return None
+    return state
+
+
+def _write_changed(
+    files: Iterable[Tuple[Path, str]], output: Path, old_files: Dict[str, str], hashes: Dict[str, str]
+) -> Iterator[Tuple[Path, str]]:
+    """
+    Skip files whose unformatted content did not change since the previous run and record the hash of every file.
+    """
+    for path, content in files:
+        relative = path.relative_to(output).as_posix()
+        content_hash = digest(content)
+        hashes[relative] = content_hash
+        if old_files.get(relative) != content_hash or not path.exists():
+            yield path, content
+
+
+def generate_incremental(
+    data: OpenAPI,
+    output: Union[str, Path],
+    library: Optional[HTTPLibrary] = HTTPLibrary.httpx,
+    env_token_name: Optional[str] = None,
+    use_orjson: bool = False,
+    use_awaredatetime: bool = False,
+    custom_template_path: Optional[str] = None,
+    pydantic_version: PydanticVersion = PydanticVersion.V2,
+    formatter: Formatter = Formatter.BLACK,
+    jobs: int = 1,
+    format_cache: bool = True,
+    template_cache: bool = True,
+    validation: ValidationMode = ValidationMode.FILE,
+) -> int:
+    """
+    Generate a client, only regenerating the models and services whose inputs changed since the previous run. The
+    dependency graph of the run is stored in the output folder. Without a usable state of a previous run, e.g. after
+    changing an option or upgrading the generator, the whole client is generated.
+    :return: Number of files written or removed
+    """
+    output = Path(output)
+    library = resolve_library(library)
+    library_config = library_config_dict[library]
+    set_ref_resolver(RefResolver(data.components))
+    resolver = get_ref_resolver()
+    graph = DependencyGraph(data, resolver)
+    options = options_key(
+        library,
+        env_token_name,
+        use_orjson,
+        use_awaredatetime,
+        custom_template_path,
+        pydantic_version,
+        formatter,
+        validation,
+    )
+
+    state = load_state(output)
+    if state is not None and state["options"] != options:
+        state = None
+    # The previous file hashes stay valid, if files were removed, but everything is generated again to restore them.
+    old_files: Dict[str, str] = state["files"] if state is not None else {}
+    if state is not None and any(not (output / file).exists() for file in old_files):
+        state = None
+    schema_names, tags = graph.affected(state) if state is not None else (None, None)
+
+    result = generator(
+        data,
+        library_config,
+        env_token_name,
+        use_orjson,
+        use_awaredatetime,
+        custom_template_path,
+        pydantic_version,
+        template_cache,
+        validation,
+        schema_names,
+        tags,
+        jobs,
+    )
+
+    # Models of schemas that were not generated again keep the file of the previous run. Invalid enums have none.
+    generated_models = {model.file_name for model in result.models}
+    old_schemas: Dict[str, Any] = state["schemas"] if state is not None else {}
+    model_files: Dict[str, Optional[str]] = {}
+    for schema_name in graph.schemas:
+        if schema_names is None or schema_name in schema_names:
+            symbol = resolver.name(component_pointer("schemas", schema_name))
+            model_files[schema_name] = symbol if symbol in generated_models else None
+        else:
+            model_files[schema_name] = old_schemas[schema_name]["file"]
+
+    expected = {f"models/{file}.py" for file in model_files.values() if file is not None}
+    for tag in graph.tags:
+        if library_config.include_sync:
+            expected.add(f"services/{tag}_service.py")
+        if library_config.include_async:
+            expected.add(f"services/async_{tag}_service.py")
+
+    (output / "models").mkdir(parents=True, exist_ok=True)
+    (output / "services").mkdir(parents=True, exist_ok=True)
+    cache = None
+    if format_cache and formatter != Formatter.NONE:
+        cache = FormatCache(formatter, sort_imports=result.sort_imports)
+
+    hashes = {file: file_hash for file, file_hash in old_files.items() if file in expected}
+    written = 0
+    files = _iter_files(result, output, [file for file in model_files.values() if file is not None])
+    validate = validation == ValidationMode.FILE
+    profiler = get_profiler()
+    failed: List[Path] = []
+    old_manifest = load_manifest(output)
+    old_manifest_files: Dict[str, str] = old_manifest["files"] if old_manifest is not None else {}
+    manifest_files: Dict[str, str] = {}
+    for path, content in _process_files(
+        _write_changed(files, output, old_files, hashes), formatter, validate, jobs, cache, failed, result.sort_imports
+    ):
+        with profiler.phase("writes"), open(path, "w") as f:
+            f.write(content)
+        manifest_files[path.relative_to(output).as_posix()] = file_digest(content)
+        written += 1
+    # Files that were not written again keep the content of the previous run.
+    for file in hashes.keys() - manifest_files.keys():
+        manifest_files[file] = old_manifest_files.get(file) or file_digest((output / file).read_text())
+
+    for file in (old_files.keys() | old_manifest_files.keys()) - hashes.keys():
+        (output / file).unlink(missing_ok=True)
+        written += 1
+
+    new_state = {
+        "version": STATE_VERSION,
+        "options": options,
+        "schemas": {
+            name: {"hash": node.hash, "refs": sorted(node.refs), "file": model_files[name]}
+            for name, node in graph.schemas.items()
+        },
+        "operations": {
+            key: {"hash": node.hash, "schemas": sorted(node.schemas), "tag": node.tag}
+            for key, node in graph.operations.items()
+        },
+        "tags": {str(tag): keys for tag, keys in graph.tag_operations().items()},
+        "files": hashes,
+    }
+    _write_atomic(output / STATE_FILE, json.dumps(new_state, indent=1).encode())
+    write_manifest(output, manifest_inputs(data, options), manifest_files)
+
+    if cache is not None:
+        cache.evict()
+    click.echo(f"Updated {written} of {len(hashes)} files")
+    check_failed(formatter, failed)
+    return written
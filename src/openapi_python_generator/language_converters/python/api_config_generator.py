@@ -7,8 +7,9 @@ from openapi_python_generator.language_converters.python.jinja_config import (
     API_CONFIG_TEMPLATE, API_CONFIG_TEMPLATE_PYDANTIC_V2,
 )
 from openapi_python_generator.language_converters.python.jinja_config import (
-    create_jinja_env,
+    get_jinja_env,
 )
+from openapi_python_generator.language_converters.python.render_context import ApiConfigContext
 from openapi_python_generator.models import APIConfig
 
 
@@ -21,11 +22,11 @@ def generate_api_config(
     """
 
     template_name = API_CONFIG_TEMPLATE_PYDANTIC_V2 if pydantic_version == PydanticVersion.V2 else API_CONFIG_TEMPLATE
-    jinja_env = create_jinja_env()
+    jinja_env = get_jinja_env()
     return APIConfig(
         file_name="api_config",
         content=jinja_env.get_template(template_name).render(
-            env_token_name=env_token_name, **data.dict()
+            ApiConfigContext.from_open_api(data, env_token_name).as_dict()
         ),
         base_url=data.servers[0].url if len(data.servers) > 0 else "NO SERVER",
     )
@@ -1,13 +1,17 @@
 import keyword
 import re
+from pathlib import Path
 from typing import Optional
 from openapi_python_generator.common import PydanticVersion
+from openapi_python_generator.common import ValidationMode
 
 
 _use_orjson: bool = False
 _pydantic_version: PydanticVersion = PydanticVersion.V2
 _custom_template_path: str = None
 _pydantic_use_awaredatetime: bool = False
+_template_cache_dir: Optional[Path] = None
+_validation_mode: ValidationMode = ValidationMode.FILE
 _symbol_ascii_strip_re = re.compile(r"[^A-Za-z0-9_]")
 
 
@@ -78,6 +82,42 @@ def get_pydantic_use_awaredatetime() -> bool:
     return _pydantic_use_awaredatetime
 
 
+def set_template_cache_dir(value: Optional[Path]) -> None:
+    """
+    Set the directory compiled templates are cached in. None disables the cache.
+    :param value: value of the variable
+    """
+    global _template_cache_dir
+    _template_cache_dir = value
+
+
+def get_template_cache_dir() -> Optional[Path]:
+    """
+    Get the directory compiled templates are cached in.
+    :return: value of the variable
+    """
+    global _template_cache_dir
+    return _template_cache_dir
+
+
+def set_validation_mode(value: ValidationMode) -> None:
+    """
+    Set how the syntax of the generated code is checked.
+    :param value: value of the variable
+    """
+    global _validation_mode
+    _validation_mode = value
+
+
+def get_validation_mode() -> ValidationMode:
+    """
+    Get how the syntax of the generated code is checked.
+    :return: value of the variable
+    """
+    global _validation_mode
+    return _validation_mode
+
+
 def normalize_symbol(symbol: str) -> str:
     """
     Remove invalid characters & keywords in Python symbol names
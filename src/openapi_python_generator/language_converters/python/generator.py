@@ -1,20 +1,33 @@
+from typing import Collection
 from typing import Optional
 
 from openapi_pydantic.v3.v3_0 import OpenAPI
 
+from openapi_python_generator.cache import get_cache_dir
 from openapi_python_generator.common import PydanticVersion
+from openapi_python_generator.common import ValidationMode
 from openapi_python_generator.language_converters.python import common
 from openapi_python_generator.language_converters.python.api_config_generator import (
     generate_api_config,
 )
 from openapi_python_generator.language_converters.python.model_generator import (
     generate_models,
+    reset_type_converter_cache,
+)
+from openapi_python_generator.language_converters.python.ref_resolver import (
+    RefResolver,
+    get_ref_resolver,
+    set_ref_resolver,
+)
+from openapi_python_generator.language_converters.python.render_pool import (
+    render_in_workers,
 )
 from openapi_python_generator.language_converters.python.service_generator import (
     generate_services,
 )
 from openapi_python_generator.models import ConversionResult
 from openapi_python_generator.models import LibraryConfig
+from openapi_python_generator.profiling import get_profiler
 
 
 def generator(
@@ -25,9 +38,16 @@ def generator(
     use_awaredatetime: bool = False,
     custom_template_path: Optional[str] = None,
     pydantic_version: PydanticVersion = PydanticVersion.V2,
+    template_cache: bool = True,
+    validation: ValidationMode = ValidationMode.FILE,
+    schema_names: Optional[Collection[str]] = None,
+    tags: Optional[Collection[Optional[str]]] = None,
+    jobs: int = 1,
 ) -> ConversionResult:
     """
-    Generate Python code from an OpenAPI 3.0 specification.
+    Generate Python code from an OpenAPI 3.0 specification. The models and services can be restricted to some
+    schemas and tags, which is used to regenerate a client incrementally. With more than one job, the models and
+    services are rendered by a pool of worker processes.
     """
     if use_awaredatetime and pydantic_version != PydanticVersion.V2:
         raise ValueError("Timezone-aware datetime is only supported with Pydantic v2. Please use --pydantic-version v2.")
@@ -36,21 +56,39 @@ def generator(
     common.set_custom_template_path(custom_template_path)
     common.set_pydantic_version(pydantic_version)
     common.set_pydantic_use_awaredatetime(use_awaredatetime)
+    common.set_validation_mode(validation)
+    sort_imports = custom_template_path is not None
+    # Reuse the index of the references, if the caller already built it for these components.
+    if get_ref_resolver().components is not data.components or data.components is None:
+        set_ref_resolver(RefResolver(data.components))
+    reset_type_converter_cache()
+    common.set_template_cache_dir(get_cache_dir() / "jinja" if template_cache else None)
+
+    profiler = get_profiler()
+    if jobs > 1:
+        models, services = render_in_workers(data.paths, library_config, jobs, schema_names, tags)
+        with profiler.phase("generate_api_config"):
+            api_config = generate_api_config(data, env_token_name, pydantic_version)
+        return ConversionResult(models=models, services=services, api_config=api_config, sort_imports=sort_imports)
 
-    if data.components is not None:
-        models = generate_models(data.components, pydantic_version)
-    else:
-        models = []
+    with profiler.phase("generate_models"):
+        if data.components is not None:
+            models = generate_models(data.components, pydantic_version, schema_names)
+        else:
+            models = []
 
-    if data.paths is not None:
-        services = generate_services(data.paths, library_config)
-    else:
-        services = []
+    with profiler.phase("generate_services"):
+        if data.paths is not None:
+            services = generate_services(data.paths, library_config, tags)
+        else:
+            services = []
 
-    api_config = generate_api_config(data, env_token_name, pydantic_version)
+    with profiler.phase("generate_api_config"):
+        api_config = generate_api_config(data, env_token_name, pydantic_version)
 
     return ConversionResult(
         models=models,
         services=services,
         api_config=api_config,
+        sort_imports=sort_imports,
     )
@@ -0,0 +1,116 @@
+import re
+import sys
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
+from typing import Union
+
+
+# Modules of the standard library imported by the generated code, for python versions without stdlib_module_names.
+STDLIB_MODULES = frozenset(getattr(sys, "stdlib_module_names", ())) | {
+    "datetime",
+    "decimal",
+    "enum",
+    "json",
+    "os",
+    "typing",
+    "uuid",
+}
+
+_FUTURE, _STDLIB, _THIRDPARTY, _LOCALFOLDER = range(4)
+_import_re = re.compile(r"^\s*(?:from\s+(\S+)\s+)?import\s+(.+?)\s*$")
+_relative_re = re.compile(r"^(\.+)\s*(.*)")
+_digits_re = re.compile(r"(\d+)")
+
+
+SortKey = Tuple[List[Union[int, str]], str]
+
+
+def _natural_key(text: str) -> List[Union[int, str]]:
+    return [int(part) if part.isdigit() else part for part in _digits_re.split(text)]
+
+
+# isort compares case insensitively and keeps the order of the input for names only differing in case, which are
+# compared case sensitively here to render the same imports in the same order every time.
+def _module_key(module: str) -> SortKey:
+    match = _relative_re.match(module)
+    key = "_".join(match.groups()) if match else module
+    return _natural_key(key.lower()), module
+
+
+def _name_key(name: str) -> SortKey:
+    # Constants come first, then classes, then everything else.
+    if name.isupper() and len(name) > 1:
+        prefix = "A"
+    elif name[0:1].isupper():
+        prefix = "B"
+    else:
+        prefix = "C"
+    return _natural_key(prefix + name.lower()), name
+
+
+def _section(module: str) -> int:
+    if module.startswith("."):
+        return _LOCALFOLDER
+    if module == "__future__":
+        return _FUTURE
+    if module.split(".")[0] in STDLIB_MODULES:
+        return _STDLIB
+    return _THIRDPARTY
+
+
+class Imports:
+    """
+    Imports of a generated module, collected as data instead of import statements. Every module and name is only
+    imported once, and the statements are rendered grouped and sorted the way isort does with its default settings,
+    so the generated code does not need an import sorting pass.
+    """
+
+    def __init__(self, statements: Iterable[str] = ()) -> None:
+        self._modules: Set[str] = set()
+        self._names: Dict[str, Set[str]] = {}
+        for statement in statements:
+            self.add_statement(statement)
+
+    def add(self, module: str, name: Optional[str] = None) -> None:
+        """
+        Import a module, or a name from a module.
+        :param module: The module, relative modules start with a dot
+        :param name: The name imported from the module, or None to import the module itself
+        """
+        if name is None:
+            self._modules.add(module)
+        else:
+            self._names.setdefault(module, set()).add(name)
+
+    def add_statement(self, statement: str) -> None:
+        """
+        Add the imports of a statement like "from .User import User" or "import json".
+        :param statement: The import statement
+        """
+        match = _import_re.match(statement)
+        if match is None:
+            raise ValueError(f"Not an import statement: {statement!r}")
+        module, names = match.groups()
+        for name in names.split(","):
+            if module is None:
+                self.add(name.strip())
+            else:
+                self.add(module, name.strip())
+
+    def render(self) -> str:
+        """
+        Render the import statements. The sections for the standard library, third party libraries and relative
+        imports are separated by a blank line. In each section, modules are imported before names from modules.
+        :return: The import statements, without a trailing line break
+        """
+        sections: List[List[str]] = [[] for _ in range(_LOCALFOLDER + 1)]
+        for module in sorted(self._modules, key=_module_key):
+            sections[_section(module)].append(f"import {module}")
+        for module in sorted(self._names, key=_module_key):
+            names = ", ".join(sorted(self._names[module], key=_name_key))
+            sections[_section(module)].append(f"from {module} import {names}")
+        return "\n\n".join("\n".join(lines) for lines in sections if lines)
@@ -1,10 +1,16 @@
 from pathlib import Path
+from typing import Optional
+from typing import Tuple
 
 from jinja2 import ChoiceLoader
 from jinja2 import Environment
+from jinja2 import FileSystemBytecodeCache
 from jinja2 import FileSystemLoader
 
+from openapi_python_generator import __version__
+
 from . import common
+from . import layout
 
 
 ENUM_TEMPLATE = "enum.jinja2"
@@ -17,9 +23,26 @@ API_CONFIG_TEMPLATE_PYDANTIC_V2 = "apiconfig_pydantic_2.jinja2"
 TEMPLATE_PATH = Path(__file__).parent / "templates"
 
 
-def create_jinja_env():
+_jinja_env: Optional[Environment] = None
+_jinja_env_config: Optional[Tuple[Optional[str], Optional[Path]]] = None
+
+
+def create_jinja_env(bytecode_cache_dir: Optional[Path] = None) -> Environment:
+    """
+    Create a new jinja environment for the built in and the custom templates.
+    :param bytecode_cache_dir: Directory compiled templates are cached in. Disabled if None.
+    :return: The jinja environment
+    """
     custom_template_path = common.get_custom_template_path()
-    return Environment(
+    bytecode_cache = None
+    if bytecode_cache_dir is not None:
+        bytecode_cache_dir.mkdir(parents=True, exist_ok=True)
+        # Entries are checked against the checksum of the template source, so edited custom templates are
+        # compiled again. The generator version is part of the name, as it determines the environment options.
+        bytecode_cache = FileSystemBytecodeCache(
+            str(bytecode_cache_dir), pattern=f"__jinja2_{__version__}_%s.cache"
+        )
+    env = Environment(
         loader=(
             ChoiceLoader(
                 [
@@ -32,4 +55,38 @@ def create_jinja_env():
         ),
         autoescape=True,
         trim_blocks=True,
+        bytecode_cache=bytecode_cache,
+    )
+    # Helpers laying out the generated code the way black formats it.
+    env.globals.update(
+        docstring=layout.docstring,
+        string_literal=layout.string_literal,
+        wrap_assignment=layout.wrap_assignment,
+        wrap_brackets=layout.wrap_brackets,
+        wrap_expression=layout.wrap_expression,
     )
+    return env
+
+
+def get_jinja_env() -> Environment:
+    """
+    Get the jinja environment shared by all converters, so every template is only compiled once per run. A new
+    environment is created whenever the custom template path or the template cache directory changed.
+    :return: The jinja environment
+    """
+    global _jinja_env, _jinja_env_config
+    config = (common.get_custom_template_path(), common.get_template_cache_dir())
+    if _jinja_env is None or _jinja_env_config != config:
+        _jinja_env = create_jinja_env(config[1])
+        _jinja_env_config = config
+    return _jinja_env
+
+
+def reset_jinja_env() -> None:
+    """
+    Drop the shared jinja environment, so the next call of get_jinja_env looks up every template again. This is
+    needed when templates are added to or removed from the custom template path.
+    """
+    global _jinja_env, _jinja_env_config
+    _jinja_env = None
+    _jinja_env_config = None
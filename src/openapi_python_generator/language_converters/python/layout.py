@@ -0,0 +1,130 @@
+import re
+import unicodedata
+from typing import List
+from typing import Optional
+from typing import Sequence
+
+from openapi_python_generator.common import FormatOptions
+
+
+_line_break_re = re.compile(r"\r\n|\r|\n")
+
+# The built-in templates lay out the generated code the way black formats it, so the output of Formatter.NONE is the
+# same as the output of Formatter.BLACK. The helpers below cover the lines whose layout depends on their length.
+
+
+def text_width(text: str) -> int:
+    """
+    Width of a line as black measures it: wide east asian characters count twice, combining characters not at all.
+    """
+    if text.isascii():
+        return len(text)
+    width = 0
+    for char in text:
+        if unicodedata.combining(char):
+            continue
+        width += 2 if unicodedata.east_asian_width(char) in ("W", "F") else 1
+    return width
+
+
+def fits(line: str, indent: int = 0) -> bool:
+    """
+    Check whether a line fits into the line length of the formatter.
+    :param line: The line without its indentation
+    :param indent: Number of spaces the line is indented by
+    """
+    return indent + text_width(line) <= FormatOptions.line_length
+
+
+def string_literal(value: str) -> str:
+    """
+    Render a string literal with the quotes black prefers: double quotes, unless they need more escapes than single
+    quotes.
+    """
+    literal = repr(value)
+    if literal[0] == '"' or value.count('"') > value.count("'"):
+        return literal
+    return '"' + literal[1:-1].replace("\\'", "'").replace('"', '\\"') + '"'
+
+
+def wrap_brackets(head: str, items: Sequence[str], tail: str, indent: int = 0) -> str:
+    """
+    Render a bracketed list of items, e.g. the parameters of a function or the arguments of a call. The items are put
+    on a single line if it fits, otherwise on a line each with a trailing comma, which black keeps as it is. Items
+    too long for a line of their own are not split any further.
+    :param head: Everything up to and including the opening bracket
+    :param items: The items, without separating commas
+    :param tail: Everything from the closing bracket on
+    :param indent: Number of spaces the first line is indented by
+    :return: The lines, without the indentation of the first one
+    """
+    line = head + ", ".join(items) + tail
+    if not items or fits(line, indent):
+        return line
+    item_indent = " " * (indent + 4)
+    lines = [head] + [f"{item_indent}{item}," for item in items] + [" " * indent + tail]
+    return "\n".join(lines)
+
+
+def wrap_assignment(target: str, head: str, items: Sequence[str], tail: str, indent: int = 0) -> str:
+    """
+    Render the assignment of a call, e.g. "name: str = Field(alias="name")". The arguments are split like in
+    wrap_brackets, and if even the first line of the split call does not fit, the call is moved into parentheses.
+    Black splits the annotation of targets too long to be followed by the parenthesis, which is not done here.
+    :param target: The target of the assignment, including its annotation
+    :param head: The called expression, including the opening bracket
+    :param items: The arguments, without separating commas
+    :param tail: Everything from the closing bracket on
+    :param indent: Number of spaces the first line is indented by
+    :return: The lines, without the indentation of the first one
+    """
+    assignment = f"{target} = "
+    if fits(assignment + head, indent):
+        return wrap_brackets(assignment + head, items, tail, indent)
+    # The arguments always get a line each inside the parentheses, black only keeps the parentheses then.
+    lines = [f"{assignment}(", " " * (indent + 4) + head]
+    lines += [" " * (indent + 8) + f"{item}," for item in items]
+    lines += [" " * (indent + 4) + tail, " " * indent + ")"]
+    return "\n".join(lines)
+
+
+def wrap_expression(head: str, parts: Sequence[str], indent: int = 0, brackets: str = "") -> str:
+    """
+    Render an expression split into parts at its operators, e.g. the parts "a", "if b", "else c" of a conditional
+    expression. If the expression does not fit after the head, it is wrapped in parentheses and, if it does not fit
+    on a line of its own either, split into a line per part.
+    :param head: Everything in front of the expression, e.g. "return "
+    :param parts: The parts of the expression
+    :param indent: Number of spaces the first line is indented by
+    :param brackets: The brackets of a bracketed expression, e.g. "[]" for the parts "x", "for x in y" of a list
+        comprehension, which are kept instead of adding parentheses
+    :return: The lines, without the indentation of the first one
+    """
+    expression = " ".join(parts)
+    line = head + brackets[:1] + expression + brackets[1:]
+    if fits(line, indent):
+        return line
+    opening, closing = brackets[:1] or "(", brackets[1:] or ")"
+    part_indent = " " * (indent + 4)
+    if fits(expression, indent + 4):
+        lines = [f"{part_indent}{expression}"]
+    else:
+        lines = [f"{part_indent}{part}" for part in parts]
+    return "\n".join([head + opening] + lines + [" " * indent + closing])
+
+
+def docstring(text: Optional[str], indent: int = 0) -> str:
+    """
+    Render the lines of a docstring the way black leaves them: with leading tabs expanded, the common indentation
+    replaced by the indentation of the docstring and without trailing whitespace.
+    :param text: The text of the docstring
+    :param indent: Number of spaces the docstring is indented by
+    :return: The lines, the first one indented as well
+    """
+    lines: List[str] = []
+    for line in _line_break_re.split(str(text)):
+        stripped = line.lstrip()
+        lines.append(line[: len(line) - len(stripped)].expandtabs(4) + stripped.rstrip() if stripped else "")
+    common = min((len(line) - len(line.lstrip()) for line in lines if line), default=0)
+    prefix = " " * indent
+    return "\n".join(prefix + line[common:] if line else "" for line in lines)
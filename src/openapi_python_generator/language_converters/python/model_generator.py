@@ -1,13 +1,20 @@
+import ast
 import itertools
 import re
+from typing import Any
+from typing import Collection
+from typing import Dict
 from typing import List
 from typing import Optional
+from typing import Tuple
 
 import click
 from openapi_pydantic.v3.v3_0 import Schema, Reference, Components
 
 from openapi_python_generator.common import PydanticVersion
+from openapi_python_generator.common import ValidationMode
 from openapi_python_generator.language_converters.python import common
+from openapi_python_generator.language_converters.python.imports import Imports
 from openapi_python_generator.language_converters.python.jinja_config import (
     ENUM_TEMPLATE, MODELS_TEMPLATE_PYDANTIC_V2,
 )
@@ -15,21 +22,103 @@ from openapi_python_generator.language_converters.python.jinja_config import (
     MODELS_TEMPLATE,
 )
 from openapi_python_generator.language_converters.python.jinja_config import (
-    create_jinja_env,
+    get_jinja_env,
+)
+from openapi_python_generator.language_converters.python.ref_resolver import (
+    RefResolver,
+    component_pointer,
+    get_ref_resolver,
+    set_ref_resolver,
 )
 from openapi_python_generator.models import Model
 from openapi_python_generator.models import Property
 from openapi_python_generator.models import TypeConversion
 from openapi_python_generator.models import ParentModel
+from openapi_python_generator.profiling import get_profiler
+
+
+# Conversions of the current run, keyed by the identity of the schema, the arguments of type_converter and the
+# options that influence the conversion. The schema is kept in the entry, so its id cannot be reused while the
+# entry exists.
+_type_conversions: Dict[Tuple[Any, ...], Tuple[Schema, TypeConversion]] = {}
+_type_conversion_hits = 0
+_type_conversion_misses = 0
+
+# Names of the typing module that converted types consist of. Quoted forward references are not searched.
+_typing_name_re = re.compile(r"\b(Any|Dict|List|Optional|Tuple|Union)\b")
+_quoted_re = re.compile(r'"[^"]*"')
+
+
+def reset_type_converter_cache() -> None:
+    """
+    Forget the conversions and the statistics of the previous run.
+    """
+    global _type_conversion_hits, _type_conversion_misses
+    _type_conversions.clear()
+    _type_conversion_hits = 0
+    _type_conversion_misses = 0
 
 
-def type_converter(  # noqa: C901
+def get_type_converter_stats() -> Tuple[int, int]:
+    """
+    Get the number of conversions served from the cache and the number of conversions computed in this run.
+    :return: Tuple of hits and misses
+    """
+    return _type_conversion_hits, _type_conversion_misses
+
+
+def add_type_converter_stats(hits: int, misses: int) -> None:
+    """
+    Add the statistics of conversions done in another process, e.g. a worker rendering a part of the models.
+    :param hits: Number of conversions served from the cache of the other process
+    :param misses: Number of conversions computed by the other process
+    """
+    global _type_conversion_hits, _type_conversion_misses
+    _type_conversion_hits += hits
+    _type_conversion_misses += misses
+
+
+def type_converter(
         schema: Schema,
         required: bool = False,
         model_name: Optional[str] = None,
 ) -> TypeConversion:
     """
-    Converts an OpenAPI type to a Python type.
+    Converts an OpenAPI type to a Python type. The same schema is converted for every property, parameter and
+    return type that uses it, so conversions are memoized for the current run.
+    :param schema: Schema containing the type to be converted
+    :param model_name: Name of the original model on which the type is defined
+    :param required: Flag indicating if the type is required by the class
+    :return: The converted type
+    """
+    global _type_conversion_hits, _type_conversion_misses
+    key = (
+        id(schema),
+        required,
+        model_name,
+        common.get_use_orjson(),
+        common.get_pydantic_version(),
+        common.get_pydantic_use_awaredatetime(),
+        get_ref_resolver(),
+    )
+    cached = _type_conversions.get(key)
+    if cached is not None:
+        _type_conversion_hits += 1
+        return cached[1]
+
+    _type_conversion_misses += 1
+    conversion = _convert_type(schema, required, model_name)
+    _type_conversions[key] = (schema, conversion)
+    return conversion
+
+
+def _convert_type(  # noqa: C901
+        schema: Schema,
+        required: bool = False,
+        model_name: Optional[str] = None,
+) -> TypeConversion:
+    """
+    Converts an OpenAPI type to a Python type, without consulting the cache of type_converter.
     :param schema: Schema containing the type to be converted
     :param model_name: Name of the original model on which the type is defined
     :param required: Flag indicating if the type is required by the class
@@ -51,7 +140,7 @@ def type_converter(  # noqa: C901
             if isinstance(sub_schema, Schema):
                 conversions.append(type_converter(sub_schema, True))
             else:
-                import_type = common.normalize_symbol(sub_schema.ref.split("/")[-1])
+                import_type = get_ref_resolver().name(sub_schema.ref)
                 if import_type == model_name:
                     conversions.append(
                         TypeConversion(
@@ -77,13 +166,11 @@ def type_converter(  # noqa: C901
             converted_type = conversions[0].converted_type
         else:
             converted_type = (
-                    "Tuple[" + ",".join([i.converted_type for i in conversions]) + "]"
+                    "Tuple[" + ", ".join([i.converted_type for i in conversions]) + "]"
             )
 
         converted_type = pre_type + converted_type + post_type
-        import_types = [
-            i.import_types[0] for i in conversions if i.import_types is not None
-        ]
+        import_types = [i.import_types[0] for i in conversions if i.import_types]
 
     elif schema.oneOf is not None or schema.anyOf is not None:
         used = schema.oneOf if schema.oneOf is not None else schema.anyOf
@@ -93,7 +180,7 @@ def type_converter(  # noqa: C901
             if isinstance(sub_schema, Schema):
                 conversions.append(type_converter(sub_schema, True))
             else:
-                import_type = common.normalize_symbol(sub_schema.ref.split("/")[-1])
+                import_type = get_ref_resolver().name(sub_schema.ref)
                 import_types = [f"from .{import_type} import {import_type}"]
                 conversions.append(
                     TypeConversion(
@@ -110,7 +197,7 @@ def type_converter(  # noqa: C901
             converted_type = conversions[0].converted_type
         else:
             converted_type = (
-                    "Union[" + ",".join([i.converted_type for i in conversions]) + "]"
+                    "Union[" + ", ".join([i.converted_type for i in conversions]) + "]"
             )
 
         converted_type = pre_type + converted_type + post_type
@@ -262,7 +349,7 @@ def _generate_property_from_reference(
                        and parent_schema.required is not None
                        and name in parent_schema.required
                ) or force_required
-    import_model = common.normalize_symbol(reference.ref.split("/")[-1])
+    import_model = get_ref_resolver().name(reference.ref)
 
     if import_model == model_name:
         type_conv = TypeConversion(
@@ -315,7 +402,34 @@ def _collect_properties_from_schema(model_name: str, parent_schema: Schema):
         )
         yield conv_property
 
-def generate_models(components: Components, pydantic_version: PydanticVersion = PydanticVersion.V2) -> List[Model]:
+def _model_imports(
+    properties: List[Property], parent_components: List[ParentModel], pydantic_version: PydanticVersion
+) -> Imports:
+    """
+    Collect the imports of a model: pydantic, the types of the properties, the names of the typing module used by
+    the types, and the parent models.
+    """
+    imports = Imports()
+    imports.add("pydantic", "BaseModel")
+    imports.add("pydantic", "Field")
+    if pydantic_version == PydanticVersion.V2:
+        imports.add("pydantic", "ConfigDict")
+    for conv_property in properties:
+        for statement in conv_property.type.import_types or []:
+            imports.add_statement(statement)
+        for name in _typing_name_re.findall(_quoted_re.sub("", conv_property.type.converted_type)):
+            imports.add("typing", name)
+    for parent_component in parent_components:
+        if parent_component.import_type is not None:
+            imports.add_statement(parent_component.import_type)
+    return imports
+
+
+def generate_models(
+    components: Components,
+    pydantic_version: PydanticVersion = PydanticVersion.V2,
+    schema_names: Optional[Collection[str]] = None,
+) -> List[Model]:
     """
     Receives components from an OpenAPI 3.0 specification and generates the models from it.
     It does so, by iterating over the components.schemas dictionary. For each schema, it checks if
@@ -323,6 +437,7 @@ def generate_models(components: Components, pydantic_version: PydanticVersion =
     an array of types/references. It then computes pydantic models from it using jinja2
     :param components: The components from an OpenAPI 3.0 specification.
     :param pydantic_version: The version of pydantic to use.
+    :param schema_names: Only generate the models of these schemas. All schemas are generated if None.
     :return: A list of models.
     """
     models: List[Model] = []
@@ -330,9 +445,17 @@ def generate_models(components: Components, pydantic_version: PydanticVersion =
     if components.schemas is None:
         return models
 
-    jinja_env = create_jinja_env()
-    for schema_name, schema_or_reference in components.schemas.items():
-        name = common.normalize_symbol(schema_name)
+    # Index the references of these components, unless the generator already did.
+    if get_ref_resolver().components is not components:
+        set_ref_resolver(RefResolver(components))
+    resolver = get_ref_resolver()
+
+    jinja_env = get_jinja_env()
+    schemas = get_profiler().iter_items("models", components.schemas.items(), lambda schema: schema[0])
+    for schema_name, schema_or_reference in schemas:
+        if schema_names is not None and schema_name not in schema_names:
+            continue
+        name = resolver.name(component_pointer("schemas", schema_name))
         if schema_or_reference.enum is not None:
             value_dict = schema_or_reference.dict()
             regex = re.compile(r"[\s\/=\*\+]+")
@@ -348,13 +471,21 @@ def generate_models(components: Components, pydantic_version: PydanticVersion =
                 openapi_object=schema_or_reference,
                 properties=[],
             )
-            try:
-                compile(m.content, "<string>", "exec")
-                models.append(m)
-            except SyntaxError as e:  # pragma: no cover
-                click.echo(f"Error in model {name}: {e}")
-
-            continue  # pragma: no cover
+            # Enum values become python identifiers, so enums that are not valid python are left out of the
+            # client. Enum modules are small, so they are checked even if the other files are checked in write_data.
+            validation_mode = common.get_validation_mode()
+            if validation_mode != ValidationMode.NONE:
+                try:
+                    if validation_mode == ValidationMode.SNIPPET:
+                        compile(m.content, "<string>", "exec")
+                    else:
+                        ast.parse(m.content)
+                except SyntaxError as e:
+                    click.echo(f"Error in model {name}: {e}")
+                    continue
+            models.append(m)
+
+            continue
 
         # Enumerate properties for this model
         properties = []
@@ -370,7 +501,7 @@ def generate_models(components: Components, pydantic_version: PydanticVersion =
             # For references, instead of importing properties, record inherited components
             if isinstance(parent_component, Reference):
                 ref = parent_component.ref
-                parent_name = common.normalize_symbol(ref.split("/")[-1])
+                parent_name = get_ref_resolver().name(ref)
                 parent_components.append(ParentModel(
                     ref = ref,
                     name = parent_name,
@@ -388,13 +519,15 @@ def generate_models(components: Components, pydantic_version: PydanticVersion =
             schema_name=name,
             schema=schema_or_reference,
             properties=properties,
-            parent_components=parent_components
+            parent_components=parent_components,
+            imports=_model_imports(properties, parent_components, pydantic_version).render(),
         )
 
-        try:
-            compile(generated_content, "<string>", "exec")
-        except SyntaxError as e:  # pragma: no cover
-            click.echo(f"Error in model {name}: {e}")  # pragma: no cover
+        if common.get_validation_mode() == ValidationMode.SNIPPET:
+            try:
+                compile(generated_content, "<string>", "exec")
+            except SyntaxError as e:  # pragma: no cover
+                click.echo(f"Error in model {name}: {e}")  # pragma: no cover
 
         models.append(
             Model(
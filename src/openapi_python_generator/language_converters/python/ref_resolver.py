@@ -0,0 +1,129 @@
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Type
+from typing import TypeVar
+
+import click
+from openapi_pydantic.v3.v3_0 import Components
+from openapi_pydantic.v3.v3_0 import Reference
+
+from openapi_python_generator.language_converters.python import common
+
+
+COMPONENT_SECTIONS = [
+    "schemas",
+    "responses",
+    "parameters",
+    "examples",
+    "requestBodies",
+    "headers",
+    "securitySchemes",
+    "links",
+    "callbacks",
+]
+
+T = TypeVar("T")
+
+
+def component_pointer(section: str, name: str) -> str:
+    """
+    Build the local JSON pointer of a component, escaping the name as defined in RFC 6901.
+    :param section: Section of the components object, e.g. schemas
+    :param name: Name of the component
+    :return: The pointer, e.g. #/components/schemas/Name
+    """
+    return f"#/components/{section}/" + name.replace("~", "~0").replace("/", "~1")
+
+
+class RefResolver:
+    """
+    Index of every #/components/... pointer of a specification, built once per specification. It maps each pointer
+    to the resolved object and to the python symbol of the component. Schemas whose names collide after
+    normalize_symbol get a numbered suffix, so every schema keeps its own module.
+    """
+
+    def __init__(self, components: Optional[Components] = None) -> None:
+        self.components = components
+        self._targets: Dict[str, Any] = {}
+        self._names: Dict[str, str] = {}
+        self.collisions: Dict[str, List[str]] = {}
+
+        if components is None:
+            return
+
+        for section in COMPONENT_SECTIONS:
+            items = getattr(components, section) or {}
+            used_names: Dict[str, str] = {}
+            for name, target in items.items():
+                pointer = component_pointer(section, name)
+                self._targets[pointer] = target
+
+                symbol = common.normalize_symbol(name)
+                # Only schemas become modules, so only their names have to be unique.
+                if section == "schemas" and symbol in used_names:
+                    self.collisions.setdefault(symbol, [used_names[symbol]]).append(name)
+                    suffix = 2
+                    while f"{symbol}_{suffix}" in used_names:
+                        suffix += 1
+                    symbol = f"{symbol}_{suffix}"
+                used_names[symbol] = name
+                self._names[pointer] = symbol
+
+        for symbol, names in self.collisions.items():
+            click.echo(
+                f"Schemas {', '.join(names)} share the python name {symbol}, "
+                f"numbered suffixes were added to all but the first one."
+            )
+
+    def name(self, ref: str) -> str:
+        """
+        Get the python symbol of the component a reference points to.
+        :param ref: The reference, e.g. #/components/schemas/Name
+        :return: The normalized, collision free symbol
+        """
+        symbol = self._names.get(ref)
+        if symbol is None:
+            # Unknown references keep the name they had before the resolver existed.
+            symbol = common.normalize_symbol(ref.split("/")[-1])
+            self._names[ref] = symbol
+        return symbol
+
+    def resolve(self, obj: Any, expected_type: Type[T]) -> Any:
+        """
+        Resolve a reference to the component it points to, following chains of references. Objects that are no
+        references, unknown references and references to components of another type are returned unchanged.
+        :param obj: The object that might be a reference
+        :param expected_type: Type of the component the caller can handle, e.g. Parameter
+        :return: The resolved component or obj
+        """
+        target = obj
+        seen = set()
+        while isinstance(target, Reference) and target.ref not in seen:
+            seen.add(target.ref)
+            if target.ref not in self._targets:
+                return obj
+            target = self._targets[target.ref]
+        return target if isinstance(target, expected_type) else obj
+
+
+_ref_resolver: RefResolver = RefResolver()
+
+
+def set_ref_resolver(value: RefResolver) -> None:
+    """
+    Set the resolver used for all references of the current specification.
+    :param value: value of the variable
+    """
+    global _ref_resolver
+    _ref_resolver = value
+
+
+def get_ref_resolver() -> RefResolver:
+    """
+    Get the resolver used for all references of the current specification.
+    :return: value of the variable
+    """
+    global _ref_resolver
+    return _ref_resolver
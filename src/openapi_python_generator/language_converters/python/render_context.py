@@ -0,0 +1,145 @@
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from openapi_pydantic.v3.v3_0 import OpenAPI
+from openapi_pydantic.v3.v3_0 import Operation
+from openapi_pydantic.v3.v3_0 import PathItem
+
+from openapi_python_generator.language_converters.python.imports import Imports
+from openapi_python_generator.models import OpReturnType
+from openapi_python_generator.models import Service
+
+
+class RenderContext:
+    """
+    Base class of the variables passed to a template. Subclasses only list the fields in __slots__, the values are
+    handed to Jinja as they are, without serializing them.
+    """
+
+    __slots__: Tuple[str, ...] = ()
+
+    def __init__(self, **kwargs: Any) -> None:
+        for name in self.__slots__:
+            setattr(self, name, kwargs.pop(name, None))
+        if kwargs:
+            raise TypeError(f"Unexpected render context fields: {', '.join(kwargs)}")
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Get the variables of the template.
+        :return: Shallow mapping of every field to its value
+        """
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class OperationContext(RenderContext):
+    """
+    Variables of the template of a single service operation. The operation and its path item are referenced, not
+    copied, so custom templates can still read them.
+    """
+
+    __slots__ = (
+        "params",
+        "param_list",
+        "operation_id",
+        "query_params",
+        "header_params",
+        "return_type",
+        "async_client",
+        "path_name",
+        "body_param",
+        "method",
+        "use_orjson",
+        "operation",
+        "pathItem",
+    )
+
+    params: str
+    param_list: List[str]
+    operation_id: str
+    query_params: List[str]
+    header_params: List[str]
+    return_type: OpReturnType
+    async_client: bool
+    path_name: str
+    body_param: Optional[str]
+    method: str
+    use_orjson: bool
+    operation: Operation
+    pathItem: PathItem
+
+
+class ServiceContext(RenderContext):
+    """
+    Variables of the template of a service module.
+    """
+
+    __slots__ = (
+        "file_name",
+        "operations",
+        "content",
+        "async_client",
+        "library_import",
+        "use_orjson",
+        "imports",
+    )
+
+    @classmethod
+    def from_service(cls, service: Service) -> "ServiceContext":
+        """
+        Build the context of a service.
+        :param service: The service to render
+        :return: The context, sharing the operations of the service
+        """
+        imports = Imports(
+            [
+                "import json",
+                "from typing import *",
+                f"import {service.library_import}",
+                "from ..api_config import APIConfig, HTTPException",
+                "from ..models import *",
+            ]
+        )
+        if service.use_orjson:
+            imports.add("orjson")
+        return cls(
+            file_name=service.file_name,
+            operations=service.operations,
+            content=service.content,
+            async_client=service.async_client,
+            library_import=service.library_import,
+            use_orjson=service.use_orjson,
+            imports=imports.render(),
+        )
+
+
+class ApiConfigContext(RenderContext):
+    """
+    Variables of the template of the api_config.py module. Only the servers and security schemes are part of it, so
+    rendering it does not depend on the number of paths and schemas of the specification.
+    """
+
+    __slots__ = (
+        "env_token_name",
+        "servers",
+        "security",
+        "security_schemes",
+    )
+
+    @classmethod
+    def from_open_api(cls, data: OpenAPI, env_token_name: Optional[str] = None) -> "ApiConfigContext":
+        """
+        Build the context of the API config.
+        :param data: The specification
+        :param env_token_name: Name of the environment variable holding the access token
+        :return: The context, sharing the servers and security schemes of the specification
+        """
+        return cls(
+            env_token_name=env_token_name,
+            servers=data.servers,
+            security=data.security,
+            security_schemes=data.components.securitySchemes if data.components is not None else None,
+        )
@@ -0,0 +1,208 @@
+from concurrent.futures import Future
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Collection
+from typing import Dict
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+from typing import TypeVar
+
+from openapi_pydantic.v3.v3_0 import PathItem
+
+from openapi_python_generator.common import FormatOptions
+from openapi_python_generator.common import PydanticVersion
+from openapi_python_generator.common import ValidationMode
+from openapi_python_generator.language_converters.python import common
+from openapi_python_generator.language_converters.python.model_generator import (
+    add_type_converter_stats,
+    generate_models,
+    get_type_converter_stats,
+)
+from openapi_python_generator.language_converters.python.ref_resolver import (
+    RefResolver,
+    get_ref_resolver,
+    set_ref_resolver,
+)
+from openapi_python_generator.language_converters.python.service_generator import (
+    generate_service_operations,
+    group_service_operations,
+    iter_operations,
+)
+from openapi_python_generator.models import LibraryConfig
+from openapi_python_generator.models import Model
+from openapi_python_generator.models import Service
+from openapi_python_generator.models import ServiceOperation
+from openapi_python_generator.profiling import Profiler
+from openapi_python_generator.profiling import get_profiler
+from openapi_python_generator.profiling import set_profiler
+
+
+# Smallest number of schemas or operations rendered by a worker at once. Smaller chunks cost more in sending the
+# results back than they gain in spreading the work.
+MIN_CHUNK_SIZE = 16
+# Number of chunks per worker, so workers finishing early pick up the remaining chunks.
+CHUNKS_PER_JOB = 4
+
+T = TypeVar("T")
+
+# The specification and configuration of the run, set once in every worker process.
+_worker_paths: Optional[Dict[str, PathItem]] = None
+_worker_library_config: Optional[LibraryConfig] = None
+
+
+def _chunks(items: Sequence[T], jobs: int) -> List[Sequence[T]]:
+    """
+    Split the items into consecutive chunks, so concatenating the results of the chunks keeps the order of the items.
+    """
+    if not items:
+        return []
+    count = max(1, min(jobs * CHUNKS_PER_JOB, len(items) // MIN_CHUNK_SIZE))
+    size = -(-len(items) // count)
+    return [items[start : start + size] for start in range(0, len(items), size)]
+
+
+class _RenderSettings(NamedTuple):
+    """
+    The settings kept in the globals of the common module and the FormatOptions the templates are laid out with.
+    """
+
+    use_orjson: bool
+    custom_template_path: Optional[str]
+    pydantic_version: PydanticVersion
+    use_awaredatetime: bool
+    validation: ValidationMode
+    template_cache_dir: Optional[Path]
+    line_length: int
+
+    @classmethod
+    def current(cls) -> "_RenderSettings":
+        """
+        Collect the settings of the current process.
+        """
+        return cls(
+            use_orjson=common.get_use_orjson(),
+            custom_template_path=common.get_custom_template_path(),
+            pydantic_version=common.get_pydantic_version(),
+            use_awaredatetime=common.get_pydantic_use_awaredatetime(),
+            validation=common.get_validation_mode(),
+            template_cache_dir=common.get_template_cache_dir(),
+            line_length=FormatOptions.line_length,
+        )
+
+    def apply(self) -> None:
+        """
+        Set the settings in the current process.
+        """
+        common.set_use_orjson(self.use_orjson)
+        common.set_custom_template_path(self.custom_template_path)
+        common.set_pydantic_version(self.pydantic_version)
+        common.set_pydantic_use_awaredatetime(self.use_awaredatetime)
+        common.set_validation_mode(self.validation)
+        common.set_template_cache_dir(self.template_cache_dir)
+        FormatOptions.line_length = self.line_length
+
+
+def _init_render_worker(
+    resolver: RefResolver,
+    paths: Optional[Dict[str, PathItem]],
+    library_config: LibraryConfig,
+    settings: _RenderSettings,
+) -> None:
+    """
+    Copy the state of the parent process into a worker process: the settings and the index of the references. The
+    index is passed instead of being built again, so messages about colliding schema names are not repeated by every
+    worker.
+    """
+    global _worker_paths, _worker_library_config
+    settings.apply()
+    set_ref_resolver(resolver)
+    # Forked workers inherit the profiler of the parent process, whose records would be lost.
+    set_profiler(Profiler())
+    _worker_paths = paths
+    _worker_library_config = library_config
+
+
+def _render_models(schema_names: Sequence[str]) -> Tuple[List[Model], int, int]:
+    """
+    Render the models of some schemas in a worker process.
+    :return: The models and the number of type conversions reused and computed for them
+    """
+    components = get_ref_resolver().components
+    if components is None:
+        raise RuntimeError("The render worker was not initialized with the components of a specification.")
+    hits, misses = get_type_converter_stats()
+    models = generate_models(components, common.get_pydantic_version(), set(schema_names))
+    new_hits, new_misses = get_type_converter_stats()
+    return models, new_hits - hits, new_misses - misses
+
+
+def _render_operations(operations: Sequence[Tuple[str, str]]) -> Tuple[List[ServiceOperation], int, int]:
+    """
+    Render some operations, given as pairs of the path name and the HTTP method, in a worker process.
+    :return: The operations and the number of type conversions reused and computed for them
+    """
+    if _worker_paths is None or _worker_library_config is None:
+        raise RuntimeError("The render worker was not initialized with the paths of a specification.")
+    hits, misses = get_type_converter_stats()
+    service_ops = generate_service_operations(_worker_paths, _worker_library_config, None, set(operations))
+    new_hits, new_misses = get_type_converter_stats()
+    return service_ops, new_hits - hits, new_misses - misses
+
+
+def render_in_workers(
+    paths: Optional[Dict[str, PathItem]],
+    library_config: LibraryConfig,
+    jobs: int,
+    schema_names: Optional[Collection[str]] = None,
+    tags: Optional[Collection[Optional[str]]] = None,
+) -> Tuple[List[Model], List[Service]]:
+    """
+    Render the models and services with a pool of worker processes. The schemas and operations are split into
+    chunks of consecutive items and the results are merged in the order of the chunks, so the output is the same as
+    rendering them in the current process. The settings are taken from the globals of the common module and the
+    components from the current RefResolver, which the generator sets before.
+    The workers are not profiled, the time waiting for them is reported instead.
+    :param paths: The paths of the specification
+    :param library_config: configuration of the HTTP library
+    :param jobs: Number of worker processes
+    :param schema_names: Only render the models of these schemas. All schemas are rendered if None.
+    :param tags: Only render the services of these tags. All services are rendered if None.
+    :return: The models and the services
+    """
+    resolver = get_ref_resolver()
+    components = resolver.components
+    schemas = components.schemas if components is not None and components.schemas is not None else {}
+    names = [name for name in schemas if schema_names is None or name in schema_names]
+    operations = [
+        (path_name, http_operation) for path_name, http_operation, _, _ in iter_operations(paths or {}, tags)
+    ]
+
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=_init_render_worker,
+        initargs=(resolver, paths, library_config, _RenderSettings.current()),
+    ) as executor, get_profiler().phase("render_workers"):
+        # The models and the operations are submitted together, so workers done with the models start on the
+        # operations while the last models are rendered.
+        model_futures: List["Future[Tuple[List[Model], int, int]]"] = [
+            executor.submit(_render_models, chunk) for chunk in _chunks(names, jobs)
+        ]
+        operation_futures: List["Future[Tuple[List[ServiceOperation], int, int]]"] = [
+            executor.submit(_render_operations, chunk) for chunk in _chunks(operations, jobs)
+        ]
+
+        models: List[Model] = []
+        for model_future in model_futures:
+            chunk_models, hits, misses = model_future.result()
+            models.extend(chunk_models)
+            add_type_converter_stats(hits, misses)
+        service_ops: List[ServiceOperation] = []
+        for operation_future in operation_futures:
+            chunk_ops, hits, misses = operation_future.result()
+            service_ops.extend(chunk_ops)
+            add_type_converter_stats(hits, misses)
+
+    return models, group_service_operations(service_ops, library_config)
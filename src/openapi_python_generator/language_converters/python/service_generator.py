@@ -1,5 +1,7 @@
 import re
+from typing import Collection
 from typing import Dict
+from typing import Iterator
 from typing import List
 from typing import Literal
 from typing import Optional
@@ -9,19 +11,26 @@ from typing import Union
 import click
 from openapi_pydantic.v3.v3_0 import Reference, Schema, Operation, Parameter, RequestBody, Response, MediaType, PathItem
 
+from openapi_python_generator.common import ValidationMode
 from openapi_python_generator.language_converters.python import common
 from openapi_python_generator.language_converters.python.common import normalize_symbol
 from openapi_python_generator.language_converters.python.jinja_config import (
-    create_jinja_env,
+    get_jinja_env,
 )
+from openapi_python_generator.language_converters.python.layout import string_literal
 from openapi_python_generator.language_converters.python.model_generator import (
     type_converter,
 )
+from openapi_python_generator.language_converters.python.ref_resolver import (
+    get_ref_resolver,
+)
+from openapi_python_generator.language_converters.python.render_context import OperationContext
 from openapi_python_generator.models import LibraryConfig
 from openapi_python_generator.models import OpReturnType
 from openapi_python_generator.models import Service
 from openapi_python_generator.models import ServiceOperation
 from openapi_python_generator.models import TypeConversion
+from openapi_python_generator.profiling import get_profiler
 
 
 HTTP_OPERATIONS = ["get", "post", "put", "delete", "options", "head", "patch", "trace"]
@@ -47,16 +56,17 @@ def generate_body_param(operation: Operation) -> Union[str, None]:
     if operation.requestBody is None:
         return None
     else:
-        if isinstance(operation.requestBody, Reference):
+        request_body = get_ref_resolver().resolve(operation.requestBody, RequestBody)
+        if isinstance(request_body, Reference):
             return _generate_body_dump_expression("data")
 
-        if operation.requestBody.content is None:
+        if request_body.content is None:
             return None  # pragma: no cover
 
-        if operation.requestBody.content.get("application/json") is None:
+        if request_body.content.get("application/json") is None:
             return None  # pragma: no cover
 
-        media_type = operation.requestBody.content.get("application/json")
+        media_type = request_body.content.get("application/json")
 
         if media_type is None:
             return None  # pragma: no cover
@@ -81,19 +91,29 @@ def generate_body_param(operation: Operation) -> Union[str, None]:
 
 
 def generate_params(operation: Operation) -> str:
+    return "".join(f"{param}, " for param in generate_param_list(operation))
+
+
+def generate_param_list(operation: Operation) -> List[str]:
+    """
+    Generate the parameters of the function of an operation, the required ones first.
+    :param operation: The operation
+    :return: The parameters like "limit: Optional[int] = None", without separating commas
+    """
     def _generate_params_from_content(content: Union[Reference, Schema]):
         if isinstance(content, Reference):
-            return f"data : {content.ref.split('/')[-1]}"
+            return f"data: {get_ref_resolver().name(content.ref)}"
         else:
-            return f"data : {type_converter(content, True).converted_type}"
+            return f"data: {type_converter(content, True).converted_type}"
 
     if operation.parameters is None and operation.requestBody is None:
-        return ""
+        return []
 
-    params = ""
-    default_params = ""
+    params = []
+    default_params = []
     if operation.parameters is not None:
         for param in operation.parameters:
+            param = get_ref_resolver().resolve(param, Parameter)
             if not isinstance(param, Parameter):
                 continue  # pragma: no cover
             converted_result = ""
@@ -102,13 +122,13 @@ def generate_params(operation: Operation) -> str:
 
             if isinstance(param.param_schema, Schema):
                 converted_result = (
-                    f"{param_name_cleaned} : {type_converter(param.param_schema, param.required).converted_type}"
+                    f"{param_name_cleaned}: {type_converter(param.param_schema, param.required).converted_type}"
                     + ("" if param.required else " = None")
                 )
                 required = param.required
             elif isinstance(param.param_schema, Reference):
                 converted_result = (
-                    f"{param_name_cleaned} : {param.param_schema.ref.split('/')[-1] }"
+                    f"{param_name_cleaned}: {get_ref_resolver().name(param.param_schema.ref)}"
                     + (
                         ""
                         if isinstance(param, Reference) or param.required
@@ -118,9 +138,9 @@ def generate_params(operation: Operation) -> str:
                 required = isinstance(param, Reference) or param.required
 
             if required:
-                params += f"{converted_result}, "
+                params.append(converted_result)
             else:
-                default_params += f"{converted_result}, "
+                default_params.append(converted_result)
 
     operation_request_body_types = [
         "application/json",
@@ -128,13 +148,14 @@ def generate_params(operation: Operation) -> str:
         "multipart/form-data",
     ]
 
-    if operation.requestBody is not None:
+    request_body = get_ref_resolver().resolve(operation.requestBody, RequestBody)
+    if request_body is not None:
         if (
-            isinstance(operation.requestBody, RequestBody)
-            and isinstance(operation.requestBody.content, dict)
+            isinstance(request_body, RequestBody)
+            and isinstance(request_body.content, dict)
             and any(
                 [
-                    operation.requestBody.content.get(i) is not None
+                    request_body.content.get(i) is not None
                     for i in operation_request_body_types
                 ]
             )
@@ -142,29 +163,24 @@ def generate_params(operation: Operation) -> str:
             get_keyword = [
                 i
                 for i in operation_request_body_types
-                if operation.requestBody.content.get(i) is not None
+                if request_body.content.get(i) is not None
             ][0]
-            content = operation.requestBody.content.get(get_keyword)
+            content = request_body.content.get(get_keyword)
             if content is not None and (
                 isinstance(content.media_type_schema, Schema)
                 or isinstance(content.media_type_schema, Reference)
             ):
-                params += (
-                    f"{_generate_params_from_content(content.media_type_schema)}, "
-                )
+                params.append(_generate_params_from_content(content.media_type_schema))
             else:
                 raise Exception(
                     f"Unsupported media type schema for {str(operation)}"
                 )  # pragma: no cover
         else:
             raise Exception(
-                f"Unsupported request body type: {type(operation.requestBody)}"
+                f"Unsupported request body type: {type(request_body)}"
             )
     # Replace - with _ in params
-    params = params.replace("-", "_")
-    default_params = default_params.replace("-", "_")
-
-    return params + default_params
+    return [param.replace("-", "_") for param in params + default_params]
 
 
 def generate_operation_id(
@@ -188,9 +204,10 @@ def _generate_params(
 
     params = []
     for param in operation.parameters:
+        param = get_ref_resolver().resolve(param, Parameter)
         if isinstance(param, Parameter) and param.param_in == param_in:
             param_name_cleaned = common.normalize_symbol(param.name)
-            params.append(f"{param.name!r} : {param_name_cleaned}")
+            params.append(f"{string_literal(param.name)}: {param_name_cleaned}")
 
     return params
 
@@ -215,7 +232,7 @@ def generate_return_type(operation: Operation) -> OpReturnType:
     if len(good_responses) == 0:
         return OpReturnType(type=None, status_code=200, complex_type=False)
 
-    chosen_response = good_responses[0][1]
+    chosen_response = get_ref_resolver().resolve(good_responses[0][1], Response)
 
     if isinstance(chosen_response, Response) and chosen_response.content is not None:
         media_type_schema = chosen_response.content.get("application/json")
@@ -230,10 +247,11 @@ def generate_return_type(operation: Operation) -> OpReturnType:
 
     if isinstance(media_type_schema, MediaType):
         if isinstance(media_type_schema.media_type_schema, Reference):
+            type_name = get_ref_resolver().name(media_type_schema.media_type_schema.ref)
             type_conv = TypeConversion(
                 original_type=media_type_schema.media_type_schema.ref,
-                converted_type=media_type_schema.media_type_schema.ref.split("/")[-1],
-                import_types=[media_type_schema.media_type_schema.ref.split("/")[-1]],
+                converted_type=type_name,
+                import_types=[type_name],
             )
             return OpReturnType(
                 type=type_conv,
@@ -273,112 +291,166 @@ def generate_return_type(operation: Operation) -> OpReturnType:
         raise Exception("Unknown media type schema type")  # pragma: no cover
 
 
-def generate_services(
-    paths: Dict[str, PathItem], library_config: LibraryConfig
-) -> List[Service]:
+def get_operation_tag(operation: Operation) -> Optional[str]:
     """
-    Generates services from a paths object.
+    Get the tag an operation is grouped by, which is the normalized first tag of the operation.
+    :param operation: The operation
+    :return: The tag or None, if the operation has no tags
+    """
+    if operation.tags is not None and len(operation.tags) > 0:
+        return normalize_symbol(operation.tags[0])
+    return None
+
+
+def iter_operations(
+    paths: Dict[str, PathItem],
+    tags: Optional[Collection[Optional[str]]] = None,
+) -> Iterator[Tuple[str, str, PathItem, Operation]]:
+    """
+    Iterate over the operations of a paths object, in the order of the paths and of HTTP_OPERATIONS.
+    :param paths: paths object
+    :param tags: Only yield the operations of these tags. All operations are yielded if tags is None.
+    :return: The path name, the HTTP method, the path item and the operation
+    """
+    for path_name, path in paths.items():
+        for http_operation in HTTP_OPERATIONS:
+            op = path.__getattribute__(http_operation)
+            if op is None:
+                continue
+            if tags is not None and get_operation_tag(op) not in tags:
+                continue
+            yield path_name, http_operation, path, op
+
+
+def generate_service_operations(
+    paths: Dict[str, PathItem],
+    library_config: LibraryConfig,
+    tags: Optional[Collection[Optional[str]]] = None,
+    operations: Optional[Collection[Tuple[str, str]]] = None,
+) -> List[ServiceOperation]:
+    """
+    Render the operations of a paths object, the synchronous variant of each operation before the asynchronous one.
     :param paths: paths object to be converted
-    :return: List of services
+    :param library_config: configuration of the HTTP library
+    :param tags: Only render the operations of these tags, None stands for operations without a tag.
+    :param operations: Only render these operations, given as pairs of the path name and the HTTP method.
+    :return: The operations, in the order of the paths
     """
-    jinja_env = create_jinja_env()
+    jinja_env = get_jinja_env()
 
     def generate_service_operation(
         op: Operation, path_name: str, async_type: bool
     ) -> ServiceOperation:
-        params = generate_params(op)
+        param_list = generate_param_list(op)
+        params = "".join(f"{param}, " for param in param_list)
         operation_id = generate_operation_id(op, http_operation, path_name)
         query_params = generate_query_params(op)
         header_params = generate_header_params(op)
         return_type = generate_return_type(op)
         body_param = generate_body_param(op)
 
-        so = ServiceOperation(
+        context = OperationContext(
             params=params,
+            param_list=param_list,
             operation_id=operation_id,
             query_params=query_params,
             header_params=header_params,
             return_type=return_type,
-            operation=op,
-            pathItem=path,
-            content="",
             async_client=async_type,
             body_param=body_param,
             path_name=path_name,
             method=http_operation,
             use_orjson=common.get_use_orjson(),
+            operation=op,
+            pathItem=path,
         )
 
-        so.content = jinja_env.get_template(library_config.template_name).render(
-            **so.dict()
+        so = ServiceOperation(
+            params=params,
+            operation_id=operation_id,
+            query_params=query_params,
+            header_params=header_params,
+            return_type=return_type,
+            content=jinja_env.get_template(library_config.template_name).render(context.as_dict()),
+            async_client=async_type,
+            body_param=body_param,
+            path_name=path_name,
+            method=http_operation,
+            use_orjson=common.get_use_orjson(),
         )
 
-        if op.tags is not None and len(op.tags) > 0:
-            so.tag = normalize_symbol(op.tags[0])
+        so.tag = get_operation_tag(op)
 
-        try:
-            compile(so.content, "<string>", "exec")
-        except SyntaxError as e:  # pragma: no cover
-            click.echo(f"Error in service {so.operation_id}: {e}")  # pragma: no cover
+        if common.get_validation_mode() == ValidationMode.SNIPPET:
+            try:
+                compile(so.content, "<string>", "exec")
+            except SyntaxError as e:  # pragma: no cover
+                click.echo(f"Error in service {so.operation_id}: {e}")  # pragma: no cover
 
         return so
 
-    services = []
     service_ops = []
-    for path_name, path in paths.items():
-        for http_operation in HTTP_OPERATIONS:
-            op = path.__getattribute__(http_operation)
-            if op is None:
-                continue
+    profiler = get_profiler()
+    for path_name, http_operation, path, op in iter_operations(paths, tags):
+        if operations is not None and (path_name, http_operation) not in operations:
+            continue
 
-            if library_config.include_sync:
+        if library_config.include_sync:
+            with profiler.item("operations", f"{http_operation.upper()} {path_name}"):
                 sync_so = generate_service_operation(op, path_name, False)
-                service_ops.append(sync_so)
+            service_ops.append(sync_so)
 
-            if library_config.include_async:
+        if library_config.include_async:
+            with profiler.item("operations", f"async {http_operation.upper()} {path_name}"):
                 async_so = generate_service_operation(op, path_name, True)
-                service_ops.append(async_so)
-
-    tags = set([so.tag for so in service_ops])
-
-    for tag in tags:
-        services.append(
-            Service(
-                file_name=f"{tag}_service",
-                operations=[
-                    so for so in service_ops if so.tag == tag and not so.async_client
-                ],
-                content="\n".join(
-                    [
-                        so.content
-                        for so in service_ops
-                        if so.tag == tag and not so.async_client
-                    ]
-                ),
-                async_client=False,
-                library_import=library_config.library_name,
-                use_orjson=common.get_use_orjson(),
-            )
-        )
+            service_ops.append(async_so)
 
-    for tag in tags:
-        services.append(
-            Service(
-                file_name=f"async_{tag}_service",
-                operations=[
-                    so for so in service_ops if so.tag == tag and so.async_client
-                ],
-                content="\n".join(
-                    [
-                        so.content
-                        for so in service_ops
-                        if so.tag == tag and so.async_client
-                    ]
-                ),
-                async_client=True,
-                library_import=library_config.library_name,
-                use_orjson=common.get_use_orjson(),
+    return service_ops
+
+
+def group_service_operations(service_ops: List[ServiceOperation], library_config: LibraryConfig) -> List[Service]:
+    """
+    Group rendered operations into a service per tag and client type.
+    :param service_ops: The operations, in the order of the paths
+    :param library_config: configuration of the HTTP library
+    :return: List of services
+    """
+    services = []
+    # Group the operations by tag and client type in a single pass. Tags keep the order of their first operation
+    # and operations keep the order of the paths, so the output does not change between runs.
+    grouped_ops: Dict[Tuple[Optional[str], bool], List[ServiceOperation]] = {}
+    for so in service_ops:
+        grouped_ops.setdefault((so.tag, bool(so.async_client)), []).append(so)
+    tags = list(dict.fromkeys(so.tag for so in service_ops))
+
+    for async_client in (False, True):
+        for tag in tags:
+            operations = grouped_ops.get((tag, async_client), [])
+            services.append(
+                Service(
+                    file_name=f"async_{tag}_service" if async_client else f"{tag}_service",
+                    operations=operations,
+                    content="\n\n\n".join([so.content for so in operations]),
+                    async_client=async_client,
+                    library_import=library_config.library_name,
+                    use_orjson=common.get_use_orjson(),
+                )
             )
-        )
 
     return services
+
+
+def generate_services(
+    paths: Dict[str, PathItem],
+    library_config: LibraryConfig,
+    tags: Optional[Collection[Optional[str]]] = None,
+) -> List[Service]:
+    """
+    Generates services from a paths object.
+    :param paths: paths object to be converted
+    :param library_config: configuration of the HTTP library
+    :param tags: Only generate the services of these tags, None stands for operations without a tag. All services
+    are generated if tags is None.
+    :return: List of services
+    """
+    return group_service_operations(generate_service_operations(paths, library_config, tags), library_config)
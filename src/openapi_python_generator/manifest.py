@@ -0,0 +1,140 @@
+import hashlib
+import json
+from pathlib import Path
+from typing import Any
+from typing import Dict
+from typing import Optional
+
+from openapi_pydantic.v3.v3_0 import OpenAPI
+
+from .cache import _write_atomic
+from .common import FormatOptions
+from .common import Formatter
+from .common import HTTPLibrary
+from .common import PydanticVersion
+from .common import ValidationMode
+from .ruff_formatter import ruff_version
+
+
+# The manifest of a generated client, stored in its output directory. It lists the hash of every written file
+# together with the inputs the client was generated from.
+MANIFEST_FILE = ".openapi-python-generator-manifest.json"
+MANIFEST_VERSION = 1
+
+
+def digest(*parts: str) -> str:
+    sha = hashlib.sha256()
+    for part in parts:
+        sha.update(part.encode())
+        sha.update(b"\0")
+    return sha.hexdigest()
+
+
+def options_key(
+    library: HTTPLibrary,
+    env_token_name: Optional[str],
+    use_orjson: bool,
+    use_awaredatetime: bool,
+    custom_template_path: Optional[str],
+    pydantic_version: PydanticVersion,
+    formatter: Formatter,
+    validation: ValidationMode,
+) -> str:
+    """
+    Hash every input of the generation that affects all files: the options, the version of the generator and of the
+    formatter, and the custom templates.
+    """
+    # The versions are looked up here, as importlib.metadata is slow to import.
+    from importlib.metadata import version
+
+    from . import __version__
+
+    parts = [
+        __version__,
+        HTTPLibrary(library).value,
+        str(env_token_name),
+        str(use_orjson),
+        str(use_awaredatetime),
+        PydanticVersion(pydantic_version).value,
+        Formatter(formatter).value,
+        ValidationMode(validation).value,
+        str(FormatOptions.skip_validation),
+        str(FormatOptions.line_length),
+    ]
+    if formatter in (Formatter.BLACK, Formatter.VERIFY):
+        parts += [version("black"), version("isort")]
+    elif formatter == Formatter.RUFF:
+        parts.append(ruff_version())
+    if custom_template_path is not None:
+        for template in sorted(Path(custom_template_path).rglob("*")):
+            if template.is_file():
+                parts += [str(template), template.read_bytes().hex()]
+    return digest(*parts)
+
+
+def spec_digest(data: OpenAPI) -> str:
+    """
+    Hash the validated specification, so changes of the formatting or the order of keys of a JSON spec that do
+    not change the parsed spec do not count as changes.
+    """
+    return digest(data.model_dump_json(by_alias=True, exclude_none=True))
+
+
+def manifest_inputs(data: OpenAPI, options: str) -> Dict[str, str]:
+    """
+    Collect the inputs a client is generated from, which are stored in its manifest.
+    :param data: The specification
+    :param options: The options_key of the run
+    """
+    from . import __version__
+
+    return {"generator": __version__, "spec": spec_digest(data), "options": options}
+
+
+def file_digest(content: str) -> str:
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def load_manifest(output: Path) -> Optional[Dict[str, Any]]:
+    """
+    Load the manifest of the client in output.
+    :param output: The output folder of the client
+    :return: The manifest or None, if there is no manifest of this version of the format
+    """
+    try:
+        manifest = json.loads((Path(output) / MANIFEST_FILE).read_bytes())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION:
+        return None
+    return manifest
+
+
+def write_manifest(output: Path, inputs: Optional[Dict[str, str]], files: Dict[str, str]) -> None:
+    """
+    Write the manifest of the client in output.
+    :param output: The output folder of the client
+    :param inputs: The manifest_inputs of the run, None if they are unknown
+    :param files: The hash of the content of every file, keyed by the path relative to output
+    """
+    manifest = {"version": MANIFEST_VERSION, "inputs": inputs, "files": dict(sorted(files.items()))}
+    _write_atomic(Path(output) / MANIFEST_FILE, json.dumps(manifest, indent=1).encode())
+
+
+def manifest_is_current(output: Path, manifest: Dict[str, Any], inputs: Dict[str, str]) -> bool:
+    """
+    Check whether the client in output was generated from the same inputs and none of its files was changed since.
+    The generation is deterministic, so the client does not have to be generated again to check it then.
+    :param output: The output folder of the client
+    :param manifest: The manifest of the client
+    :param inputs: The manifest_inputs of the current run
+    """
+    if manifest.get("inputs") != inputs:
+        return False
+    for file, file_hash in manifest["files"].items():
+        try:
+            if file_digest((Path(output) / file).read_text()) != file_hash:
+                return False
+        except OSError:
+            return False
+    return True
@@ -32,8 +32,8 @@ class ServiceOperation(BaseModel):
     query_params: List[str]
     header_params: List[str]
     return_type: OpReturnType
-    operation: Operation
-    pathItem: PathItem
+    operation: Optional[Operation] = None
+    pathItem: Optional[PathItem] = None
     content: str
     async_client: Optional[bool] = False
     tag: Optional[str] = None
@@ -84,3 +84,5 @@ class ConversionResult(BaseModel):
     models: List[Model]
     services: List[Service]
     api_config: APIConfig
+    # The built-in templates render sorted imports, so the imports only need sorting for custom templates.
+    sort_imports: bool = True
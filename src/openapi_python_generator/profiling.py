@@ -0,0 +1,199 @@
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Tuple
+from typing import TypeVar
+from typing import Union
+
+
+# Number of the slowest models and operations in the report.
+PROFILE_TOP = 10
+
+T = TypeVar("T")
+
+
+class PhaseStats:
+    """
+    Accumulated statistics of a phase of the generation.
+    """
+
+    __slots__ = ("calls", "seconds", "peak_memory")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.seconds = 0.0
+        self.peak_memory = 0
+
+
+class Profiler:
+    """
+    Collects the time and the peak memory spent in each phase of the generation, as well as the time spent on every
+    model and operation. A disabled profiler measures nothing, so the phases can be marked unconditionally.
+
+    Peak memory is the highest amount of memory traced by tracemalloc while the phase was active. Phases can be
+    nested, the peak of the outer phase includes the inner one. On python 3.8, which cannot reset the peak, the
+    peak of a phase includes the earlier phases.
+    """
+
+    def __init__(self, enabled: bool = False, top: int = PROFILE_TOP) -> None:
+        self.enabled = enabled
+        self.top = top
+        self.phases: Dict[str, PhaseStats] = {}
+        self.items: Dict[str, List[Tuple[float, str]]] = {"models": [], "operations": []}
+        self._active: List[PhaseStats] = []
+        self._started = time.perf_counter()
+        self._seconds = 0.0
+
+    def start(self) -> None:
+        """
+        Start tracing memory allocations and the total time.
+        """
+        self._started = time.perf_counter()
+        if self.enabled and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def stop(self) -> None:
+        """
+        Stop tracing memory allocations and the total time.
+        """
+        self._seconds = time.perf_counter() - self._started
+        if self.enabled and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    @staticmethod
+    def _traced_peak() -> int:
+        return tracemalloc.get_traced_memory()[1] if tracemalloc.is_tracing() else 0
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Measure a phase. Repeated phases of the same name are summed up.
+        :param name: Name of the phase, e.g. black
+        """
+        if not self.enabled:
+            yield
+            return
+
+        stats = self.phases.setdefault(name, PhaseStats())
+        if self._active:
+            # Keep the peak of the outer phase before resetting it for this one.
+            outer = self._active[-1]
+            outer.peak_memory = max(outer.peak_memory, self._traced_peak())
+        if tracemalloc.is_tracing() and hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+        self._active.append(stats)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            stats.seconds += time.perf_counter() - start
+            stats.calls += 1
+            stats.peak_memory = max(stats.peak_memory, self._traced_peak())
+            self._active.pop()
+
+    @contextmanager
+    def item(self, kind: str, name: str) -> Iterator[None]:
+        """
+        Measure the time spent on a single model or operation.
+        :param kind: models or operations
+        :param name: Name of the item in the report
+        """
+        if not self.enabled:
+            yield
+            return
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.items[kind].append((time.perf_counter() - start, name))
+
+    def iter_items(self, kind: str, iterable: Iterable[T], name: Callable[[T], str]) -> Iterable[T]:
+        """
+        Measure the time spent on each element of an iterable, i.e. the time until the next element is requested.
+        :param kind: models or operations
+        :param iterable: The elements, e.g. the schemas of a specification
+        :param name: Function returning the name of an element in the report
+        :return: The iterable, unchanged if the profiler is disabled
+        """
+        if not self.enabled:
+            return iterable
+        return self._iter_items(kind, iterable, name)
+
+    def _iter_items(self, kind: str, iterable: Iterable[T], name: Callable[[T], str]) -> Iterator[T]:
+        for element in iterable:
+            with self.item(kind, name(element)):
+                yield element
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Get the collected statistics.
+        :return: Dictionary of the total time, the phases and the slowest models and operations
+        """
+        result: Dict[str, Any] = {
+            "total_seconds": self._seconds,
+            "phases": [
+                {"name": name, "calls": stats.calls, "seconds": stats.seconds, "peak_memory": stats.peak_memory}
+                for name, stats in self.phases.items()
+            ],
+        }
+        for kind, items in self.items.items():
+            result[kind] = [
+                {"name": name, "seconds": seconds} for seconds, name in sorted(items, reverse=True)[: self.top]
+            ]
+        return result
+
+    def format_report(self) -> str:
+        """
+        Format the collected statistics as a table.
+        :return: The human readable report
+        """
+        report = self.report()
+        lines = [f"{'Phase':<24}{'Calls':>8}{'Time (s)':>12}{'Peak memory (MiB)':>20}"]
+        for phase in report["phases"]:
+            lines.append(
+                f"{phase['name']:<24}{phase['calls']:>8}{phase['seconds']:>12.3f}"
+                f"{phase['peak_memory'] / (1024 * 1024):>20.1f}"
+            )
+        lines.append(f"{'total':<24}{'':>8}{report['total_seconds']:>12.3f}")
+        for kind in self.items:
+            if report[kind]:
+                lines.append(f"Slowest {kind}:")
+                lines.extend(f"  {item['seconds']:.4f}s  {item['name']}" for item in report[kind])
+        return "\n".join(lines)
+
+    def write_json(self, path: Union[str, Path]) -> None:
+        """
+        Write the collected statistics as JSON.
+        :param path: Path of the JSON file
+        """
+        Path(path).write_text(json.dumps(self.report(), indent=2))
+
+
+_profiler: Profiler = Profiler()
+
+
+def set_profiler(value: Profiler) -> None:
+    """
+    Set the profiler the phases of the generation are reported to.
+    :param value: value of the variable
+    """
+    global _profiler
+    _profiler = value
+
+
+def get_profiler() -> Profiler:
+    """
+    Get the profiler the phases of the generation are reported to.
+    :return: value of the variable
+    """
+    global _profiler
+    return _profiler
@@ -0,0 +1,73 @@
+import shutil
+import subprocess  # noqa: S404
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+from typing import List
+
+import click
+
+from .common import FormatOptions
+
+
+# Number of files formatted by a single call of ruff.
+RUFF_BATCH_SIZE = 256
+
+
+@lru_cache(maxsize=None)
+def find_ruff() -> str:
+    """
+    Find the ruff executable, preferring the one of the installed ruff package over the one on the PATH.
+    :return: Path of the executable
+    """
+    try:
+        from ruff.__main__ import find_ruff_bin  # type: ignore
+
+        return str(find_ruff_bin())
+    except (ImportError, FileNotFoundError):
+        pass
+    path = shutil.which("ruff")
+    if path is None:
+        raise click.ClickException(
+            "The ruff formatter requires ruff. Install it with: pip install openapi-python-generator[ruff]"
+        )
+    return path
+
+
+@lru_cache(maxsize=None)
+def ruff_version() -> str:
+    """
+    Get the version of the ruff executable, e.g. to invalidate cached formatting results after an upgrade.
+    """
+    return subprocess.run(  # noqa: S603
+        [find_ruff(), "--version"], capture_output=True, text=True, check=True
+    ).stdout.strip()
+
+
+def _run_ruff(*args: str) -> None:
+    result = subprocess.run([find_ruff(), *args], capture_output=True, text=True)  # noqa: S603
+    if result.returncode != 0:
+        raise click.ClickException(f"ruff {args[0]} failed: {result.stderr.strip()}")
+
+
+def format_using_ruff(contents: List[str], sort_imports: bool = True) -> List[str]:
+    """
+    Sort the imports and format the code of many files with two calls of ruff, which spreads the work over all cores.
+    The files are written to a temporary directory, as ruff only formats a single file when reading from stdin.
+    User configuration of ruff is ignored, so the output only depends on the FormatOptions.
+    :param contents: The code of the files, which has to be valid python.
+    :param sort_imports: Sort the imports of the code.
+    :return: The formatted code of the files, in the same order.
+    """
+    if not contents:
+        return []
+    line_length = str(FormatOptions.line_length)
+    with tempfile.TemporaryDirectory() as directory:
+        paths = [Path(directory) / f"_{index}.py" for index in range(len(contents))]
+        for path, content in zip(paths, contents):
+            path.write_text(content)
+        options = ["--isolated", "--no-cache", "--quiet", "--line-length", line_length]
+        if sort_imports:
+            _run_ruff("check", *options, "--select", "I", "--fix", "--exit-zero", directory)
+        _run_ruff("format", *options, directory)
+        return [path.read_text() for path in paths]
@@ -0,0 +1,235 @@
+import hashlib
+import time
+from pathlib import Path
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+import click
+from openapi_pydantic.v3.v3_0 import OpenAPI
+
+from .cache import FormatCache
+from .common import Formatter
+from .common import HTTPLibrary
+from .common import PydanticVersion
+from .common import ValidationMode
+from .common import library_config_dict
+from .common import resolve_library
+from .generate_data import _iter_files
+from .generate_data import _process_files
+from .generate_data import check_failed
+from .generate_data import get_open_api
+from .language_converters.python.generator import generator
+from .language_converters.python.jinja_config import reset_jinja_env
+from .manifest import file_digest
+from .manifest import load_manifest
+from .manifest import manifest_inputs
+from .manifest import options_key
+from .manifest import write_manifest
+
+
+# Seconds between two checks of the watched files.
+WATCH_INTERVAL = 0.5
+
+Snapshot = Dict[Path, Tuple[int, int]]
+
+
+def _snapshot(paths: Iterable[Path]) -> Snapshot:
+    """
+    Get the modification time and size of files. Directories are searched for files recursively.
+    :param paths: The files and directories to look at
+    :return: Modification time and size of every existing file
+    """
+    snapshot: Snapshot = {}
+    for path in paths:
+        files = sorted(p for p in path.rglob("*") if p.is_file()) if path.is_dir() else [path]
+        for file in files:
+            try:
+                stat = file.stat()
+            except OSError:
+                continue
+            snapshot[file] = (stat.st_mtime_ns, stat.st_size)
+    return snapshot
+
+
+class Watcher:
+    """
+    Regenerates a client whenever its specification or a custom template changes. The process stays warm between
+    runs: the parsed specification is reused while the specification file is unchanged, the templates stay compiled
+    and black and isort stay imported. Every run renders the whole client, but only files whose unformatted content
+    changed since the previous run are formatted and written again, and files that are no longer generated are
+    removed. The manifest of the output folder is updated after every run.
+    """
+
+    def __init__(
+        self,
+        source: Union[str, Path],
+        output: Union[str, Path],
+        library: Optional[HTTPLibrary] = HTTPLibrary.httpx,
+        env_token_name: Optional[str] = None,
+        use_orjson: bool = False,
+        use_awaredatetime: bool = False,
+        custom_template_path: Optional[str] = None,
+        pydantic_version: PydanticVersion = PydanticVersion.V2,
+        formatter: Formatter = Formatter.BLACK,
+        jobs: int = 1,
+        format_cache: bool = True,
+        template_cache: bool = True,
+        validation: ValidationMode = ValidationMode.FILE,
+    ) -> None:
+        self.source = Path(source)
+        self.output = Path(output)
+        self.library = resolve_library(library)
+        self.env_token_name = env_token_name
+        self.use_orjson = use_orjson
+        self.use_awaredatetime = use_awaredatetime
+        self.custom_template_path = custom_template_path
+        self.pydantic_version = pydantic_version
+        self.formatter = formatter
+        self.jobs = jobs
+        self.format_cache = format_cache
+        self.template_cache = template_cache
+        self.validation = validation
+
+        self._data: Optional[OpenAPI] = None
+        self._spec_snapshot: Optional[Snapshot] = None
+        self._snapshot: Optional[Snapshot] = None
+        # Hash of the unformatted content of every file written by the previous run.
+        self._written: Dict[Path, str] = {}
+        # Hash of the formatted content of every file, as stored in the manifest.
+        self._files: Dict[Path, str] = {}
+
+    @property
+    def watched_paths(self) -> List[Path]:
+        paths = [self.source]
+        if self.custom_template_path is not None:
+            paths.append(Path(self.custom_template_path))
+        return paths
+
+    def poll(self) -> bool:
+        """
+        Check whether a watched file changed since the last run.
+        :return: True, if the client has to be generated again
+        """
+        return _snapshot(self.watched_paths) != self._snapshot
+
+    def _changed_files(
+        self, files: Iterable[Tuple[Path, str]], hashes: Dict[Path, str]
+    ) -> Iterator[Tuple[Path, str]]:
+        for path, content in files:
+            digest = hashlib.sha256(content.encode()).hexdigest()
+            hashes[path] = digest
+            if self._written.get(path) != digest or not path.exists():
+                yield path, content
+
+    def generate(self) -> int:
+        """
+        Generate the client, writing only the files that changed since the previous run.
+        :return: Number of files written or removed
+        """
+        snapshot = _snapshot(self.watched_paths)
+        spec_snapshot = _snapshot([self.source])
+        if self._snapshot is not None and snapshot.keys() != self._snapshot.keys():
+            # Templates were added or removed, which the compiled templates of the environment do not notice.
+            reset_jinja_env()
+        self._snapshot = snapshot
+        if self._data is None or spec_snapshot != self._spec_snapshot:
+            self._data = get_open_api(self.source)
+            self._spec_snapshot = spec_snapshot
+
+        result = generator(
+            self._data,
+            library_config_dict[self.library],
+            self.env_token_name,
+            self.use_orjson,
+            self.use_awaredatetime,
+            self.custom_template_path,
+            self.pydantic_version,
+            self.template_cache,
+            self.validation,
+            jobs=self.jobs,
+        )
+
+        (self.output / "models").mkdir(parents=True, exist_ok=True)
+        (self.output / "services").mkdir(parents=True, exist_ok=True)
+        cache = None
+        if self.format_cache and self.formatter != Formatter.NONE:
+            cache = FormatCache(self.formatter, sort_imports=result.sort_imports)
+
+        hashes: Dict[Path, str] = {}
+        written = 0
+        files = self._changed_files(_iter_files(result, self.output), hashes)
+        validate = self.validation == ValidationMode.FILE
+        failed: List[Path] = []
+        for path, content in _process_files(
+            files, self.formatter, validate, self.jobs, cache, failed, result.sort_imports
+        ):
+            with open(path, "w") as f:
+                f.write(content)
+            self._files[path] = file_digest(content)
+            written += 1
+
+        removed = set(self._written)
+        if not self._written:
+            # Files of a client generated before watching started, which are no longer generated, are removed as well.
+            manifest = load_manifest(self.output)
+            removed.update(self.output / file for file in (manifest["files"] if manifest is not None else {}))
+        for path in removed - hashes.keys():
+            if path.exists():
+                path.unlink()
+                written += 1
+            self._files.pop(path, None)
+        self._written = hashes
+
+        options = options_key(
+            self.library,
+            self.env_token_name,
+            self.use_orjson,
+            self.use_awaredatetime,
+            self.custom_template_path,
+            self.pydantic_version,
+            self.formatter,
+            self.validation,
+        )
+        write_manifest(
+            self.output,
+            manifest_inputs(self._data, options),
+            {path.relative_to(self.output).as_posix(): file_hash for path, file_hash in self._files.items()},
+        )
+
+        if cache is not None:
+            cache.evict()
+        check_failed(self.formatter, failed)
+        return written
+
+    def run(self) -> None:
+        """
+        Generate the client and report the result. Failures are reported, so watching continues after a broken edit
+        of the specification.
+        """
+        start = time.perf_counter()
+        try:
+            written = self.generate()
+        except Exception as e:
+            click.echo(f"Generation failed: {e}")
+            return
+        click.echo(f"Updated {written} of {len(self._written)} files in {time.perf_counter() - start:.2f}s")
+
+    def watch(self, interval: float = WATCH_INTERVAL) -> None:
+        """
+        Generate the client and regenerate it on every change, until interrupted.
+        :param interval: Seconds between two checks of the watched files
+        """
+        self.run()
+        click.echo(f"Watching {self.source} for changes, press Ctrl+C to stop.")
+        try:
+            while True:
+                time.sleep(interval)
+                if self.poll():
+                    self.run()
+        except KeyboardInterrupt:
+            pass
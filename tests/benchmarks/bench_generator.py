@@ -0,0 +1,113 @@
+"""Benchmarks of the generator, run with `nox --session=benchmarks`."""
+import json
+import shutil
+from pathlib import Path
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+
+import pytest
+from openapi_pydantic.v3.v3_0 import OpenAPI
+
+from openapi_python_generator.common import Formatter
+from openapi_python_generator.common import HTTPLibrary
+from openapi_python_generator.common import PydanticVersion
+from openapi_python_generator.common import library_config_dict
+from openapi_python_generator.generate_data import get_open_api
+from openapi_python_generator.generate_data import write_data
+from openapi_python_generator.language_converters.python.generator import generator
+from openapi_python_generator.models import ConversionResult
+from tests.conftest import test_data_folder
+from tests.synthetic_spec import SyntheticSpecConfig
+from tests.synthetic_spec import synthetic_spec
+
+
+SPECS: Dict[str, Optional[Path]] = {
+    "test_api": test_data_folder / "test_api.json",
+    "gitea_issue_11": test_data_folder / "gitea_issue_11.json",
+    "gitea": test_data_folder / "openapi_gitea_converted.json",
+    # Written to a temporary directory by the spec_paths fixture.
+    "synthetic": None,
+}
+SYNTHETIC_CONFIG = SyntheticSpecConfig(schemas=200, composition_depth=2, paths=40, operations=5)
+# Formatting the larger specs with black takes seconds, so those benchmarks are not calibrated but run a fixed
+# number of rounds.
+WRITE_ROUNDS = 5
+# Every round starts from an empty output folder, so writing unformatted files is not calibrated either.
+UNFORMATTED_WRITE_ROUNDS = 20
+
+_open_api: Dict[str, OpenAPI] = {}
+_results: Dict[Tuple[str, HTTPLibrary, PydanticVersion], ConversionResult] = {}
+
+
+@pytest.fixture(scope="session")
+def spec_paths(tmp_path_factory) -> Dict[str, Path]:
+    paths = {name: path for name, path in SPECS.items() if path is not None}
+    paths["synthetic"] = tmp_path_factory.mktemp("specs") / "synthetic.json"
+    paths["synthetic"].write_text(json.dumps(synthetic_spec(SYNTHETIC_CONFIG)))
+    return paths
+
+
+def _load(spec_paths: Dict[str, Path], spec: str) -> OpenAPI:
+    if spec not in _open_api:
+        _open_api[spec] = get_open_api(spec_paths[spec])
+    return _open_api[spec]
+
+
+def _generate(
+    spec_paths: Dict[str, Path], spec: str, library: HTTPLibrary, pydantic_version: PydanticVersion
+) -> ConversionResult:
+    key = (spec, library, pydantic_version)
+    if key not in _results:
+        data = _load(spec_paths, spec)
+        _results[key] = generator(data, library_config_dict[library], pydantic_version=pydantic_version)
+    return _results[key]
+
+
+@pytest.mark.parametrize("spec", SPECS)
+def bench_get_open_api(benchmark, spec_paths: Dict[str, Path], spec: str) -> None:
+    benchmark.group = "get_open_api"
+    benchmark(get_open_api, spec_paths[spec])
+
+
+@pytest.mark.parametrize("pydantic_version", list(PydanticVersion))
+@pytest.mark.parametrize("library", list(HTTPLibrary))
+@pytest.mark.parametrize("spec", SPECS)
+def bench_generator(
+    benchmark, spec_paths: Dict[str, Path], spec: str, library: HTTPLibrary, pydantic_version: PydanticVersion
+) -> None:
+    benchmark.group = f"generator-{spec}"
+    data = _load(spec_paths, spec)
+    benchmark(generator, data, library_config_dict[library], pydantic_version=pydantic_version)
+
+
+@pytest.mark.parametrize("formatter", list(Formatter))
+@pytest.mark.parametrize("pydantic_version", list(PydanticVersion))
+@pytest.mark.parametrize("library", list(HTTPLibrary))
+@pytest.mark.parametrize("spec", SPECS)
+def bench_write_data(
+    benchmark,
+    tmp_path: Path,
+    spec_paths: Dict[str, Path],
+    spec: str,
+    library: HTTPLibrary,
+    pydantic_version: PydanticVersion,
+    formatter: Formatter,
+) -> None:
+    benchmark.group = f"write_data-{spec}"
+    result = _generate(spec_paths, spec, library, pydantic_version)
+    output = tmp_path / "client"
+
+    def setup() -> None:
+        # Every round writes a new client, unchanged files of the previous round would not be written again.
+        shutil.rmtree(output, ignore_errors=True)
+
+    # The format cache would turn every round after the first into a cache hit.
+    benchmark.pedantic(
+        write_data,
+        args=(result, output, formatter),
+        kwargs={"format_cache": False},
+        setup=setup,
+        rounds=UNFORMATTED_WRITE_ROUNDS if formatter == Formatter.NONE else WRITE_ROUNDS,
+        iterations=1,
+    )
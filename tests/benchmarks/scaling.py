@@ -0,0 +1,129 @@
+"""
+Chart how the generation time and memory scale with the size of the specification.
+
+Run it with `python -m tests.benchmarks.scaling`, the defaults grow a synthetic specification up to 10k schemas and
+20k operations. The time per schema and per operation should stay flat, a growing value means a phase scales
+superlinearly.
+"""
+import json
+import tempfile
+from pathlib import Path
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+
+import click
+
+from openapi_python_generator.common import Formatter
+from openapi_python_generator.common import HTTPLibrary
+from openapi_python_generator.common import library_config_dict
+from openapi_python_generator.generate_data import get_open_api
+from openapi_python_generator.generate_data import write_data
+from openapi_python_generator.language_converters.python.generator import generator
+from openapi_python_generator.profiling import Profiler
+from openapi_python_generator.profiling import set_profiler
+from tests.synthetic_spec import HTTP_METHODS
+from tests.synthetic_spec import SyntheticSpecConfig
+from tests.synthetic_spec import synthetic_spec
+
+
+# Phases of write_data, which are summed up in the chart.
+WRITE_PHASES = ["rendering", "syntax check", "black", "isort", "formatting", "writes"]
+COLUMNS = ["validation", "generate_models", "generate_services", "write_data"]
+
+
+def measure(
+    config: SyntheticSpecConfig, library: HTTPLibrary, formatter: Formatter, directory: Path
+) -> Dict[str, Any]:
+    """
+    Generate a client from a synthetic specification with the profiler enabled.
+    :param config: Size of the specification
+    :param library: HTTP library of the client
+    :param formatter: Formatter applied to the client
+    :param directory: Directory the specification and the client are written to
+    :return: The profiler report, with the sizes of the specification
+    """
+    spec_path = directory / "spec.json"
+    spec_path.write_text(json.dumps(synthetic_spec(config)))
+
+    profiler = Profiler(enabled=True)
+    set_profiler(profiler)
+    profiler.start()
+    try:
+        data = get_open_api(spec_path)
+        result = generator(data, library_config_dict[library])
+        write_data(result, directory / "client", formatter, format_cache=False)
+    finally:
+        profiler.stop()
+        set_profiler(Profiler())
+
+    report = profiler.report()
+    phases = {phase["name"]: phase for phase in report["phases"]}
+    phases["write_data"] = {
+        "seconds": sum(phases[name]["seconds"] for name in WRITE_PHASES if name in phases),
+        "peak_memory": max((phases[name]["peak_memory"] for name in WRITE_PHASES if name in phases), default=0),
+    }
+    report["schemas"] = config.schemas
+    report["operations"] = config.operation_count
+    report["phases"] = phases
+    return report
+
+
+def format_row(report: Dict[str, Any]) -> str:
+    phases = report["phases"]
+    cells = [f"{report['schemas']:>8}", f"{report['operations']:>11}"]
+    for name in COLUMNS:
+        phase = phases.get(name, {"seconds": 0.0, "peak_memory": 0})
+        cells.append(f"{phase['seconds']:>9.2f}s {phase['peak_memory'] / (1024 * 1024):>7.1f}MiB")
+    size = max(report["schemas"] + report["operations"], 1)
+    cells.append(f"{report['total_seconds'] * 1e6 / size:>10.0f}us")
+    return " ".join(cells)
+
+
+@click.command()
+@click.option("--max-schemas", type=click.IntRange(min=1), default=10000, show_default=True)
+@click.option("--max-operations", type=click.IntRange(min=1), default=20000, show_default=True)
+@click.option("--steps", type=click.IntRange(min=1), default=5, show_default=True, help="Halvings of the sizes.")
+@click.option("--properties", type=click.IntRange(min=0), default=10, show_default=True)
+@click.option("--composition-depth", type=click.IntRange(min=0), default=1, show_default=True)
+@click.option("--library", type=HTTPLibrary, default=HTTPLibrary.httpx, show_default=True)
+@click.option("--formatter", type=click.Choice(["black", "none"]), default="none", show_default=True)
+@click.option("--json", "json_path", type=click.Path(dir_okay=False), default=None, help="Write the reports as JSON.")
+def main(
+    max_schemas: int,
+    max_operations: int,
+    steps: int,
+    properties: int,
+    composition_depth: int,
+    library: HTTPLibrary,
+    formatter: str,
+    json_path: Optional[str],
+) -> None:
+    """
+    Generate clients from synthetic specifications of growing size and chart the time and peak memory of each phase.
+    """
+    operations_per_path = len(HTTP_METHODS)
+    header = [f"{'schemas':>8}", f"{'operations':>11}"] + [f"{name:>22}" for name in COLUMNS] + [f"{'per item':>12}"]
+    click.echo(" ".join(header))
+
+    reports: List[Dict[str, Any]] = []
+    for step in reversed(range(steps)):
+        config = SyntheticSpecConfig(
+            schemas=max(max_schemas >> step, 1),
+            properties=properties,
+            composition_depth=composition_depth,
+            paths=max((max_operations >> step) // operations_per_path, 1),
+            operations=operations_per_path,
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            report = measure(config, library, Formatter(formatter), Path(directory))
+        reports.append(report)
+        click.echo(format_row(report))
+
+    if json_path is not None:
+        Path(json_path).write_text(json.dumps(reports, indent=2))
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -1,8 +1,10 @@
 import json
+import os
 import shutil
 from pathlib import Path
 from typing import Dict
 from typing import Generator
+from openapi_python_generator.cache import CACHE_DIR_ENV
 from openapi_python_generator.language_converters.python import common
 
 import pytest
@@ -14,6 +16,23 @@ test_data_path = test_data_folder / "test_api.json"
 test_result_path = Path(__file__).parent / "test_result"
 
 
+@pytest.fixture(autouse=True, scope="session")
+def isolated_cache_dir(tmp_path_factory) -> Generator[Path, None, None]:
+    """
+    Keep the on-disk caches of the generator out of the home directory while testing.
+    """
+    cache_dir = tmp_path_factory.mktemp("cache")
+    previous = os.environ.get(CACHE_DIR_ENV)
+    os.environ[CACHE_DIR_ENV] = str(cache_dir)
+    try:
+        yield cache_dir
+    finally:
+        if previous is None:
+            del os.environ[CACHE_DIR_ENV]
+        else:
+            os.environ[CACHE_DIR_ENV] = previous
+
+
 @pytest.fixture(name="json_data")
 def json_data_fixture() -> Generator[Dict, None, None]:
     with open(test_data_path) as f:
@@ -25,3 +25,5 @@ def test_issue_71(runner: CliRunner, model_data_with_cleanup, library) -> None:
         generate_data(test_data_folder / "issue_71.json", test_result_path, library)
         is None
     )
+    # The enum with an empty value is not valid python and is left out.
+    assert not (test_result_path / "models" / "Registry.py").exists()
@@ -0,0 +1,158 @@
+"""Deterministic synthetic OpenAPI specifications for scaling tests and benchmarks."""
+import random
+from typing import Any
+from typing import Dict
+from typing import List
+
+from pydantic import BaseModel
+
+
+HTTP_METHODS = ["get", "post", "put", "patch", "delete"]
+PRIMITIVE_TYPES: List[Dict[str, Any]] = [
+    {"type": "string"},
+    {"type": "integer"},
+    {"type": "number"},
+    {"type": "boolean"},
+    {"type": "string", "format": "date-time"},
+    {"type": "array", "items": {"type": "string"}},
+]
+
+
+class SyntheticSpecConfig(BaseModel):
+    """
+    Size of a synthetic specification. The same configuration always yields the same specification.
+    """
+
+    schemas: int = 100
+    properties: int = 10
+    # Nesting depth and width of the allOf/oneOf compositions. A depth of 0 disables compositions.
+    composition_depth: int = 0
+    composition_width: int = 2
+    enums: int = 10
+    enum_size: int = 5
+    paths: int = 50
+    # Operations per path, at most one per HTTP method.
+    operations: int = 2
+    tags: int = 10
+    # Query parameters per operation, in addition to the path parameter.
+    parameters: int = 2
+    seed: int = 0
+
+    @property
+    def operation_count(self) -> int:
+        return self.paths * min(self.operations, len(HTTP_METHODS))
+
+
+def _schema_ref(index: int) -> Dict[str, Any]:
+    return {"$ref": f"#/components/schemas/Schema{index}"}
+
+
+def _enum_ref(index: int) -> Dict[str, Any]:
+    return {"$ref": f"#/components/schemas/Enum{index}"}
+
+
+def _composed(rng: random.Random, config: SyntheticSpecConfig, index: int, depth: int) -> Dict[str, Any]:
+    """
+    Build a property type nesting allOf and oneOf compositions up to depth levels.
+    """
+    if depth == 0:
+        if index > 0 and rng.random() < 0.5:
+            return _schema_ref(rng.randrange(index))
+        return dict(rng.choice(PRIMITIVE_TYPES))
+    keyword = "oneOf" if depth % 2 else "allOf"
+    return {keyword: [_composed(rng, config, index, depth - 1) for _ in range(config.composition_width)]}
+
+
+def _property(rng: random.Random, config: SyntheticSpecConfig, index: int) -> Dict[str, Any]:
+    """
+    Build a property of schema index. References only point to schemas with a lower index, so the models do not
+    import each other circularly.
+    """
+    choice = rng.random()
+    if choice < 0.1 and config.enums > 0:
+        return _enum_ref(rng.randrange(config.enums))
+    if choice < 0.2 and index > 0:
+        return _schema_ref(rng.randrange(index))
+    if choice < 0.25 and index > 0:
+        return {"type": "array", "items": _schema_ref(rng.randrange(index))}
+    return dict(rng.choice(PRIMITIVE_TYPES))
+
+
+def _schema(rng: random.Random, config: SyntheticSpecConfig, index: int) -> Dict[str, Any]:
+    properties = {f"property_{p}": _property(rng, config, index) for p in range(config.properties)}
+    if config.composition_depth > 0:
+        properties["composed"] = _composed(rng, config, index, config.composition_depth)
+    schema: Dict[str, Any] = {"type": "object", "properties": properties}
+    required = [name for name in properties if rng.random() < 0.5]
+    if required:
+        # OpenAPI 3.0 does not allow an empty list of required properties.
+        schema["required"] = required
+    if config.composition_depth > 0 and index > 0:
+        # Inherit from an earlier schema, like most large specifications do.
+        return {"allOf": [_schema_ref(rng.randrange(index)), schema]}
+    return schema
+
+
+def _operation(
+    rng: random.Random, config: SyntheticSpecConfig, path: int, method: str, number: int
+) -> Dict[str, Any]:
+    parameters: List[Dict[str, Any]] = [
+        {"name": "item_id", "in": "path", "required": True, "schema": {"type": "integer"}}
+    ]
+    parameters += [
+        {"name": f"query_{q}", "in": "query", "required": q == 0, "schema": dict(rng.choice(PRIMITIVE_TYPES[:4]))}
+        for q in range(config.parameters)
+    ]
+    response_schema: Dict[str, Any] = {"type": "object"}
+    if config.schemas > 0:
+        response_schema = _schema_ref(rng.randrange(config.schemas))
+        if method == "get" and rng.random() < 0.5:
+            response_schema = {"type": "array", "items": response_schema}
+
+    operation: Dict[str, Any] = {
+        "operationId": f"{method}_resource_{path}",
+        "parameters": parameters,
+        "responses": {
+            "200": {"description": "Successful response", "content": {"application/json": {"schema": response_schema}}}
+        },
+    }
+    if config.tags > 0:
+        operation["tags"] = [f"tag_{number % config.tags}"]
+    if method in ("post", "put", "patch") and config.schemas > 0:
+        operation["requestBody"] = {
+            "required": True,
+            "content": {"application/json": {"schema": _schema_ref(rng.randrange(config.schemas))}},
+        }
+    return operation
+
+
+def synthetic_spec(config: SyntheticSpecConfig = SyntheticSpecConfig()) -> Dict[str, Any]:
+    """
+    Build a synthetic OpenAPI 3.0 specification.
+    :param config: Size of the specification
+    :return: The decoded specification, ready to be dumped as JSON
+    """
+    rng = random.Random(config.seed)
+
+    schemas: Dict[str, Any] = {}
+    for e in range(config.enums):
+        schemas[f"Enum{e}"] = {"type": "string", "enum": [f"value_{v}" for v in range(config.enum_size)]}
+    for s in range(config.schemas):
+        schemas[f"Schema{s}"] = _schema(rng, config, s)
+
+    paths: Dict[str, Any] = {}
+    number = 0
+    for p in range(config.paths):
+        path_item = {}
+        for method in HTTP_METHODS[: config.operations]:
+            path_item[method] = _operation(rng, config, p, method, number)
+            number += 1
+        paths[f"/resource_{p}/{{item_id}}"] = path_item
+
+    return {
+        "openapi": "3.0.3",
+        "info": {"title": "Synthetic API", "version": "1.0.0"},
+        "servers": [{"url": "https://synthetic.example.com"}],
+        "paths": paths,
+        "components": {"schemas": schemas},
+    }
@@ -1,4 +1,9 @@
+from unittest.mock import patch
+
 from openapi_pydantic.v3.v3_0 import OpenAPI
+from openapi_pydantic.v3.v3_0 import Operation
+from openapi_pydantic.v3.v3_0 import PathItem
+from openapi_pydantic.v3.v3_0 import Response
 
 from openapi_python_generator.language_converters.python.api_config_generator import (
     generate_api_config,
@@ -8,3 +13,22 @@ from openapi_python_generator.language_converters.python.api_config_generator im
 def test_generate_api_config(model_data: OpenAPI):
     api_config = generate_api_config(model_data)
     assert api_config.file_name == "api_config"
+
+
+def test_generate_api_config_does_not_dump_spec(model_data: OpenAPI):
+    # The api config only depends on the servers, so its cost must not grow with the paths of the specification.
+    paths = {
+        f"/resource_{i}": PathItem(
+            get=Operation(operationId=f"get_resource_{i}", responses={"200": Response(description="ok")})
+        )
+        for i in range(1000)
+    }
+    large_data = model_data.model_copy(update={"paths": paths})
+
+    with patch.object(OpenAPI, "model_dump", side_effect=AssertionError("spec was dumped")), patch.object(
+        OpenAPI, "dict", side_effect=AssertionError("spec was dumped")
+    ):
+        large_config = generate_api_config(large_data, env_token_name="TOKEN")
+
+    assert large_config.content == generate_api_config(model_data, env_token_name="TOKEN").content
+    assert 'os.environ["TOKEN"]' in large_config.content
@@ -0,0 +1,192 @@
+import asyncio
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any
+from typing import Dict
+
+import click
+import pytest
+import respx
+from httpx import Response
+
+from openapi_python_generator import bundler
+from openapi_python_generator.bundler import _iter_refs
+from openapi_python_generator.bundler import bundle_spec
+from openapi_python_generator.cache import CACHE_DIR_ENV
+from openapi_python_generator.common import HTTPLibrary
+from openapi_python_generator.common import library_config_dict
+from openapi_python_generator.generate_data import get_open_api
+from openapi_python_generator.generate_data import load_spec
+from openapi_python_generator.language_converters.python.generator import generator
+from tests.conftest import test_data_folder
+
+
+split_spec_path = test_data_folder / "split_spec" / "openapi.yaml"
+
+
+def write_json(path: Path, document: Dict[str, Any]) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(document))
+    return path
+
+
+def spec_with_paths(paths: Dict[str, Any]) -> Dict[str, Any]:
+    return {"openapi": "3.0.2", "info": {"title": "Test", "version": "1.0.0"}, "paths": paths}
+
+
+def operation(schema: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "get": {
+            "operationId": "getItem",
+            "responses": {"200": {"description": "OK", "content": {"application/json": {"schema": schema}}}},
+        }
+    }
+
+
+def test_bundle_spec_split_files():
+    spec = bundle_spec(load_spec(split_spec_path), split_spec_path)
+    assert all(ref.startswith("#/components/") for ref in _iter_refs(spec))
+
+    components = spec["components"]
+    # Schemas in files of their own are named after the file, colliding names get the name of the document.
+    assert list(components["schemas"]) == ["Pet", "Error", "common_Error", "Category", "Tag"]
+    assert components["schemas"]["Pet"]["properties"]["parent"] == {"$ref": "#/components/schemas/Pet"}
+    assert components["responses"]["Error"]["content"]["application/json"]["schema"] == {
+        "$ref": "#/components/schemas/common_Error"
+    }
+    assert components["parameters"]["limit"]["in"] == "query"
+    # Path items are inlined.
+    assert spec["paths"]["/pets/{petId}"]["get"]["operationId"] == "getPet"
+
+    result = generator(get_open_api(split_spec_path), library_config_dict[HTTPLibrary.httpx])
+    assert [model.file_name for model in result.models] == ["Pet", "Error", "common_Error", "Category", "Tag"]
+    assert "parent: Optional[\"Pet\"]" in result.models[0].content
+
+
+def test_bundle_spec_in_running_event_loop():
+    async def bundle():
+        return bundle_spec(load_spec(split_spec_path), split_spec_path)
+
+    assert asyncio.run(bundle()) == bundle_spec(load_spec(split_spec_path), split_spec_path)
+
+
+def test_bundle_spec_loads_every_document_once(tmp_path: Path, monkeypatch):
+    write_json(tmp_path / "Item.json", {"type": "object", "properties": {"name": {"type": "string"}}})
+    root = spec_with_paths(
+        {
+            "/a": operation({"$ref": "Item.json"}),
+            "/b": {"$ref": "paths.json#/b"},
+        }
+    )
+    write_json(tmp_path / "paths.json", {"b": operation({"type": "array", "items": {"$ref": "./Item.json"}})})
+
+    reads = []
+    read_document = bundler._read_document
+
+    def counting_read(location):
+        reads.append(location)
+        return read_document(location)
+
+    monkeypatch.setattr(bundler, "_read_document", counting_read)
+    spec = bundle_spec(root, tmp_path / "openapi.json")
+    assert sorted(reads) == [str(tmp_path / "Item.json"), str(tmp_path / "paths.json")]
+    assert list(spec["components"]["schemas"]) == ["Item"]
+
+
+def test_bundle_spec_bounds_concurrency(tmp_path: Path, monkeypatch):
+    for index in range(8):
+        write_json(tmp_path / f"Schema{index}.json", {"type": "string"})
+    root = spec_with_paths(
+        {f"/{index}": operation({"$ref": f"Schema{index}.json"}) for index in range(8)},
+    )
+    monkeypatch.setattr(bundler, "BUNDLE_CONCURRENCY", 3)
+    active = []
+    peak = []
+    lock = threading.Lock()
+    read_document = bundler._read_document
+
+    def slow_read(location):
+        with lock:
+            active.append(location)
+            peak.append(len(active))
+        time.sleep(0.02)
+        with lock:
+            active.remove(location)
+        return read_document(location)
+
+    monkeypatch.setattr(bundler, "_read_document", slow_read)
+    spec = bundle_spec(root, tmp_path / "openapi.json")
+    assert len(spec["components"]["schemas"]) == 8
+    assert 1 < max(peak) <= 3
+
+
+@respx.mock
+def test_bundle_spec_remote_documents(tmp_path: Path, monkeypatch):
+    monkeypatch.setenv(CACHE_DIR_ENV, str(tmp_path))
+    root = spec_with_paths(
+        {
+            "/a": operation({"$ref": "schemas/Item.json"}),
+            "/b": operation({"$ref": "https://other.test/shared.json#/components/schemas/Item"}),
+        }
+    )
+    root_route = respx.get("https://spec.test/api/openapi.json").mock(
+        return_value=Response(200, content=json.dumps(root).encode())
+    )
+    item_route = respx.get("https://spec.test/api/schemas/Item.json").mock(
+        return_value=Response(200, json={"type": "object", "properties": {"id": {"type": "integer"}}})
+    )
+    shared = {"components": {"schemas": {"Item": {"type": "string"}}}}
+    shared_route = respx.get("https://other.test/shared.json").mock(
+        return_value=Response(200, json=shared, headers={"ETag": "1"})
+    )
+
+    data = get_open_api("https://spec.test/api/openapi.json", timeout=5)
+    assert list(data.components.schemas) == ["Item", "shared_Item"]
+    assert (root_route.call_count, item_route.call_count, shared_route.call_count) == (1, 1, 1)
+    # The timeout applies to the specification and to the documents it references.
+    for route in (root_route, item_route, shared_route):
+        assert route.calls.last.request.extensions["timeout"]["read"] == 5
+
+    # Remote documents are cached like the specification and served from the cache in offline mode.
+    get_open_api("https://spec.test/api/openapi.json", offline=True)
+    assert shared_route.call_count == 1
+
+
+def test_bundle_spec_errors(tmp_path: Path):
+    root = spec_with_paths({"/a": operation({"$ref": "missing.json"})})
+    with pytest.raises(click.ClickException, match="Could not read"):
+        bundle_spec(root, tmp_path / "openapi.json")
+
+    write_json(tmp_path / "schemas.json", {"Item": {"type": "string"}})
+    root = spec_with_paths({"/a": operation({"$ref": "schemas.json#/Missing"})})
+    with pytest.raises(click.ClickException, match="Could not resolve"):
+        bundle_spec(root, tmp_path / "openapi.json")
+
+    # Only objects added to the components may refer to themselves.
+    write_json(tmp_path / "paths.json", {"a": {"get": {"x-next": {"$ref": "#/a"}, "responses": {}}}})
+    root = spec_with_paths({"/a": {"$ref": "paths.json#/a"}})
+    with pytest.raises(click.ClickException, match="circular"):
+        bundle_spec(root, tmp_path / "openapi.json")
+
+
+def test_get_open_api_does_not_cache_bundled_specs(tmp_path: Path, monkeypatch):
+    monkeypatch.setenv(CACHE_DIR_ENV, str(tmp_path / "cache"))
+    schema_path = write_json(tmp_path / "Item.json", {"type": "string"})
+    spec_path = write_json(tmp_path / "openapi.json", spec_with_paths({"/a": operation({"$ref": "Item.json"})}))
+    assert get_open_api(spec_path, spec_cache=True).components.schemas["Item"].type == "string"
+
+    # A changed document is picked up, although the specification itself is unchanged.
+    write_json(schema_path, {"type": "integer"})
+    assert get_open_api(spec_path, spec_cache=True).components.schemas["Item"].type == "integer"
+
+
+def test_get_open_api_bundles_only_specs_with_external_refs(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("The specification must not be bundled")
+
+    monkeypatch.setattr(bundler, "bundle_spec", fail)
+    for spec in sorted(test_data_folder.glob("*.json")):
+        if spec.name != "failing_api.json":
+            get_open_api(spec)
@@ -0,0 +1,103 @@
+import os
+
+import pytest
+
+from openapi_python_generator.cache import CACHE_DIR_ENV
+from openapi_python_generator.cache import FormatCache
+from openapi_python_generator.cache import SpecCache
+from openapi_python_generator.cache import get_cache_dir
+from openapi_python_generator.common import FormatOptions
+from openapi_python_generator.common import Formatter
+from openapi_python_generator.common import HTTPLibrary
+from openapi_python_generator.common import library_config_dict
+from openapi_python_generator.generate_data import get_open_api
+from openapi_python_generator.generate_data import write_data
+from openapi_python_generator.language_converters.python.generator import generator
+from tests.conftest import test_data_path
+from tests.conftest import test_result_path
+
+
+def test_get_cache_dir(monkeypatch, tmp_path):
+    monkeypatch.setenv(CACHE_DIR_ENV, str(tmp_path))
+    assert get_cache_dir() == tmp_path
+
+    monkeypatch.delenv(CACHE_DIR_ENV)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    assert get_cache_dir() == tmp_path / "openapi-python-generator"
+
+
+def test_format_cache_key(tmp_path, monkeypatch):
+    cache = FormatCache(Formatter.BLACK, tmp_path)
+    assert cache.key("a = 1") == cache.key("a = 1")
+    assert cache.key("a = 1") != cache.key("a = 2")
+
+    monkeypatch.setattr(FormatOptions, "line_length", FormatOptions.line_length + 1)
+    assert FormatCache(Formatter.BLACK, tmp_path).key("a = 1") != cache.key("a = 1")
+
+
+def test_format_cache_get_set(tmp_path):
+    cache = FormatCache(Formatter.BLACK, tmp_path)
+    key = cache.key("a=1")
+    assert cache.get(key) is None
+
+    cache.set(key, "a = 1\n")
+    assert cache.get(key) == "a = 1\n"
+
+
+def test_format_cache_evicts_least_recently_used(tmp_path):
+    cache = FormatCache(Formatter.BLACK, tmp_path, max_size=10)
+    for i, name in enumerate(["old", "used", "new"]):
+        cache.set(name, "12345")
+        os.utime(cache.path / name, (i, i))
+
+    # Reading an entry marks it as recently used.
+    assert cache.get("old") == "12345"
+    cache.evict()
+
+    assert sorted(entry.name for entry in cache.path.iterdir()) == ["new", "old"]
+
+
+def test_write_data_uses_format_cache(model_data_with_cleanup, monkeypatch, tmp_path):
+    monkeypatch.setenv(CACHE_DIR_ENV, str(tmp_path))
+    result = generator(model_data_with_cleanup, library_config_dict[HTTPLibrary.httpx])
+
+    write_data(result, test_result_path, Formatter.BLACK)
+    expected = (test_result_path / "api_config.py").read_text()
+    assert any((tmp_path / "format").iterdir())
+
+    def fail(*args, **kwargs):
+        raise AssertionError("The formatter must not run for cached files")
+
+    monkeypatch.setattr("openapi_python_generator.generate_data.format_code", fail)
+    write_data(result, test_result_path, Formatter.BLACK)
+    assert (test_result_path / "api_config.py").read_text() == expected
+
+    # Without the cache the formatter runs again.
+    with pytest.raises(AssertionError):
+        write_data(result, test_result_path, Formatter.BLACK, format_cache=False)
+
+
+def test_spec_cache(model_data, tmp_path):
+    cache = SpecCache(tmp_path)
+    key = cache.key(b"spec")
+    assert key != cache.key(b"other spec")
+    assert cache.get(key) is None
+
+    cache.set(key, model_data)
+    assert cache.get(key) == model_data
+
+    # Broken entries are treated as missing.
+    (cache.path / key).write_bytes(b"broken")
+    assert cache.get(key) is None
+
+
+def test_get_open_api_uses_spec_cache(model_data, monkeypatch, tmp_path):
+    monkeypatch.setenv(CACHE_DIR_ENV, str(tmp_path))
+    assert get_open_api(test_data_path, spec_cache=True) == model_data
+    assert any((tmp_path / "spec").iterdir())
+
+    def fail(*args, **kwargs):
+        raise AssertionError("The specification must not be parsed again")
+
+    monkeypatch.setattr("openapi_python_generator.generate_data.parse_spec", fail)
+    assert get_open_api(test_data_path, spec_cache=True) == model_data
@@ -1,19 +1,32 @@
 from pathlib import Path
+import json
 import shutil
 import subprocess
+from typing import Dict
 
 import pytest
+import respx
+import click
+import isort
 import yaml
 from httpx import ConnectError
+from httpx import Response
 from orjson import orjson
 from pydantic import ValidationError
 
-from openapi_python_generator.common import FormatOptions, Formatter, HTTPLibrary
+from openapi_python_generator.cache import CACHE_DIR_ENV
+from openapi_python_generator.cache import FormatCache
+from openapi_python_generator.common import FormatOptions, Formatter, HTTPLibrary, PydanticVersion, ValidationMode
 from openapi_python_generator.common import library_config_dict
+from openapi_python_generator.generate_data import format_code
 from openapi_python_generator.generate_data import generate_data
 from openapi_python_generator.generate_data import get_open_api
+from openapi_python_generator.generate_data import load_spec
+from openapi_python_generator.generate_data import stream_data
 from openapi_python_generator.generate_data import write_data
 from openapi_python_generator.language_converters.python.generator import generator
+from openapi_python_generator.profiling import get_profiler
+from openapi_python_generator.ruff_formatter import find_ruff
 from tests.conftest import test_data_folder
 from tests.conftest import test_data_path
 from tests.conftest import test_result_path
@@ -128,7 +141,8 @@ def test_write_formatted_data(model_data_with_cleanup):
     assert (test_result_path / "__init__.py").exists()
     assert (test_result_path / "__init__.py").is_file()
 
-    assert not files_are_black_formatted(test_result_path)
+    # The built-in templates already render the code the way black formats it.
+    assert files_are_black_formatted(test_result_path)
 
     # delete test_result_path folder
     shutil.rmtree(test_result_path)
@@ -181,4 +195,286 @@ def files_are_black_formatted(test_result_path: Path) -> bool:
     if result.returncode == 123:
         result.check_returncode # raise the error
 
-    return result.returncode == 0
\ No newline at end of file
+    return result.returncode == 0
+
+def read_files(path: Path) -> Dict[str, bytes]:
+    return {
+        str(file.relative_to(path)): file.read_bytes()
+        for file in sorted(path.rglob("*.py"))
+    }
+
+
+@pytest.mark.parametrize("formatter", [Formatter.BLACK, Formatter.NONE])
+def test_write_data_with_jobs(model_data_with_cleanup, formatter):
+    result = generator(model_data_with_cleanup, library_config_dict[HTTPLibrary.httpx])
+
+    write_data(result, test_result_path, formatter)
+    serial_files = read_files(test_result_path)
+    shutil.rmtree(test_result_path)
+
+    write_data(result, test_result_path, formatter, jobs=2)
+    parallel_files = read_files(test_result_path)
+
+    assert len(serial_files) > 0
+    assert parallel_files == serial_files
+
+
+def test_stream_data(model_data_with_cleanup, monkeypatch, tmp_path):
+    monkeypatch.setenv(CACHE_DIR_ENV, str(tmp_path))
+    result = generator(model_data_with_cleanup, library_config_dict[HTTPLibrary.httpx], template_cache=False)
+
+    files = stream_data(result, Formatter.BLACK)
+    path, content = next(files)
+    assert path == Path("models") / f"{result.models[0].file_name}.py"
+    streamed = {str(path): content.encode() for path, content in [(path, content), *files]}
+
+    # Nothing is written, neither the client nor the caches.
+    assert not test_result_path.exists()
+    assert list(tmp_path.iterdir()) == []
+
+    write_data(result, test_result_path, Formatter.BLACK, format_cache=False)
+    assert streamed == read_files(test_result_path)
+
+
+@pytest.mark.parametrize("library", list(HTTPLibrary))
+def test_write_data_needs_no_import_sorting(model_data_with_cleanup, library, tmp_path):
+    result = generator(model_data_with_cleanup, library_config_dict[library], use_orjson=True)
+    assert not result.sort_imports
+
+    write_data(result, test_result_path, Formatter.BLACK, format_cache=False)
+    for name, content in read_files(test_result_path).items():
+        code = content.decode()
+        assert isort.code(code, line_length=FormatOptions.line_length) == code, name
+    assert "from typing import *" not in (test_result_path / "models" / "User.py").read_text()
+
+    # Custom templates may render unsorted imports.
+    result = generator(model_data_with_cleanup, library_config_dict[library], custom_template_path=str(tmp_path))
+    assert result.sort_imports
+
+
+def test_generator_keeps_format_options(model_data_with_cleanup, tmp_path):
+    # Whether the imports are sorted is part of the result, not of the process-wide FormatOptions.
+    options = dict(vars(FormatOptions))
+    generator(model_data_with_cleanup, library_config_dict[HTTPLibrary.httpx])
+    assert dict(vars(FormatOptions)) == options
+    cache = FormatCache(Formatter.BLACK, tmp_path)
+    assert FormatCache(Formatter.BLACK, tmp_path, sort_imports=False).key("a = 1") != cache.key("a = 1")
+    assert format_code("import sys\nimport os\n", Formatter.BLACK) == "import os\nimport sys\n"
+
+
+def ruff_is_installed() -> bool:
+    try:
+        find_ruff()
+    except click.ClickException:
+        return False
+    return True
+
+
+requires_ruff = pytest.mark.skipif(not ruff_is_installed(), reason="ruff is not installed")
+
+
+def files_are_ruff_formatted(path: Path) -> bool:
+    result = subprocess.run(
+        [
+            find_ruff(),
+            "format",
+            "--check",
+            "--isolated",
+            "--no-cache",
+            "--line-length",
+            str(FormatOptions.line_length),
+            str(path.absolute()),
+        ],
+        capture_output=True,
+        text=True,
+    )
+    return result.returncode == 0
+
+
+@requires_ruff
+def test_write_data_with_ruff(model_data_with_cleanup, monkeypatch):
+    result = generator(model_data_with_cleanup, library_config_dict[HTTPLibrary.httpx])
+
+    write_data(result, test_result_path, Formatter.RUFF, format_cache=False)
+    files = read_files(test_result_path)
+    for name, content in files.items():
+        compile(content, name, "exec")
+    assert files_are_ruff_formatted(test_result_path)
+    assert files[str(Path("models") / "Team.py")].startswith(
+        b"from datetime import datetime\nfrom typing import List, Optional\n\nfrom pydantic import"
+    )
+
+    # Formatting is stable across runs and does not depend on how the files are batched.
+    shutil.rmtree(test_result_path)
+    monkeypatch.setattr("openapi_python_generator.generate_data.RUFF_BATCH_SIZE", 3)
+    write_data(result, test_result_path, Formatter.RUFF, format_cache=False)
+    assert read_files(test_result_path) == files
+
+
+@requires_ruff
+def test_write_data_with_ruff_validates_files(model_data_with_cleanup, capsys):
+    result = generator(model_data_with_cleanup, library_config_dict[HTTPLibrary.httpx])
+    broken_model = result.models[0].model_copy(update={"file_name": "Broken", "content": "class Broken(:\n"})
+    result.models.append(broken_model)
+
+    with pytest.raises(click.ClickException, match="1 generated files have syntax errors"):
+        write_data(result, test_result_path, Formatter.RUFF, format_cache=False, validation=ValidationMode.FILE)
+
+    assert "Broken.py" in capsys.readouterr().out
+    assert (test_result_path / "models" / "Broken.py").read_text() == "class Broken(:\n"
+    assert files_are_ruff_formatted(test_result_path / "services")
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_write_data_validates_files(model_data_with_cleanup, capsys, jobs):
+    result = generator(model_data_with_cleanup, library_config_dict[HTTPLibrary.httpx])
+    broken_model = result.models[0].model_copy(update={"file_name": "Broken", "content": "class Broken(:\n"})
+    result.models.append(broken_model)
+
+    # Files with syntax errors fail the run, but are still written.
+    with pytest.raises(click.ClickException, match="1 generated files have syntax errors"):
+        write_data(result, test_result_path, Formatter.BLACK, jobs=jobs, validation=ValidationMode.FILE)
+
+    assert "Broken.py" in capsys.readouterr().out
+    assert (test_result_path / "models" / "Broken.py").read_text() == "class Broken(:\n"
+    assert files_are_black_formatted(test_result_path / "services")
+
+
+# The large specification takes long to format, a single combination covers its templates.
+BLACK_STABLE_CASES = [
+    (spec.name, library, pydantic_version)
+    for spec in sorted(test_data_folder.glob("*.json"))
+    if spec.name != "failing_api.json"
+    for library in HTTPLibrary
+    for pydantic_version in PydanticVersion
+    if spec.name != "openapi_gitea_converted.json"
+    or (library, pydantic_version) == (HTTPLibrary.httpx, PydanticVersion.V2)
+]
+
+
+def assert_none_output_equals_black_output(spec: str, library: HTTPLibrary, pydantic_version: PydanticVersion):
+    data = get_open_api(test_data_folder / spec)
+    # The optional branches of the templates are covered by one of the pydantic versions each.
+    v1 = pydantic_version == PydanticVersion.V1
+    result = generator(
+        data,
+        library_config_dict[library],
+        env_token_name="TOKEN" if v1 else None,
+        use_orjson=v1,
+        use_awaredatetime=not v1,
+        pydantic_version=pydantic_version,
+        template_cache=False,
+    )
+    assert dict(stream_data(result, Formatter.NONE)) == dict(stream_data(result, Formatter.BLACK))
+
+
+@pytest.mark.parametrize("spec, library, pydantic_version", BLACK_STABLE_CASES)
+def test_none_output_equals_black_output(spec, library, pydantic_version):
+    assert_none_output_equals_black_output(spec, library, pydantic_version)
+
+
+@pytest.mark.parametrize("library", list(HTTPLibrary))
+def test_none_output_equals_black_output_at_line_length(library, monkeypatch):
+    # The layout of the templates follows the line length, black's default length splits lines kept at 120.
+    monkeypatch.setattr(FormatOptions, "line_length", 88)
+    for pydantic_version in PydanticVersion:
+        assert_none_output_equals_black_output("gitea_issue_11.json", library, pydantic_version)
+
+
+def test_write_data_verify(model_data_with_cleanup, capsys):
+    result = generator(model_data_with_cleanup, library_config_dict[HTTPLibrary.httpx])
+    write_data(result, test_result_path, Formatter.VERIFY, format_cache=False)
+    assert "Error" not in capsys.readouterr().out
+
+    # Unformatted code fails the check, but is still written unchanged.
+    unformatted_model = result.models[0].model_copy(update={"file_name": "Unformatted", "content": "x=1\n"})
+    result.models.append(unformatted_model)
+    with pytest.raises(click.ClickException, match="1 generated files"):
+        write_data(result, test_result_path, Formatter.VERIFY, format_cache=False)
+    assert "Unformatted.py: black would reformat the code, starting in line 1" in capsys.readouterr().out
+    assert (test_result_path / "models" / "Unformatted.py").read_text() == "x=1\n"
+
+
+@pytest.mark.parametrize("validation", [ValidationMode.NONE, ValidationMode.SNIPPET])
+def test_generate_data_validation_modes(model_data_with_cleanup, validation):
+    generate_data(test_data_path, test_result_path, validation=validation)
+    assert (test_result_path / "models" / "__init__.py").is_file()
+    assert (test_result_path / "services" / "__init__.py").is_file()
+
+
+def test_load_spec_sniffs_format(json_data, tmp_path, monkeypatch):
+    # Without a conclusive extension, the format is chosen by the first non-whitespace byte.
+    json_path = tmp_path / "spec.txt"
+    json_path.write_bytes(b"\n  " + orjson.dumps(json_data))
+    yaml_path = tmp_path / "spec"
+    yaml_path.write_text(yaml.dump(json_data))
+
+    def fail(*args, **kwargs):
+        raise AssertionError("YAML must not be used for JSON files")
+
+    with monkeypatch.context() as m:
+        m.setattr(yaml, "load", fail)
+        assert load_spec(json_path) == json_data
+    assert load_spec(yaml_path) == json_data
+
+
+def test_load_spec_memory_maps_large_files(json_data, model_data, monkeypatch, tmp_path):
+    monkeypatch.setattr("openapi_python_generator.generate_data.MMAP_THRESHOLD", 0)
+    assert load_spec(test_data_path) == json_data
+
+    yaml_path = tmp_path / test_data_path.with_suffix(".yml").name
+    yaml_path.write_text(yaml.dump(json_data))
+    assert get_open_api(yaml_path) == model_data
+
+
+def test_get_open_api_reports_timings(model_data, capsys):
+    assert get_open_api(test_data_path, verbose=True) == model_data
+    assert "validated it in" in capsys.readouterr().out
+
+
+@respx.mock
+def test_get_open_api_http_cache(json_data, model_data, monkeypatch, tmp_path):
+    monkeypatch.setenv(CACHE_DIR_ENV, str(tmp_path))
+    url = "http://spec.test/openapi.json"
+    body = orjson.dumps(json_data)
+
+    route = respx.get(url).mock(return_value=Response(200, content=body, headers={"ETag": '"v1"'}))
+    assert get_open_api(url) == model_data
+    assert "gzip" in route.calls.last.request.headers["Accept-Encoding"]
+
+    # The cached copy is revalidated and reused when the server answers 304.
+    route.mock(return_value=Response(304))
+    assert get_open_api(url) == model_data
+    assert route.calls.last.request.headers["If-None-Match"] == '"v1"'
+
+    # Offline mode serves from the cache without any request.
+    calls = route.call_count
+    assert get_open_api(url, offline=True) == model_data
+    assert route.call_count == calls
+
+    with pytest.raises(ConnectError):
+        get_open_api("http://spec.test/unknown.json", offline=True)
+
+
+def test_generate_data_verbose(model_data_with_cleanup, capsys):
+    generate_data(test_data_path, test_result_path, verbose=True)
+    assert "reused" in capsys.readouterr().out
+
+
+def test_generate_data_profile(model_data_with_cleanup, capsys, tmp_path):
+    profile_json = tmp_path / "profile.json"
+    profile_out = tmp_path / "generator.prof"
+    generate_data(test_data_path, test_result_path, profile_json=profile_json, profile_out=profile_out)
+
+    output = capsys.readouterr().out
+    assert "Slowest models:" in output
+    assert "Slowest operations:" in output
+
+    report = json.loads(profile_json.read_text())
+    phases = {phase["name"]: phase for phase in report["phases"]}
+    for name in ["fetch", "parse", "validation", "generate_models", "generate_services", "writes"]:
+        assert phases[name]["calls"] >= 1
+    assert phases["validation"]["peak_memory"] > 0
+    assert 0 < len(report["models"]) <= 10
+    assert profile_out.stat().st_size > 0
+    assert get_profiler().enabled is False
@@ -0,0 +1,66 @@
+import isort
+import pytest
+
+from openapi_python_generator.language_converters.python.imports import Imports
+
+
+STATEMENTS = [
+    "from .Schema10 import Schema10",
+    "from pydantic import BaseModel, Field",
+    "import orjson",
+    "from .Schema2 import Schema2",
+    "from typing import Optional",
+    "from pydantic import UUID4",
+    "import json",
+    "from datetime import datetime",
+    "from .Schema2 import Schema2",
+    "from pydantic import ConfigDict, AwareDatetime",
+    "from ..api_config import APIConfig, HTTPException",
+    "from typing import List, Optional",
+    "import httpx",
+    "from datetime import date",
+    "from ..models import *",
+]
+
+
+def test_imports_render():
+    statements = STATEMENTS + ["from .user import user", "from .User import User"]
+    assert Imports(statements).render() == (
+        "import json\n"
+        "from datetime import date, datetime\n"
+        "from typing import List, Optional\n"
+        "\n"
+        "import httpx\n"
+        "import orjson\n"
+        "from pydantic import UUID4, AwareDatetime, BaseModel, ConfigDict, Field\n"
+        "\n"
+        "from ..api_config import APIConfig, HTTPException\n"
+        "from ..models import *\n"
+        "from .Schema2 import Schema2\n"
+        "from .Schema10 import Schema10\n"
+        "from .User import User\n"
+        "from .user import user"
+    )
+
+
+@pytest.mark.parametrize("start", range(0, len(STATEMENTS), 3))
+def test_imports_render_like_isort(start: int):
+    # The order of the statements does not matter, isort leaves the rendered imports unchanged.
+    statements = STATEMENTS[start:] + STATEMENTS[:start]
+    code = Imports(statements).render() + "\n"
+    assert isort.code(code) == code
+    assert isort.code("\n".join(statements) + "\n") == code
+
+
+def test_imports_add():
+    imports = Imports()
+    imports.add("typing", "Optional")
+    imports.add("typing", "Optional")
+    imports.add("json")
+    assert imports.render() == "import json\nfrom typing import Optional"
+    assert Imports().render() == ""
+
+
+def test_imports_add_statement_rejects_other_code():
+    with pytest.raises(ValueError):
+        Imports(["x = 1"])
@@ -0,0 +1,181 @@
+import json
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import Dict
+
+import pytest
+from click.testing import CliRunner
+
+from openapi_python_generator.__main__ import main
+from openapi_python_generator.common import Formatter
+from openapi_python_generator.common import HTTPLibrary
+from openapi_python_generator.common import library_config_dict
+from openapi_python_generator.generate_data import get_open_api
+from openapi_python_generator.generate_data import write_data
+from openapi_python_generator.incremental import STATE_FILE
+from openapi_python_generator.incremental import DependencyGraph
+from openapi_python_generator.incremental import generate_incremental
+from openapi_python_generator.incremental import load_state
+from openapi_python_generator.language_converters.python.generator import generator
+from openapi_python_generator.language_converters.python.ref_resolver import RefResolver
+from tests.conftest import test_data_path
+
+
+Spec = Dict[str, Any]
+
+
+def load_spec() -> Spec:
+    return json.loads(Path(test_data_path).read_text())
+
+
+def generate(spec: Spec, tmp_path: Path, output: Path, **kwargs: Any) -> int:
+    spec_path = tmp_path / "api.json"
+    spec_path.write_text(json.dumps(spec))
+    return generate_incremental(get_open_api(spec_path), output, formatter=Formatter.NONE, **kwargs)
+
+
+def read_files(output: Path) -> Dict[str, str]:
+    return {path.relative_to(output).as_posix(): path.read_text() for path in sorted(output.rglob("*.py"))}
+
+
+def full_files(spec: Spec, tmp_path: Path) -> Dict[str, str]:
+    output = tmp_path / f"full_{len(list(tmp_path.glob('full_*')))}"
+    output.mkdir()
+    spec_path = output / "api.json"
+    spec_path.write_text(json.dumps(spec))
+    write_data(generator(get_open_api(spec_path), library_config_dict[HTTPLibrary.httpx]), output, Formatter.NONE)
+    return read_files(output)
+
+
+def add_property(spec: Spec) -> None:
+    spec["components"]["schemas"]["Team"]["properties"]["motto"] = {"type": "string"}
+
+
+def rename_referenced_schema(spec: Spec) -> None:
+    schemas = spec["components"]["schemas"]
+    schemas["Person"] = schemas.pop("User")
+    spec_text = json.dumps(spec).replace("#/components/schemas/User\"", "#/components/schemas/Person\"")
+    spec.clear()
+    spec.update(json.loads(spec_text))
+
+
+def remove_schema(spec: Spec) -> None:
+    del spec["components"]["schemas"]["EnumComponent"]
+    spec_text = json.dumps(spec).replace('{"$ref": "#/components/schemas/EnumComponent"}', '{"type": "string"}')
+    spec.clear()
+    spec.update(json.loads(spec_text))
+
+
+def add_operation(spec: Spec) -> None:
+    operation = json.loads(json.dumps(spec["paths"]["/teams"]["get"]))
+    operation["operationId"] = "list_admins"
+    operation["tags"] = ["admin"]
+    spec["paths"]["/admins"] = {"get": operation}
+
+
+def move_operation(spec: Spec) -> None:
+    spec["paths"]["/users/{user_id}"]["delete"]["tags"] = ["admin"]
+
+
+def reorder_paths(spec: Spec) -> None:
+    spec["paths"] = dict(reversed(list(spec["paths"].items())))
+
+
+@pytest.mark.parametrize(
+    "change",
+    [add_property, rename_referenced_schema, remove_schema, add_operation, move_operation, reorder_paths],
+)
+def test_generate_incremental_equals_full_generation(change: Callable[[Spec], None], tmp_path: Path):
+    output = tmp_path / "client"
+    spec = load_spec()
+    generate(spec, tmp_path, output)
+    assert read_files(output) == full_files(spec, tmp_path)
+
+    change(spec)
+    assert generate(spec, tmp_path, output) > 0
+    assert read_files(output) == full_files(spec, tmp_path)
+
+
+def test_generate_incremental_writes_changed_files_only(tmp_path: Path):
+    output = tmp_path / "client"
+    spec = load_spec()
+    total = generate(spec, tmp_path, output)
+    assert total == len(list(output.rglob("*.py")))
+    assert (output / STATE_FILE).exists()
+    assert generate(spec, tmp_path, output) == 0
+
+    # Only the model changes, no operation of the service uses Team directly.
+    add_property(spec)
+    assert generate(spec, tmp_path, output) == 1
+    assert "motto" in (output / "models" / "Team.py").read_text()
+
+    # The schema file and its import in models/__init__.py are removed.
+    remove_schema(spec)
+    assert generate(spec, tmp_path, output) == 2
+    assert not (output / "models" / "EnumComponent.py").exists()
+    assert "EnumComponent" not in json.dumps(load_state(output))
+
+    # A new tag adds a service, the services of the other tags stay untouched.
+    general_service = (output / "services" / "general_service.py").stat().st_mtime_ns
+    add_operation(spec)
+    assert generate(spec, tmp_path, output) == 2
+    assert (output / "services" / "admin_service.py").exists()
+    assert (output / "services" / "async_admin_service.py").exists()
+    assert (output / "services" / "general_service.py").stat().st_mtime_ns == general_service
+
+
+def test_generate_incremental_regenerates_after_option_change(tmp_path: Path):
+    output = tmp_path / "client"
+    spec = load_spec()
+    total = generate(spec, tmp_path, output)
+    assert generate(spec, tmp_path, output, use_orjson=True) > 0
+    assert "orjson" in (output / "services" / "general_service.py").read_text()
+
+    # A deleted file invalidates the graph, the client is generated again but only the missing file is written.
+    (output / "models" / "Team.py").unlink()
+    assert generate(spec, tmp_path, output, use_orjson=True) == 1
+    assert (output / "models" / "Team.py").exists()
+    assert len(list(output.rglob("*.py"))) == total
+
+    # The default library is the same option as httpx.
+    assert generate(spec, tmp_path, output, use_orjson=True, library=None) == 0
+
+
+def test_dependency_graph_affected(tmp_path: Path):
+    spec = load_spec()
+    spec_path = tmp_path / "api.json"
+    spec_path.write_text(json.dumps(spec))
+    data = get_open_api(spec_path)
+    graph = DependencyGraph(data, RefResolver(data.components))
+    assert graph.tags == ["general"]
+    assert graph.referenced_by["User"] == {"Admin", "Team"}
+    assert graph.operations["GET /users"].schemas == {"User"}
+
+    state = {
+        "schemas": {name: {"hash": node.hash} for name, node in graph.schemas.items()},
+        "operations": {key: {"hash": node.hash, "tag": node.tag} for key, node in graph.operations.items()},
+        "tags": {str(tag): keys for tag, keys in graph.tag_operations().items()},
+    }
+    assert graph.affected(state) == (set(), set())
+
+    # Schemas referencing a changed schema are generated again, as are the services using it.
+    state["schemas"]["User"]["hash"] = ""
+    assert graph.affected(state) == ({"User", "Admin", "Team"}, {"general"})
+
+    state["schemas"]["User"]["hash"] = graph.schemas["User"].hash
+    state["schemas"]["Admin"]["hash"] = ""
+    assert graph.affected(state) == ({"Admin"}, set())
+
+
+def test_main_incremental(tmp_path: Path):
+    runner = CliRunner()
+    output = tmp_path / "client"
+    arguments = [str(test_data_path), str(output), "--formatter", "none", "--incremental"]
+    result = runner.invoke(main, arguments)
+    assert result.exit_code == 0, result.output
+    assert (output / STATE_FILE).exists()
+
+    result = runner.invoke(main, arguments)
+    assert result.exit_code == 0, result.output
+    assert "Updated 0 of" in result.output
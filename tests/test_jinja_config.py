@@ -0,0 +1,42 @@
+from openapi_python_generator.language_converters.python import common
+from openapi_python_generator.language_converters.python.jinja_config import ENUM_TEMPLATE
+from openapi_python_generator.language_converters.python.jinja_config import create_jinja_env
+from openapi_python_generator.language_converters.python.jinja_config import get_jinja_env
+from openapi_python_generator.language_converters.python.jinja_config import reset_jinja_env
+
+
+def test_get_jinja_env_is_shared(monkeypatch, tmp_path):
+    monkeypatch.setattr(common, "_custom_template_path", None)
+    monkeypatch.setattr(common, "_template_cache_dir", None)
+    env = get_jinja_env()
+    assert get_jinja_env() is env
+
+    common.set_custom_template_path(str(tmp_path))
+    custom_env = get_jinja_env()
+    assert custom_env is not env
+    assert get_jinja_env() is custom_env
+
+    common.set_template_cache_dir(tmp_path / "jinja")
+    assert get_jinja_env() is not custom_env
+    assert get_jinja_env().bytecode_cache is not None
+
+
+def test_bytecode_cache_is_invalidated_by_custom_templates(monkeypatch, tmp_path):
+    template_path = tmp_path / "templates"
+    template_path.mkdir()
+    cache_path = tmp_path / "jinja"
+    monkeypatch.setattr(common, "_custom_template_path", str(template_path))
+
+    (template_path / ENUM_TEMPLATE).write_text("first {{ name }}")
+    assert create_jinja_env(cache_path).get_template(ENUM_TEMPLATE).render(name="a") == "first a"
+    assert any(cache_path.iterdir())
+
+    # A fresh environment loads the compiled template from the cache and notices that the source changed.
+    (template_path / ENUM_TEMPLATE).write_text("second {{ name }}")
+    assert create_jinja_env(cache_path).get_template(ENUM_TEMPLATE).render(name="a") == "second a"
+
+
+def test_reset_jinja_env():
+    env = get_jinja_env()
+    reset_jinja_env()
+    assert get_jinja_env() is not env
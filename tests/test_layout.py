@@ -0,0 +1,99 @@
+import black
+import pytest
+
+from openapi_python_generator.common import FormatOptions
+from openapi_python_generator.language_converters.python.layout import docstring
+from openapi_python_generator.language_converters.python.layout import string_literal
+from openapi_python_generator.language_converters.python.layout import text_width
+from openapi_python_generator.language_converters.python.layout import wrap_assignment
+from openapi_python_generator.language_converters.python.layout import wrap_brackets
+from openapi_python_generator.language_converters.python.layout import wrap_expression
+
+
+def black_format(code: str) -> str:
+    return black.format_str(code, mode=black.Mode(line_length=FormatOptions.line_length))
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("name", '"name"'),
+        ("it's", '"it\'s"'),
+        ('say "hi"', "'say \"hi\"'"),
+        ('"it\'s"', "'\"it\\'s\"'"),
+        ("line\nbreak", '"line\\nbreak"'),
+        ("back\\slash", '"back\\\\slash"'),
+    ],
+)
+def test_string_literal(value, expected):
+    assert string_literal(value) == expected
+    assert eval(expected) == value
+    assert black_format(f"x = {expected}\n") == f"x = {expected}\n"
+
+
+def test_text_width():
+    assert text_width("name") == 4
+    assert text_width("名前") == 4
+    assert text_width("e\u0301") == 1
+
+
+def test_wrap_brackets():
+    assert wrap_brackets("def f(", ["a: int", "b: str"], "):", 4) == "def f(a: int, b: str):"
+    assert wrap_brackets("f(", [], ")", 4) == "f()"
+    FormatOptions.line_length = 20
+    try:
+        wrapped = wrap_brackets("def f(", ["a: int", "b: str"], "):", 4)
+        assert wrapped == "def f(\n        a: int,\n        b: str,\n    ):"
+    finally:
+        FormatOptions.line_length = 120
+
+
+def test_wrap_assignment():
+    assert wrap_assignment("name: str", "Field(", ['alias="name"'], ")", 4) == 'name: str = Field(alias="name")'
+    FormatOptions.line_length = 20
+    try:
+        assert wrap_assignment("name: str", "Field(", ['alias="name"'], ")", 4) == (
+            "name: str = (\n" "        Field(\n" '            alias="name",\n' "        )\n" "    )"
+        )
+    finally:
+        FormatOptions.line_length = 120
+
+
+def test_wrap_expression():
+    parts = ["a", "if b", "else c"]
+    assert wrap_expression("return ", parts, 4) == "return a if b else c"
+    FormatOptions.line_length = 22
+    try:
+        assert wrap_expression("return ", parts, 4) == "return (\n        a if b else c\n    )"
+        wrapped = wrap_expression("return ", parts, 8)
+        assert wrapped == "return (\n            a\n            if b\n            else c\n        )"
+        parts = ["x", "for x in y"]
+        assert wrap_expression("return ", parts, 0, "[]") == "return [x for x in y]"
+        assert wrap_expression("return ", parts, 4, "[]") == "return [\n        x for x in y\n    ]"
+        wrapped = wrap_expression("return ", parts, 8, "[]")
+        assert wrapped == "return [\n            x\n            for x in y\n        ]"
+    finally:
+        FormatOptions.line_length = 120
+
+
+def test_docstring():
+    assert docstring("Title\n    indented\n\n  less  ", 4) == "    Title\n        indented\n\n      less"
+    assert docstring("\tTab\n\t\tTabs", 4) == "    Tab\n        Tabs"
+    assert docstring(None, 4) == "    None"
+
+
+@pytest.mark.parametrize("length", range(20, 100, 7))
+def test_layout_is_left_unchanged_by_black(length):
+    # Black leaves the rendered code unchanged, whether it is split or not. Targets too long for the line are not
+    # covered, black splits their annotation.
+    name = "n" * length
+    arguments = [f'alias="{name}"', "default=None"]
+    code = (
+        "class Model:\n"
+        f'    """\n{docstring("Model " + name, 4)}\n    """\n\n'
+        f"    {wrap_assignment(name + ': Optional[str]', 'Field(', arguments, ')', 4)}\n"
+        f"\n\n{wrap_brackets('def ' + name[:30] + '(', [name[: length // 2] + ': int', 'b: str = None'], '):')}\n"
+        f"    {wrap_expression('return ', [name[: length // 2], 'if b', 'else ' + name[: length // 3]], 4)}\n"
+        f"\n\n{wrap_expression(name[:30] + ' = ', [name[: length // 3], 'for b in ' + name[: length // 2]], 0, '[]')}\n"
+    )
+    assert black_format(code) == code
@@ -1,8 +1,15 @@
 """Test cases for the __main__ module."""
+import subprocess
+import sys
+from typing import Set
+
 import pytest
+import respx
 from click.testing import CliRunner
+from httpx import Response
 
 from openapi_python_generator.__main__ import main
+from openapi_python_generator.cache import CACHE_DIR_ENV
 from openapi_python_generator.common import HTTPLibrary
 from tests.conftest import test_data_path
 from tests.conftest import test_result_path
@@ -25,3 +32,82 @@ def test_main_succeeds(runner: CliRunner, model_data_with_cleanup, library) -> N
         [str(test_data_path), str(test_result_path), "--library", library.value],
     )
     assert result.exit_code == 0
+
+
+def test_main_with_jobs(runner: CliRunner, model_data_with_cleanup) -> None:
+    """It exits with a status code of zero when formatting in worker processes."""
+    result = runner.invoke(
+        main,
+        [str(test_data_path), str(test_result_path), "--jobs", "2"],
+    )
+    assert result.exit_code == 0
+
+
+def test_main_with_profile(runner: CliRunner, model_data_with_cleanup) -> None:
+    """It reports the phases of the generation."""
+    result = runner.invoke(
+        main,
+        [str(test_data_path), str(test_result_path), "--formatter", "none", "--profile"],
+    )
+    assert result.exit_code == 0
+    assert "generate_services" in result.output
+
+
+def test_main_fails_on_syntax_errors(runner: CliRunner, model_data_with_cleanup, tmp_path) -> None:
+    """It exits with a non-zero status code if a generated module is not valid python."""
+    (tmp_path / "service.jinja2").write_text("class Broken(:\n{{ content }}")
+    result = runner.invoke(
+        main,
+        [str(test_data_path), str(test_result_path), "--custom-template-path", str(tmp_path)],
+    )
+    assert result.exit_code == 1
+    assert "generated files have syntax errors" in result.output
+
+
+@respx.mock
+def test_main_with_timeout(runner: CliRunner, model_data_with_cleanup, monkeypatch, tmp_path) -> None:
+    """It fetches a remote specification with the given timeout."""
+    monkeypatch.setenv(CACHE_DIR_ENV, str(tmp_path))
+    route = respx.get("http://spec.test/openapi.json").mock(
+        return_value=Response(200, content=test_data_path.read_bytes())
+    )
+    result = runner.invoke(
+        main,
+        ["http://spec.test/openapi.json", str(test_result_path), "--formatter", "none", "--timeout", "5"],
+    )
+    assert result.exit_code == 0, result.output
+    assert route.calls.last.request.extensions["timeout"]["read"] == 5
+
+
+def test_main_rejects_invalid_timeout(runner: CliRunner) -> None:
+    """It exits with a usage error for a timeout that is not positive."""
+    result = runner.invoke(main, [str(test_data_path), str(test_result_path), "--timeout", "0"])
+    assert result.exit_code == 2
+    assert "--timeout" in result.output
+
+
+def imported_modules(*args: str) -> Set[str]:
+    """Run python with the arguments and return the top-level packages it imported."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args], capture_output=True, text=True, check=True
+    )
+    return {
+        line.rsplit("|", 1)[1].strip().split(".")[0]
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:")
+    }
+
+
+@pytest.mark.parametrize("option", ["--help", "--version"])
+def test_main_imports_lazily(option: str) -> None:
+    """It shows the help and the version without importing the dependencies of the generation."""
+    modules = imported_modules("-m", "openapi_python_generator", option)
+    assert "openapi_python_generator" in modules
+    assert modules.isdisjoint({"black", "isort", "httpx", "yaml", "jinja2", "openapi_pydantic", "pydantic"})
+
+
+def test_generate_data_imports_lazily() -> None:
+    """It imports the formatters, the HTTP client and the YAML parser only when they are used."""
+    modules = imported_modules("-c", "import openapi_python_generator.generate_data")
+    assert "openapi_pydantic" in modules
+    assert modules.isdisjoint({"black", "isort", "httpx", "yaml"})
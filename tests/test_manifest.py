@@ -0,0 +1,155 @@
+import os
+from pathlib import Path
+
+import click
+import pytest
+from click.testing import CliRunner
+
+from openapi_python_generator.__main__ import main
+from openapi_python_generator.common import Formatter
+from openapi_python_generator.common import HTTPLibrary
+from openapi_python_generator.common import library_config_dict
+from openapi_python_generator.generate_data import check_data
+from openapi_python_generator.generate_data import generate_data
+from openapi_python_generator.generate_data import get_open_api
+from openapi_python_generator.generate_data import write_data
+from openapi_python_generator.incremental import generate_incremental
+from openapi_python_generator.language_converters.python.generator import generator
+from openapi_python_generator.manifest import MANIFEST_FILE
+from openapi_python_generator.manifest import file_digest
+from openapi_python_generator.manifest import load_manifest
+from tests.conftest import test_data_path
+
+
+def generate(output: Path, **kwargs) -> None:
+    generate_data(test_data_path, output, formatter=Formatter.NONE, **kwargs)
+
+
+def age_files(output: Path) -> None:
+    for path in output.rglob("*.py"):
+        os.utime(path, (0, 0))
+
+
+def test_write_data_records_files_in_manifest(tmp_path: Path):
+    generate(tmp_path)
+    manifest = load_manifest(tmp_path)
+    assert manifest is not None
+    assert set(manifest["inputs"]) == {"generator", "spec", "options"}
+    files = {path.relative_to(tmp_path).as_posix() for path in tmp_path.rglob("*.py")}
+    assert set(manifest["files"]) == files
+    assert manifest["files"]["api_config.py"] == file_digest((tmp_path / "api_config.py").read_text())
+
+
+def test_generate_data_resolves_default_library(tmp_path: Path):
+    generate(tmp_path / "default", library=None)
+    generate(tmp_path / "httpx", library=HTTPLibrary.httpx)
+    assert load_manifest(tmp_path / "default") == load_manifest(tmp_path / "httpx")
+
+
+@pytest.mark.skipif(os.name == "nt", reason="POSIX permissions")
+def test_manifest_has_mode_of_generated_files(tmp_path: Path):
+    generate(tmp_path)
+    mode = (tmp_path / "api_config.py").stat().st_mode
+    assert (tmp_path / MANIFEST_FILE).stat().st_mode == mode
+    generate_incremental(get_open_api(test_data_path), tmp_path / "incremental", formatter=Formatter.NONE)
+    assert {path.stat().st_mode for path in (tmp_path / "incremental").glob(".*.json")} == {mode}
+
+
+def test_write_data_skips_unchanged_files(tmp_path: Path):
+    result = generator(get_open_api(test_data_path), library_config_dict[HTTPLibrary.httpx])
+    assert write_data(result, tmp_path, Formatter.NONE) > 0
+    age_files(tmp_path)
+
+    assert write_data(result, tmp_path, Formatter.NONE) == 0
+    assert all(path.stat().st_mtime == 0 for path in tmp_path.rglob("*.py"))
+
+    # Only the changed file is written again.
+    result.models[0].content += "\n# changed\n"
+    assert write_data(result, tmp_path, Formatter.NONE) == 1
+    changed = [path for path in tmp_path.rglob("*.py") if path.stat().st_mtime != 0]
+    assert changed == [tmp_path / "models" / f"{result.models[0].file_name}.py"]
+
+
+def test_generate_data_restores_edited_files(tmp_path: Path):
+    generate(tmp_path)
+    model = next((tmp_path / "models").glob("[!_]*.py"))
+    original = model.read_text()
+    model.write_text(original + "\n# edited by hand\n")
+
+    generate(tmp_path)
+    assert model.read_text() == original
+
+
+def test_write_data_removes_stale_files(tmp_path: Path):
+    result = generator(get_open_api(test_data_path), library_config_dict[HTTPLibrary.httpx])
+    write_data(result, tmp_path, Formatter.NONE)
+    (tmp_path / "models" / "handwritten.py").write_text("x = 1\n")
+
+    removed = result.models.pop()
+    # The removed model and the models/__init__.py importing it.
+    assert write_data(result, tmp_path, Formatter.NONE) == 2
+    assert not (tmp_path / "models" / f"{removed.file_name}.py").exists()
+    # Files the generator did not write are kept.
+    assert (tmp_path / "models" / "handwritten.py").exists()
+
+
+def test_check_data(tmp_path: Path):
+    result = generator(get_open_api(test_data_path), library_config_dict[HTTPLibrary.httpx])
+    assert "api_config.py" in check_data(result, tmp_path, Formatter.NONE)
+    assert list(tmp_path.iterdir()) == []
+
+    write_data(result, tmp_path, Formatter.NONE)
+    assert check_data(result, tmp_path, Formatter.NONE) == []
+
+    (tmp_path / "api_config.py").write_text("")
+    removed = result.models.pop()
+    assert check_data(result, tmp_path, Formatter.NONE) == [
+        "models/__init__.py",
+        "api_config.py",
+        f"models/{removed.file_name}.py",
+    ]
+    assert (tmp_path / "api_config.py").read_text() == ""
+
+
+def test_generate_data_check(tmp_path: Path, capsys):
+    with pytest.raises(click.ClickException, match="not up to date"):
+        generate(tmp_path, check=True)
+
+    generate(tmp_path)
+    age_files(tmp_path)
+    generate(tmp_path, check=True)
+    assert "is up to date" in capsys.readouterr().out
+
+    # Without the manifest, the client is generated again to compare it.
+    (tmp_path / MANIFEST_FILE).unlink()
+    generate(tmp_path, check=True)
+    assert not (tmp_path / MANIFEST_FILE).exists()
+
+    # A changed option changes the output.
+    with pytest.raises(click.ClickException, match="files of .* are not up to date"):
+        generate(tmp_path, check=True, use_orjson=True)
+    assert all(path.stat().st_mtime == 0 for path in tmp_path.rglob("*.py"))
+
+
+def test_generate_data_check_after_incremental(tmp_path: Path):
+    generate_incremental(get_open_api(test_data_path), tmp_path, formatter=Formatter.NONE)
+    generate(tmp_path, check=True)
+
+    (tmp_path / "services" / "general_service.py").write_text("")
+    with pytest.raises(click.ClickException, match="1 files"):
+        generate(tmp_path, check=True)
+
+
+def test_main_check(tmp_path: Path):
+    runner = CliRunner()
+    arguments = [str(test_data_path), str(tmp_path), "--formatter", "none"]
+    result = runner.invoke(main, arguments + ["--check"])
+    assert result.exit_code == 1
+    assert "Out of date: api_config.py" in result.output
+
+    assert runner.invoke(main, arguments).exit_code == 0
+    result = runner.invoke(main, arguments + ["--check"])
+    assert result.exit_code == 0, result.output
+
+    result = runner.invoke(main, arguments + ["--check", "--watch"])
+    assert result.exit_code == 2
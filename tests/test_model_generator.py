@@ -1,5 +1,5 @@
 import pytest
-from openapi_pydantic.v3.v3_0 import Schema, Reference, DataType, OpenAPI
+from openapi_pydantic.v3.v3_0 import Components, Schema, Reference, DataType, OpenAPI
 
 from openapi_python_generator.common import PydanticVersion
 from openapi_python_generator.language_converters.python import common
@@ -15,6 +15,10 @@ from openapi_python_generator.language_converters.python.model_generator import
 from openapi_python_generator.language_converters.python.model_generator import (
     type_converter,
 )
+from openapi_python_generator.language_converters.python.model_generator import (
+    get_type_converter_stats,
+    reset_type_converter_cache,
+)
 from openapi_python_generator.models import Model
 from openapi_python_generator.models import Property
 from openapi_python_generator.models import TypeConversion
@@ -522,23 +526,23 @@ def test_type_converter_all_of_reference():
     schema = Schema(
         allOf=[Reference(ref="#/components/schemas/test_name"), Schema(type=DataType.STRING)]
     )
-    assert type_converter(schema, True).converted_type == "Tuple[test_name,str]"
+    assert type_converter(schema, True).converted_type == "Tuple[test_name, str]"
 
     schema = Schema(
         oneOf=[Reference(ref="#/components/schemas/test_name"), Schema(type=DataType.STRING)]
     )
-    assert type_converter(schema, True).converted_type == "Union[test_name,str]"
+    assert type_converter(schema, True).converted_type == "Union[test_name, str]"
 
 
 @pytest.mark.parametrize(
     "test_openapi_types,expected_python_types",
     [
-        ([DataType.STRING, DataType.INTEGER], "str,int"),
-        ([DataType.STRING, DataType.INTEGER, DataType.NUMBER], "str,int,float"),
-        ([DataType.STRING, DataType.INTEGER, DataType.NUMBER, DataType.BOOLEAN], "str,int,float,bool"),
+        ([DataType.STRING, DataType.INTEGER], "str, int"),
+        ([DataType.STRING, DataType.INTEGER, DataType.NUMBER], "str, int, float"),
+        ([DataType.STRING, DataType.INTEGER, DataType.NUMBER, DataType.BOOLEAN], "str, int, float, bool"),
         (
             [DataType.STRING, DataType.INTEGER, DataType.NUMBER, DataType.BOOLEAN,DataType.ARRAY],
-            "str,int,float,bool,List[Any]",
+            "str, int, float, bool, List[Any]",
         ),
     ],
 )
@@ -700,3 +704,51 @@ def test_model_generation(model_data: OpenAPI, pydantic_version : PydanticVersio
     result = generate_models(model_data_copy.components, pydantic_version)  # type: ignore
 
     assert len(result) == 0
+
+
+def test_type_converter_is_memoized(with_orjson_disabled, with_pydantic_v2):
+    reset_type_converter_cache()
+    schema = Schema(type=DataType.ARRAY, items=Schema(type=DataType.STRING, schema_format="date"))
+
+    first = type_converter(schema, True)
+    assert type_converter(schema, True) is first
+    assert get_type_converter_stats() == (1, 2)
+
+    # Different arguments and options are converted separately.
+    assert type_converter(schema, False).converted_type == "Optional[List[date]]"
+    common.set_use_orjson(True)
+    assert type_converter(schema, True) is not first
+    assert get_type_converter_stats() == (2, 5)
+
+
+def test_model_generation_imports(with_orjson_disabled, with_pydantic_v2):
+    person = Reference(ref="#/components/schemas/Person")
+    components = Components(
+        schemas={
+            "Person": Schema(type=DataType.OBJECT, properties={"name": Schema(type=DataType.STRING)}),
+            "Pet": Schema(
+                type=DataType.OBJECT,
+                required=["owner"],
+                properties={
+                    "owner": person,
+                    "friends": Schema(type=DataType.ARRAY, items=person),
+                    "parent": Reference(ref="#/components/schemas/Pet"),
+                    "born": Schema(type=DataType.STRING, schema_format="date-time"),
+                    "extra": Schema(type=DataType.OBJECT),
+                },
+            ),
+        }
+    )
+
+    pet = generate_models(components, PydanticVersion.V2)[1]
+
+    # Every module is imported once, and only the typing names the model uses.
+    assert pet.content.startswith(
+        "from datetime import datetime\n"
+        "from typing import Any, Dict, List, Optional\n"
+        "\n"
+        "from pydantic import BaseModel, ConfigDict, Field\n"
+        "\n"
+        "from .Person import Person\n"
+    )
+    assert pet.content.count("import") == 4
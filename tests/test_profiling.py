@@ -0,0 +1,41 @@
+import json
+
+from openapi_python_generator.profiling import Profiler
+
+
+def test_disabled_profiler_measures_nothing():
+    profiler = Profiler()
+    items = [("a", 1)]
+    with profiler.phase("parse"), profiler.item("models", "a"):
+        pass
+
+    assert profiler.iter_items("models", items, lambda item: item[0]) is items
+    assert profiler.phases == {}
+    assert profiler.items["models"] == []
+
+
+def test_profiler_phases_and_items(tmp_path):
+    profiler = Profiler(enabled=True, top=2)
+    profiler.start()
+    with profiler.phase("generate_models"):
+        for _ in profiler.iter_items("models", ["a", "b", "c"], lambda name: name):
+            with profiler.phase("rendering"):
+                data = [0] * 100000
+    with profiler.phase("rendering"):
+        pass
+    profiler.stop()
+    del data
+
+    report = profiler.report()
+    phases = {phase["name"]: phase for phase in report["phases"]}
+    assert [phase["name"] for phase in report["phases"]] == ["generate_models", "rendering"]
+    assert phases["rendering"]["calls"] == 4
+    # The outer phase includes the memory allocated by the inner one.
+    assert phases["generate_models"]["peak_memory"] >= phases["rendering"]["peak_memory"] > 0
+    assert len(report["models"]) == 2
+    assert report["models"][0]["seconds"] >= report["models"][1]["seconds"]
+    assert report["total_seconds"] >= phases["generate_models"]["seconds"]
+
+    assert "generate_models" in profiler.format_report()
+    profiler.write_json(tmp_path / "profile.json")
+    assert json.loads((tmp_path / "profile.json").read_text()) == report
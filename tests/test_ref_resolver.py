@@ -0,0 +1,103 @@
+import pytest
+from openapi_pydantic.v3.v3_0 import Components
+from openapi_pydantic.v3.v3_0 import DataType
+from openapi_pydantic.v3.v3_0 import MediaType
+from openapi_pydantic.v3.v3_0 import Operation
+from openapi_pydantic.v3.v3_0 import Parameter
+from openapi_pydantic.v3.v3_0 import Reference
+from openapi_pydantic.v3.v3_0 import RequestBody
+from openapi_pydantic.v3.v3_0 import Response
+from openapi_pydantic.v3.v3_0 import Schema
+
+from openapi_python_generator.language_converters.python.ref_resolver import RefResolver
+from openapi_python_generator.language_converters.python.ref_resolver import component_pointer
+from openapi_python_generator.language_converters.python.ref_resolver import get_ref_resolver
+from openapi_python_generator.language_converters.python.ref_resolver import set_ref_resolver
+from openapi_python_generator.language_converters.python.service_generator import generate_body_param
+from openapi_python_generator.language_converters.python.service_generator import generate_params
+from openapi_python_generator.language_converters.python.service_generator import generate_query_params
+from openapi_python_generator.language_converters.python.service_generator import generate_return_type
+
+
+@pytest.fixture
+def components() -> Components:
+    return Components(
+        schemas={
+            "Pet": Schema(type=DataType.OBJECT),
+            "pet-info": Schema(type=DataType.STRING),
+            "pet_info": Schema(type=DataType.STRING),
+            "a/b": Schema(type=DataType.STRING),
+        },
+        parameters={
+            "limit": Parameter(name="limit", param_in="query", param_schema=Schema(type=DataType.INTEGER)),
+            "alias": Reference(ref="#/components/parameters/limit"),
+        },
+        responses={
+            "PetList": Response(
+                description="pets",
+                content={
+                    "application/json": MediaType(
+                        media_type_schema=Schema(
+                            type=DataType.ARRAY, items=Reference(ref="#/components/schemas/Pet")
+                        )
+                    )
+                },
+            ),
+        },
+        requestBodies={
+            "PetBody": RequestBody(
+                content={"application/json": MediaType(media_type_schema=Reference(ref="#/components/schemas/Pet"))}
+            ),
+        },
+    )
+
+
+@pytest.fixture
+def resolver(components):
+    previous = get_ref_resolver()
+    resolver = RefResolver(components)
+    set_ref_resolver(resolver)
+    try:
+        yield resolver
+    finally:
+        set_ref_resolver(previous)
+
+
+def test_names(resolver):
+    assert resolver.name("#/components/schemas/Pet") == "Pet"
+    assert resolver.name(component_pointer("schemas", "a/b")) == "ab"
+    # Unknown references fall back to the last segment of the pointer.
+    assert resolver.name("#/components/schemas/Unknown-Name") == "Unknown_Name"
+
+
+def test_name_collisions(resolver):
+    assert resolver.collisions == {"pet_info": ["pet-info", "pet_info"]}
+    assert resolver.name("#/components/schemas/pet-info") == "pet_info"
+    assert resolver.name("#/components/schemas/pet_info") == "pet_info_2"
+
+
+def test_resolve(resolver, components):
+    assert resolver.resolve(Reference(ref="#/components/parameters/alias"), Parameter) is components.parameters["limit"]
+    # References to components of another type and unknown references are returned unchanged.
+    reference = Reference(ref="#/components/schemas/Pet")
+    assert resolver.resolve(reference, Parameter) is reference
+    unknown = Reference(ref="#/components/parameters/unknown")
+    assert resolver.resolve(unknown, Parameter) is unknown
+    schema = Schema(type=DataType.STRING)
+    assert resolver.resolve(schema, Schema) is schema
+
+
+def test_service_generation_resolves_components(resolver, with_orjson_disabled, with_pydantic_v2):
+    operation = Operation(
+        parameters=[Reference(ref="#/components/parameters/alias")],
+        requestBody=Reference(ref="#/components/requestBodies/PetBody"),
+        responses={"200": Reference(ref="#/components/responses/PetList")},
+    )
+
+    assert generate_params(operation) == "data: Pet, limit: Optional[int] = None, "
+    assert generate_query_params(operation) == ['"limit": limit']
+    assert generate_body_param(operation) == 'data.model_dump(mode="json")'
+
+    return_type = generate_return_type(operation)
+    assert return_type.type.converted_type == "List[Pet]"
+    assert return_type.list_type == "Pet"
@@ -0,0 +1,40 @@
+import pytest
+from openapi_pydantic.v3.v3_0 import Operation
+from openapi_pydantic.v3.v3_0 import PathItem
+from openapi_pydantic.v3.v3_0 import Response
+
+from openapi_python_generator.common import HTTPLibrary
+from openapi_python_generator.common import library_config_dict
+from openapi_python_generator.language_converters.python.render_context import OperationContext
+from openapi_python_generator.language_converters.python.render_context import ServiceContext
+from openapi_python_generator.language_converters.python.service_generator import generate_services
+from openapi_python_generator.models import OpReturnType
+
+
+def test_operation_context():
+    return_type = OpReturnType(status_code=200)
+    context = OperationContext(operation_id="get_pet", return_type=return_type)
+
+    variables = context.as_dict()
+    assert variables["operation_id"] == "get_pet"
+    assert variables["return_type"] is return_type
+    assert variables["params"] is None
+    assert set(variables) == set(OperationContext.__slots__)
+    assert not hasattr(context, "__dict__")
+
+    with pytest.raises(TypeError):
+        OperationContext(operationId="get_pet")
+
+
+def test_services_do_not_keep_openapi_objects():
+    operation = Operation(operationId="get_pet", responses={"200": Response(description="pet")})
+    services = generate_services({"/pet": PathItem(get=operation)}, library_config_dict[HTTPLibrary.httpx])
+
+    for service in services:
+        for so in service.operations:
+            assert so.operation is None
+            assert so.pathItem is None
+
+    variables = ServiceContext.from_service(services[0]).as_dict()
+    assert variables["operations"] is services[0].operations
+    assert variables["library_import"] == services[0].library_import
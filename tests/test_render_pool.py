@@ -0,0 +1,122 @@
+import pytest
+
+from openapi_python_generator import profiling
+from openapi_python_generator.common import FormatOptions
+from openapi_python_generator.common import HTTPLibrary
+from openapi_python_generator.common import PydanticVersion
+from openapi_python_generator.common import library_config_dict
+from openapi_python_generator.generate_data import get_open_api
+from openapi_python_generator.language_converters.python import render_pool
+from openapi_python_generator.language_converters.python.generator import generator
+from openapi_python_generator.language_converters.python.model_generator import get_type_converter_stats
+from openapi_python_generator.language_converters.python.ref_resolver import RefResolver
+from openapi_python_generator.language_converters.python.ref_resolver import get_ref_resolver
+from openapi_python_generator.language_converters.python.ref_resolver import set_ref_resolver
+from openapi_python_generator.language_converters.python.render_pool import _chunks
+from openapi_python_generator.language_converters.python.service_generator import group_service_operations
+from openapi_python_generator.language_converters.python.service_generator import iter_operations
+from openapi_python_generator.profiling import get_profiler
+from tests.conftest import test_data_folder
+
+
+@pytest.fixture(autouse=True)
+def small_chunks(monkeypatch):
+    # Split the small test specifications into many chunks.
+    monkeypatch.setattr(render_pool, "MIN_CHUNK_SIZE", 2)
+
+
+def files(result):
+    return [(model.file_name, model.content) for model in result.models] + [
+        (service.file_name, service.content) for service in result.services
+    ]
+
+
+def test_chunks():
+    items = list(range(10))
+    chunks = _chunks(items, 2)
+    assert [item for chunk in chunks for item in chunk] == items
+    assert len(chunks) == 5
+    # Chunks are not made smaller than MIN_CHUNK_SIZE for more jobs.
+    assert [len(chunk) for chunk in _chunks(items, 100)] == [2] * 5
+    assert _chunks([], 2) == []
+
+
+@pytest.mark.parametrize("spec", ["test_api.json", "gitea_issue_11.json"])
+@pytest.mark.parametrize("library", [HTTPLibrary.httpx, HTTPLibrary.aiohttp])
+def test_generator_with_jobs_matches_serial(spec, library):
+    data = get_open_api(test_data_folder / spec)
+    serial = generator(data, library_config_dict[library], template_cache=False)
+    serial_stats = get_type_converter_stats()
+
+    parallel = generator(data, library_config_dict[library], template_cache=False, jobs=2)
+    assert files(parallel) == files(serial)
+    assert parallel.api_config == serial.api_config
+    # The workers have their own caches, but every conversion is counted as either reused or computed.
+    hits, misses = get_type_converter_stats()
+    assert hits + misses == sum(serial_stats)
+
+
+def test_generator_with_jobs_uses_settings_of_parent():
+    data = get_open_api(test_data_folder / "test_api.json")
+    FormatOptions.line_length = 60
+    try:
+        kwargs = dict(
+            env_token_name="TOKEN",
+            use_orjson=True,
+            pydantic_version=PydanticVersion.V1,
+            template_cache=False,
+        )
+        serial = generator(data, library_config_dict[HTTPLibrary.requests], **kwargs)
+        parallel = generator(data, library_config_dict[HTTPLibrary.requests], jobs=3, **kwargs)
+    finally:
+        FormatOptions.line_length = 120
+    assert files(parallel) == files(serial)
+    assert any("orjson" in content for _, content in files(parallel))
+
+
+def test_generator_with_jobs_restricted_to_schemas_and_tags():
+    data = get_open_api(test_data_folder / "gitea_issue_11.json")
+    config = library_config_dict[HTTPLibrary.httpx]
+    schema_names = list(data.components.schemas)[::3]
+    tags = {"user", "repository"}
+    serial = generator(data, config, template_cache=False, schema_names=schema_names, tags=tags)
+    parallel = generator(data, config, template_cache=False, schema_names=schema_names, tags=tags, jobs=2)
+    assert files(parallel) == files(serial)
+    assert {service.file_name for service in parallel.services} == {
+        "user_service",
+        "repository_service",
+        "async_user_service",
+        "async_repository_service",
+    }
+
+
+def test_render_workers_in_current_process(monkeypatch):
+    # The workers run in other processes, so they are called directly here.
+    data = get_open_api(test_data_folder / "test_api.json")
+    config = library_config_dict[HTTPLibrary.httpx]
+    serial = generator(data, config, template_cache=False)
+    monkeypatch.setattr(render_pool, "_worker_paths", None)
+    monkeypatch.setattr(render_pool, "_worker_library_config", None)
+    monkeypatch.setattr(profiling, "_profiler", get_profiler())
+    operations = [(path_name, method) for path_name, method, _, _ in iter_operations(data.paths)]
+    with pytest.raises(RuntimeError, match="not initialized"):
+        render_pool._render_operations(operations)
+
+    settings = render_pool._RenderSettings.current()
+    resolver = get_ref_resolver()
+    set_ref_resolver(RefResolver(None))
+    with pytest.raises(RuntimeError, match="not initialized"):
+        render_pool._render_models(["User"])
+
+    render_pool._init_render_worker(resolver, data.paths, config, settings)
+    assert render_pool._RenderSettings.current() == settings
+    models, hits, misses = render_pool._render_models(list(data.components.schemas))
+    assert [(model.file_name, model.content) for model in models] == [
+        (model.file_name, model.content) for model in serial.models
+    ]
+    assert hits + misses > 0
+    service_ops, _, _ = render_pool._render_operations(operations)
+    services = group_service_operations(service_ops, config)
+    assert [(service.file_name, service.content) for service in services] == [
+        (service.file_name, service.content) for service in serial.services
+    ]
@@ -0,0 +1,70 @@
+import sys
+from pathlib import Path
+
+import click
+import pytest
+
+from openapi_python_generator import ruff_formatter
+from openapi_python_generator.ruff_formatter import _run_ruff
+from openapi_python_generator.ruff_formatter import find_ruff
+from openapi_python_generator.ruff_formatter import format_using_ruff
+from openapi_python_generator.ruff_formatter import ruff_version
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    find_ruff.cache_clear()
+    ruff_version.cache_clear()
+    yield
+    find_ruff.cache_clear()
+    ruff_version.cache_clear()
+
+
+@pytest.fixture
+def without_ruff_package(monkeypatch):
+    # A None entry in sys.modules makes the import of the module fail.
+    monkeypatch.setitem(sys.modules, "ruff.__main__", None)
+
+
+def ruff_is_installed() -> bool:
+    try:
+        find_ruff()
+    except click.ClickException:
+        return False
+    finally:
+        find_ruff.cache_clear()
+    return True
+
+
+requires_ruff = pytest.mark.skipif(not ruff_is_installed(), reason="ruff is not installed")
+
+
+def test_find_ruff_falls_back_to_path(without_ruff_package, monkeypatch, tmp_path: Path):
+    executable = tmp_path / "ruff"
+    monkeypatch.setattr(ruff_formatter.shutil, "which", lambda name: str(executable) if name == "ruff" else None)
+    assert find_ruff() == str(executable)
+
+
+def test_find_ruff_without_ruff(without_ruff_package, monkeypatch):
+    monkeypatch.setattr(ruff_formatter.shutil, "which", lambda name: None)
+    with pytest.raises(click.ClickException, match=r"pip install openapi-python-generator\[ruff\]"):
+        find_ruff()
+
+
+@requires_ruff
+def test_ruff_version():
+    assert ruff_version().startswith("ruff ")
+
+
+@requires_ruff
+def test_run_ruff_reports_failures():
+    with pytest.raises(click.ClickException, match="ruff format failed"):
+        _run_ruff("format", "--no-such-option")
+
+
+@requires_ruff
+def test_format_using_ruff():
+    assert format_using_ruff([]) == []
+    code = "import sys\nimport os\nx=[1,2]\n"
+    assert format_using_ruff([code, code], sort_imports=False) == ["import sys\nimport os\n\nx = [1, 2]\n"] * 2
+    assert format_using_ruff([code]) == ["import os\nimport sys\n\nx = [1, 2]\n"]
@@ -1,7 +1,7 @@
 import pytest
 from openapi_pydantic.v3.v3_0 import (
     Operation, Reference, RequestBody, MediaType, Schema, Parameter,
-    DataType, Response, ParameterLocation
+    DataType, Response, ParameterLocation, PathItem
 )
 
 from openapi_python_generator.common import HTTPLibrary
@@ -184,7 +184,7 @@ def test_generate_body_param_orjson_pydanticv2(test_openapi_operation, expected_
                 ],
                 requestBody=None,
             ),
-            "test : TestModel, ",
+            "test: TestModel, ",
         ),
         (
             Operation(
@@ -198,7 +198,7 @@ def test_generate_body_param_orjson_pydanticv2(test_openapi_operation, expected_
                     )
                 ],
             ),
-            "test2 : Optional[str] = None, ",
+            "test2: Optional[str] = None, ",
         ),
         (
             Operation(
@@ -218,7 +218,7 @@ def test_generate_body_param_orjson_pydanticv2(test_openapi_operation, expected_
                     ),
                 ],
             ),
-            "test : TestModel, test2 : Optional[str] = None, ",
+            "test: TestModel, test2: Optional[str] = None, ",
         ),
         (
             Operation(
@@ -247,7 +247,7 @@ def test_generate_body_param_orjson_pydanticv2(test_openapi_operation, expected_
                     }
                 ),
             ),
-            "test : TestModel, test2 : str, data : TestModel, ",
+            "test: TestModel, test2: str, data: TestModel, ",
         ),
         (
             Operation(
@@ -274,7 +274,7 @@ def test_generate_body_param_orjson_pydanticv2(test_openapi_operation, expected_
                     }
                 ),
             ),
-            "test : TestModel, test2 : str, data : str, ",
+            "test: TestModel, test2: str, data: str, ",
         )
     ],
 )
@@ -317,7 +317,7 @@ def test_generate_operation_id(test_openapi_operation, operation_type, expected_
                     )
                 ],
             ),
-            ["'test' : test"],
+            ['"test": test'],
         ),
         (
             Operation(
@@ -351,7 +351,7 @@ def test_generate_operation_id(test_openapi_operation, operation_type, expected_
                     ),
                 ]
             ),
-            ["'test' : test", "'test2' : test2"],
+            ['"test": test', '"test2": test2'],
         ),
     ],
 )
@@ -456,4 +456,19 @@ def test_generate_services(model_data):
 
     result = generate_services(model_data.paths, library_config_dict[HTTPLibrary.requests])
     for i in result:
-        compile(i.content, "<string>", "exec")
\ No newline at end of file
+        compile(i.content, "<string>", "exec")
+
+def test_generate_services_groups_by_tag():
+    def operation(operation_id, tag):
+        return Operation(operationId=operation_id, tags=[tag], responses=default_responses)
+
+    paths = {
+        "/b": PathItem(get=operation("get_b", "b"), post=operation("post_a", "a")),
+        "/c": PathItem(get=operation("get_b2", "b")),
+    }
+    result = generate_services(paths, library_config_dict[HTTPLibrary.httpx])
+
+    assert [service.file_name for service in result] == ["b_service", "a_service", "async_b_service", "async_a_service"]
+    assert [so.operation_id for so in result[0].operations] == ["get_b", "get_b2"]
+    assert all(so.async_client for so in result[2].operations)
+    assert result[0].content == "\n\n\n".join(so.content for so in result[0].operations)
@@ -0,0 +1,42 @@
+import ast
+from pathlib import Path
+
+from openapi_pydantic.v3.v3_0 import OpenAPI
+
+from openapi_python_generator.common import Formatter
+from openapi_python_generator.common import HTTPLibrary
+from openapi_python_generator.common import library_config_dict
+from openapi_python_generator.generate_data import write_data
+from openapi_python_generator.language_converters.python.generator import generator
+from tests.synthetic_spec import SyntheticSpecConfig
+from tests.synthetic_spec import synthetic_spec
+
+
+def test_synthetic_spec_is_deterministic():
+    config = SyntheticSpecConfig(composition_depth=2)
+    assert synthetic_spec(config) == synthetic_spec(config)
+    assert synthetic_spec(config) != synthetic_spec(config.model_copy(update={"seed": 1}))
+
+
+def test_synthetic_spec_size():
+    config = SyntheticSpecConfig(schemas=20, properties=4, enums=3, enum_size=7, paths=6, operations=3, tags=4)
+    data = OpenAPI(**synthetic_spec(config))
+
+    assert len(data.components.schemas) == 23
+    assert len(data.components.schemas["Enum0"].enum) == 7
+    assert len(data.components.schemas["Schema0"].properties) == 4
+    assert len(data.paths) == 6
+    operations = [op for path in data.paths.values() for op in (path.get, path.post, path.put) if op is not None]
+    assert len(operations) == config.operation_count == 18
+    assert {op.tags[0] for op in operations} == {"tag_0", "tag_1", "tag_2", "tag_3"}
+    assert all(len(op.parameters) == 3 for op in operations)
+
+
+def test_synthetic_spec_generates_valid_code(tmp_path: Path):
+    config = SyntheticSpecConfig(schemas=30, composition_depth=3, paths=10, operations=5)
+    result = generator(OpenAPI(**synthetic_spec(config)), library_config_dict[HTTPLibrary.httpx])
+    write_data(result, tmp_path, Formatter.NONE)
+
+    assert len(result.models) == config.schemas + config.enums
+    for path in tmp_path.rglob("*.py"):
+        ast.parse(path.read_text())
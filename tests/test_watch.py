@@ -0,0 +1,143 @@
+import json
+import shutil
+from pathlib import Path
+from typing import Any
+from typing import Dict
+from unittest.mock import patch
+
+import pytest
+from click.testing import CliRunner
+
+from openapi_python_generator.__main__ import main
+from openapi_python_generator.common import Formatter
+from openapi_python_generator.generate_data import generate_data
+from openapi_python_generator.manifest import file_digest
+from openapi_python_generator.manifest import load_manifest
+from openapi_python_generator.watch import Watcher
+from tests.conftest import test_data_path
+
+
+@pytest.fixture
+def spec_path(tmp_path: Path) -> Path:
+    path = tmp_path / "api.json"
+    shutil.copy(test_data_path, path)
+    return path
+
+
+def read_spec(path: Path) -> Dict[str, Any]:
+    return json.loads(path.read_text())
+
+
+def write_spec(path: Path, spec: Dict[str, Any]) -> None:
+    path.write_text(json.dumps(spec))
+
+
+def test_watcher_writes_changed_files_only(spec_path: Path, tmp_path: Path):
+    output = tmp_path / "client"
+    watcher = Watcher(spec_path, output, formatter=Formatter.NONE)
+
+    total = watcher.generate()
+    assert total == len(list(output.rglob("*.py")))
+    assert not watcher.poll()
+    assert watcher.generate() == 0
+
+    spec = read_spec(spec_path)
+    spec["components"]["schemas"]["User"]["properties"]["nickname"] = {"type": "string"}
+    write_spec(spec_path, spec)
+    assert watcher.poll()
+    assert watcher.generate() == 1
+    assert "nickname" in (output / "models" / "User.py").read_text()
+
+    # Removed schemas are deleted, models/__init__.py changes as well.
+    del spec["components"]["schemas"]["EnumComponent"]
+    write_spec(spec_path, spec)
+    assert watcher.generate() == 2
+    assert not (output / "models" / "EnumComponent.py").exists()
+
+
+def test_watcher_updates_manifest(spec_path: Path, tmp_path: Path):
+    output = tmp_path / "client"
+    generate_data(spec_path, output, formatter=Formatter.NONE)
+    spec = read_spec(spec_path)
+    del spec["components"]["schemas"]["EnumComponent"]
+    write_spec(spec_path, spec)
+
+    # Files of the client generated before watching started are removed, if they are no longer generated.
+    watcher = Watcher(spec_path, output, formatter=Formatter.NONE)
+    watcher.generate()
+    assert not (output / "models" / "EnumComponent.py").exists()
+
+    spec["components"]["schemas"]["User"]["properties"]["nickname"] = {"type": "string"}
+    write_spec(spec_path, spec)
+    watcher.generate()
+    manifest = load_manifest(output)
+    assert manifest is not None
+    assert manifest["files"] == {
+        path.relative_to(output).as_posix(): file_digest(path.read_text()) for path in output.rglob("*.py")
+    }
+    generate_data(spec_path, output, formatter=Formatter.NONE, check=True)
+
+
+def test_watcher_reloads_custom_templates(spec_path: Path, tmp_path: Path):
+    template_path = tmp_path / "templates"
+    template_path.mkdir()
+    output = tmp_path / "client"
+    watcher = Watcher(spec_path, output, formatter=Formatter.NONE, custom_template_path=str(template_path))
+    watcher.generate()
+
+    (template_path / "service.jinja2").write_text("# custom service\n{{ imports | safe }}\n\n\n{{ content | safe }}")
+    assert watcher.poll()
+    written = watcher.generate()
+    services = list((output / "services").glob("*_service.py"))
+    assert written == len(services)
+    assert all(service.read_text().startswith("# custom service") for service in services)
+
+
+def test_watcher_reports_failures(spec_path: Path, tmp_path: Path, capsys):
+    watcher = Watcher(spec_path, tmp_path / "client", formatter=Formatter.NONE)
+    spec_path.write_text("{}")
+
+    with patch("openapi_python_generator.watch.time.sleep", side_effect=KeyboardInterrupt):
+        watcher.watch()
+
+    output = capsys.readouterr().out
+    assert "Generation failed" in output
+    assert "Watching" in output
+
+
+def test_main_watch_requires_local_source(tmp_path: Path):
+    result = CliRunner().invoke(main, ["https://example.com/api.json", str(tmp_path), "--watch"])
+    assert result.exit_code != 0
+    assert "--watch requires SOURCE to be a local file" in result.output
+
+
+def test_main_watch(spec_path: Path, tmp_path: Path):
+    output = tmp_path / "client"
+    arguments = [str(spec_path), str(output), "--watch", "--library", "requests", "--formatter", "none", "--use-orjson"]
+    with patch("openapi_python_generator.watch.time.sleep", side_effect=KeyboardInterrupt):
+        result = CliRunner().invoke(main, arguments)
+    assert result.exit_code == 0, result.output
+    assert "Watching" in result.output
+    # The options are passed to the watcher.
+    assert not list((output / "services").glob("async_*.py"))
+    assert "orjson" in (output / "services" / "general_service.py").read_text()
+
+
+@pytest.mark.parametrize(
+    "option",
+    [
+        ["--check"],
+        ["--incremental"],
+        ["--offline"],
+        ["--spec-cache"],
+        ["--verbose"],
+        ["--profile"],
+        ["--profile-json", "profile.json"],
+        ["--profile-out", "profile.prof"],
+    ],
+)
+def test_main_watch_rejects_unsupported_options(spec_path: Path, tmp_path: Path, option):
+    result = CliRunner().invoke(main, [str(spec_path), str(tmp_path / "client"), "--watch", *option])
+    assert result.exit_code == 2
+    assert f"{option[0]} cannot be combined with --watch" in result.output
+    assert not (tmp_path / "client").exists()